@@ -0,0 +1,17 @@
+import os
+
+APP_NAME = "ToolPilot"
+
+def get_config_dir():
+    # Windows: %APPDATA%\ToolPilot, 그 외: ~/.config/toolpilot
+    base = os.environ.get('APPDATA')
+    if base:
+        path = os.path.join(base, APP_NAME)
+    else:
+        base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser("~"), ".config")
+        path = os.path.join(base, APP_NAME.lower())
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_config_path(filename):
+    return os.path.join(get_config_dir(), filename)
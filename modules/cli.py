@@ -0,0 +1,258 @@
+"""
+ToolPilot 헤드리스 실행 (QApplication 없이 GUI 와 같은 엔진 사용)
+
+    python -m toolpilot jobs.json [jobs2.json ...]
+    python -m toolpilot - < jobs.json
+    python -m toolpilot --list-tools
+
+작업 파일: 작업 하나(dict), 작업 목록(list), 또는 {"jobs": [...]}
+상대 경로는 작업 파일이 있는 폴더 기준 (stdin 이면 현재 폴더)
+
+  {"tool": "convert", "files": ["a.png", "photos/"], "profile": "WEBP", "output_dir": "out", "incremental": true}
+  {"tool": "merge", "files": ["a.pdf", "b.pdf"], "output": "merged.pdf", "backend": "auto|pypdf|fitz",
+   "compact": true, "recompress": false, "linearize": false}
+  {"tool": "split", "file": "a.pdf", "output_dir": "out", "mode": "all|range|every", "ranges": "1-3,5", "step": 2}
+  {"tool": "img2pdf", "files": ["1.jpg", "2.jpg"], "output": "photos.pdf"}
+  {"tool": "dupscan", "folders": ["photos"], "min_size": 0, "hash_cache": true}
+  {"tool": "rename", "folder": "photos", "rules": {"mode": "template", "template": "{n:04}{ext}"}, "dry_run": true}
+
+stdout 에 이벤트를 한 줄씩 JSON 으로 출력: start / progress / result / summary (진단 메시지는 stderr)
+실패한 작업이 있으면 종료 코드 1 (파일 일부만 실패한 작업도 실패로 셈)
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+TOOLS = {}  # 이름 -> (실행 함수, 설명)
+
+
+def tool(name, description):
+    def register(func):
+        TOOLS[name] = (func, description)
+        return func
+    return register
+
+
+class JsonReporter:
+    # 이벤트를 JSON Lines 로 출력. 진행 상황은 interval 초마다 + 마지막 한 번
+    def __init__(self, stream, interval=0.5):
+        self.stream = stream
+        self.interval = interval
+
+    def emit(self, event, **fields):
+        self.stream.write(json.dumps(dict(event=event, **fields), ensure_ascii=False, default=str) + "\n")
+        self.stream.flush()
+
+    def progress_callback(self, job_index, tool_name):
+        last = [0.0]
+
+        def progress(done, total, stage=None):
+            now = time.perf_counter()
+            if done < total and now - last[0] < self.interval:
+                return
+            last[0] = now
+            fields = {'job': job_index, 'tool': tool_name, 'done': done, 'total': total}
+            if stage: fields['stage'] = stage
+            self.emit("progress", **fields)
+        return progress
+
+
+class JobError(ValueError):
+    pass
+
+
+def _require(job, key):
+    if not job.get(key):
+        raise JobError(f"'{key}' 항목이 필요합니다.")
+    return job[key]
+
+
+def _paths(job, key, base):
+    value = _require(job, key)
+    if isinstance(value, str): value = [value]
+    return [_path(p, base) for p in value]
+
+
+def _path(path, base):
+    path = os.path.expanduser(path)
+    return path if os.path.isabs(path) else os.path.normpath(os.path.join(base, path))
+
+
+def _folders(paths):
+    # os.walk / scandir 는 없는 폴더를 빈 폴더처럼 넘기므로 미리 확인 (오타가 '0개 성공'이 되지 않게)
+    for path in paths:
+        if not os.path.isdir(path):
+            raise JobError(f"폴더가 없습니다: {path}")
+    return paths
+
+
+# ==========================================
+# [1] 도구별 실행 (엔진은 필요할 때만 import -> 쓰지 않는 도구의 의존성은 없어도 됨)
+# ==========================================
+@tool("convert", "이미지 변환 (프로필, 증분 모드)")
+def run_convert(job, base, progress):
+    from modules.image.converter.converter_engine import convert_batch, collect_images
+    from modules.image.converter.converter_manifest import ConvertManifest
+
+    files = collect_images(_paths(job, 'files', base))
+    output_dir = _path(job['output_dir'], base) if job.get('output_dir') else None
+    manifest = ConvertManifest() if job.get('incremental') else None
+    try:
+        return convert_batch(files, job.get('profile', "PNG"), output_dir=output_dir,
+                             max_workers=job.get('workers'), progress=progress, manifest=manifest)
+    finally:
+        if manifest: manifest.close()
+
+
+@tool("merge", "PDF 합치기")
+def run_merge(job, base, progress):
+    from modules.pdf.merger.merge_logic import merge_pdfs, BACKEND_AUTO
+    return merge_pdfs(_paths(job, 'files', base), _path(_require(job, 'output'), base), progress,
+                      backend=job.get('backend', BACKEND_AUTO), compact=job.get('compact', False),
+                      recompress=job.get('recompress', False), linearize=job.get('linearize', False))
+
+
+@tool("split", "PDF 자르기 (all / range / every)")
+def run_split(job, base, progress):
+    from modules.pdf.splitter.split_logic import split_pdf, SPLIT_ALL
+
+    output_dir = _path(job.get('output_dir') or ".", base)
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = split_pdf(_path(_require(job, 'file'), base), output_dir, job.get('mode', SPLIT_ALL),
+                        ranges=job.get('ranges', ""), step=job.get('step', 2), progress=progress)
+    return {'outputs': outputs}
+
+
+@tool("img2pdf", "이미지 여러 장을 PDF 하나로")
+def run_img2pdf(job, base, progress):
+    from modules.image.to_pdf.img_to_pdf_logic import images_to_pdf, default_pdf_name
+    return images_to_pdf(_paths(job, 'files', base), _path(job.get('output') or default_pdf_name(), base), progress)
+
+
+@tool("dupscan", "내용이 같은 파일 찾기")
+def run_dupscan(job, base, progress):
+    from modules.system.organizer.dup_engine import DuplicateFinder
+    from modules.system.organizer.hash_index import HashIndex
+
+    folders = _folders(_paths(job, 'folders', base))
+    index = HashIndex() if job.get('hash_cache', True) else None
+    try:
+        finder = DuplicateFinder(folders, workers=job.get('workers'),
+                                 progress=lambda stage, done, total: progress(done, total, stage),
+                                 min_size=job.get('min_size', 0), index=index)
+        groups = finder.run()
+    finally:
+        if index: index.close()
+    wasted = sum(g['size'] * (len(g['paths']) - 1) for g in groups)
+    return {'groups': groups, 'wasted_bytes': wasted, 'stats': finder.stats}
+
+
+@tool("rename", "규칙으로 이름 일괄 변경 (기록을 남겨 GUI 에서 되돌리기 가능)")
+def run_rename(job, base, progress):
+    from modules.system.file_manager.rename_rules import build_pipeline, RuleError
+    from modules.system.file_manager.batch_rename import plan_renames, RenameJournal, execute_journal
+
+    if job.get('files'):
+        files = _paths(job, 'files', base)
+    else:
+        files = []
+        folder = _folders([_path(_require(job, 'folder'), base)])[0]
+        for root, _dirs, names in os.walk(folder):
+            files.extend(os.path.join(root, n) for n in names)
+        # 순번이 매번 같도록 경로 순 정렬 (미리보기와 같은 기준)
+        files.sort(key=lambda p: p.lower())
+    try:
+        pipeline = build_pipeline(_require(job, 'rules'))
+        pairs = list(pipeline.iter_changes(files))
+    except RuleError as e:
+        raise JobError(str(e))
+
+    plan = plan_renames(pairs)
+    if job.get('dry_run'):
+        return {'dry_run': True, 'files': len(files), 'moves': plan['moves'], 'skipped': plan['skipped']}
+    if not plan['steps']:
+        return {'status': "done", 'total': 0, 'done': 0, 'failed': [], 'renamed': [],
+                'skipped': plan['skipped'], 'journal': None}
+    journal = RenameJournal.create(plan, job.get('label', "CLI"))
+    report = execute_journal(journal, progress)
+    report['skipped'] = plan['skipped']
+    return report
+
+
+# ==========================================
+# [2] 작업 파일 읽기 + 실행
+# ==========================================
+def load_jobs(source):
+    # 반환: [(작업 dict, 상대 경로 기준 폴더)]
+    if source == "-":
+        data, base = json.load(sys.stdin), os.getcwd()
+    else:
+        with open(source, encoding="utf-8") as f:
+            data = json.load(f)
+        base = os.path.dirname(os.path.abspath(source))
+    if isinstance(data, dict):
+        data = data.get('jobs', [data])
+    if not isinstance(data, list) or not all(isinstance(j, dict) for j in data):
+        raise JobError(f"{source}: 작업 파일 형식이 올바르지 않습니다.")
+    return [(job, base) for job in data]
+
+
+def run_jobs(jobs, reporter, stop_on_error=False):
+    failed = 0
+    started = time.perf_counter()
+    for i, (job, base) in enumerate(jobs):
+        name = job.get('tool')
+        reporter.emit("start", job=i, tool=name)
+        job_started = time.perf_counter()
+        try:
+            if name not in TOOLS:
+                raise JobError(f"알 수 없는 도구: {name} (사용 가능: {', '.join(TOOLS)})")
+            result = TOOLS[name][0](job, base, reporter.progress_callback(i, name))
+            # 보고서의 failed(개수 또는 목록)가 있으면 파일 일부가 실패한 것
+            ok = not (isinstance(result, dict) and result.get('failed'))
+            reporter.emit("result", job=i, tool=name, ok=ok,
+                          seconds=round(time.perf_counter() - job_started, 3), result=result)
+            if not ok:
+                failed += 1
+                if stop_on_error: break
+        except Exception as e:
+            failed += 1
+            reporter.emit("result", job=i, tool=name, ok=False,
+                          seconds=round(time.perf_counter() - job_started, 3), error=f"{type(e).__name__}: {e}")
+            if stop_on_error: break
+    reporter.emit("summary", jobs=len(jobs), failed=failed, seconds=round(time.perf_counter() - started, 3))
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="toolpilot", description="ToolPilot 헤드리스 실행 (JSON 작업 파일)")
+    parser.add_argument("job_files", nargs="*", help="작업 파일 (JSON). '-' 이면 stdin")
+    parser.add_argument("--list-tools", action="store_true", help="사용 가능한 도구 목록")
+    parser.add_argument("--interval", type=float, default=0.5, help="진행 상황 출력 간격(초)")
+    parser.add_argument("--stop-on-error", action="store_true", help="작업 하나가 실패하면 멈춤")
+    args = parser.parse_args(argv)
+
+    reporter = JsonReporter(sys.stdout, args.interval)
+    if args.list_tools:
+        for name, (_func, description) in TOOLS.items():
+            reporter.emit("tool", name=name, description=description)
+        return 0
+    if not args.job_files:
+        parser.print_usage(sys.stderr)
+        return 2
+
+    jobs = []
+    for source in args.job_files:
+        try:
+            jobs.extend(load_jobs(source))
+        except (OSError, ValueError) as e:
+            reporter.emit("error", source=source, error=str(e))
+            return 2
+    # 엔진이 print 하는 진단 메시지가 JSON Lines 사이에 섞이지 않도록 stderr 로 돌림
+    sys.stdout = sys.stderr
+    try:
+        return 1 if run_jobs(jobs, reporter, args.stop_on_error) else 0
+    finally:
+        sys.stdout = reporter.stream
@@ -0,0 +1,281 @@
+import os
+import sys
+import time
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .converter_profiles import get_profile, output_ext, output_size, save_options, profile_hash
+from .converter_manifest import path_key
+
+# 변환 결과 상태
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+STATUS_SKIPPED = "skipped"      # 증분 모드: 이미 최신
+
+# 한 번에 프로세스 풀에 넣어둘 작업 수 (코어 수 x 배수)
+# 5000개를 한꺼번에 넣지 않아야 취소가 바로 먹힘
+INFLIGHT_PER_WORKER = 2
+MANIFEST_COMMIT_EVERY = 200
+
+# 목표 크기의 이 배수까지는 정수 배 축소(JPEG draft / reduce)로 줄이고, 나머지만 LANCZOS
+REDUCING_GAP = 2.0
+
+
+# 변환할 수 있는 원본 확장자 (폴더를 넣으면 이 파일들만 모음)
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tif', '.tiff', '.gif')
+
+
+def default_output_dir():
+    return os.path.join(os.path.expanduser("~"), "Downloads")
+
+
+def default_workers():
+    return max(1, os.cpu_count() or 1)
+
+
+def collect_images(paths):
+    # 파일은 그대로, 폴더는 하위까지 훑어서 이미지 파일만
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if n.lower().endswith(IMAGE_EXTS))
+        elif path.lower().endswith(IMAGE_EXTS):
+            files.append(path)
+    return files
+
+
+def load_reduced(img, size, cover=False):
+    """
+    목표 크기(size)가 원본보다 작으면 디코딩 단계에서부터 줄여서 읽음
+    - JPEG: draft -> DCT 단계에서 1/2, 1/4, 1/8 크기로 바로 디코딩 (전체 해상도를 만들지 않음)
+    - 그 외(PNG/TIFF 등): 한 번 디코딩한 뒤 reduce(정수 배 박스 축소)로 먼저 줄이고 LANCZOS 로 마무리
+    - cover=True (ICO): 짧은 쪽이 size 이상 남도록 정수 배로만 줄임 (마지막 크기 맞춤은 저장할 때)
+    반환: (이미지, 실제로 줄였는지 여부)
+    """
+    from PIL import Image
+
+    if not size or (img.width <= size[0] and img.height <= size[1]):
+        return img, False
+    original = img.size
+    if img.format == "JPEG":
+        img.draft(None, (int(size[0] * REDUCING_GAP), int(size[1] * REDUCING_GAP)))
+    if cover:
+        factor = int(min(img.width / (size[0] * REDUCING_GAP), img.height / (size[1] * REDUCING_GAP)))
+        if factor >= 2:
+            img = img.reduce(factor)
+    else:
+        img.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+    return img, img.size != original
+
+
+def make_result(path, status, output="", error="", reduced=False,
+                encode_seconds=0.0, input_bytes=0, output_bytes=0):
+    return {'path': path, 'status': status, 'output': output, 'error': error, 'reduced': reduced,
+            'encode_seconds': encode_seconds, 'input_size': input_bytes, 'output_size': output_bytes}
+
+
+# ==========================================
+# [1] 파일 하나 변환 (자식 프로세스에서 실행 -> PyQt 를 import 하지 않음)
+# ==========================================
+def convert_one(file_path, profile, save_path):
+    """
+    이미지 하나를 프로필(dict)대로 save_path 에 저장
+    - 임시 파일에 쓴 뒤 이름 변경 (중간에 멈춰도 반쯤 쓴 결과 파일이 남지 않음)
+    반환: {'path', 'status', 'output', 'error', 'reduced', 'encode_seconds', 'input_size', 'output_size'}
+    """
+    from PIL import Image
+
+    target_ext = output_ext(profile)
+    folder, name = os.path.split(save_path)
+    temp_path = os.path.join(folder, f".{name}.{os.getpid()}.converting")
+    try:
+        input_size = os.path.getsize(file_path)
+        with Image.open(file_path) as img:
+            # [NEW] 작게 저장할 때는 원본 전체를 디코딩하지 않음
+            out, reduced = load_reduced(img, output_size(profile), cover=(target_ext == "ico"))
+
+            if target_ext in ["jpg", "pdf"]:
+                # 투명 배경(RGBA)을 흰색으로 변경
+                if out.mode in ("RGBA", "LA"):
+                    background = Image.new("RGB", out.size, (255, 255, 255))
+                    background.paste(out, mask=out.split()[-1])
+                    out = background
+                elif out.mode != "RGB":
+                    out = out.convert("RGB")
+            else:
+                # 디코딩은 인코딩 시간에 넣지 않음
+                out.load()
+
+            # [NEW] 인코딩 시간 / 출력 크기 기록 (프로필별 속도-용량 비교용)
+            started = time.perf_counter()
+            out.save(temp_path, **save_options(profile))
+            encode_seconds = time.perf_counter() - started
+        os.replace(temp_path, save_path)
+        return make_result(file_path, STATUS_OK, save_path, reduced=reduced, encode_seconds=encode_seconds,
+                           input_bytes=input_size, output_bytes=os.path.getsize(save_path))
+    except Exception as e:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return make_result(file_path, STATUS_FAILED, error=str(e))
+
+
+# ==========================================
+# [2] 출력 이름 정하기 (+ 증분 모드: 바뀌지 않은 파일 건너뛰기)
+# ==========================================
+def hashed_name(source, stem, ext, n=1):
+    # 원본 경로로 만든 꼬리표 -> 실행 순서와 상관없이 늘 같은 이름
+    tag = hashlib.sha1(path_key(source).encode("utf-8")).hexdigest()[:8]
+    return f"{stem}_{tag}.{ext}" if n == 1 else f"{stem}_{tag}_{n}.{ext}"
+
+
+def plan_outputs(file_paths, profile, output_dir, manifest=None):
+    """
+    원본마다 출력 경로를 정함
+    - 원본 경로 순으로 정렬해서, 이름(stem)이 겹치면 먼저 오는 원본이 '이름.확장자'
+      나머지는 '이름_원본경로해시.확장자' (다시 돌려도 같은 결과)
+    - manifest 가 있으면(증분 모드) 예전에 정한 출력 이름을 그대로 쓰고,
+      크기/수정 시간/프로필이 같고 출력 파일이 그대로면 건너뜀.
+      기록에 없는 기존 파일은 덮어쓰지 않음
+    반환: (jobs [(원본, 출력, (크기, 수정 시간))], skipped [결과], failed [결과])
+    """
+    ext = output_ext(profile)
+    phash = profile_hash(profile)
+    owners = manifest.owners(output_dir) if manifest else {}
+    claimed = set()
+    jobs, skipped, failed, new_files = [], [], [], []
+
+    unique = {path_key(p): p for p in file_paths}
+    for key in sorted(unique):
+        source = unique[key]
+        try:
+            st = os.stat(source)
+        except OSError as e:
+            failed.append(make_result(source, STATUS_FAILED, error=str(e)))
+            continue
+        stamp = (st.st_size, st.st_mtime_ns)
+        row = manifest.lookup(source, phash, output_dir) if manifest else None
+        if row is None:
+            new_files.append((source, stamp))
+            continue
+        size, mtime_ns, output, output_bytes = row
+        claimed.add(path_key(output))
+        try:
+            up_to_date = (size, mtime_ns) == stamp and os.path.getsize(output) == output_bytes
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            skipped.append(make_result(source, STATUS_SKIPPED, output, input_bytes=size, output_bytes=output_bytes))
+        else:
+            jobs.append((source, output, stamp))
+
+    for source, stamp in new_files:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        candidates = [f"{stem}.{ext}"] + [hashed_name(source, stem, ext, n) for n in range(1, 100)]
+        for name in candidates:
+            output = os.path.join(output_dir, name)
+            key = path_key(output)
+            if key in claimed:
+                continue
+            owner = owners.get(key)
+            if owner is not None and owner != path_key(source):
+                continue
+            if manifest and owner is None and os.path.exists(output):
+                continue
+            break
+        claimed.add(key)
+        jobs.append((source, output, stamp))
+    return jobs, skipped, failed
+
+
+# ==========================================
+# [3] 여러 파일 변환 (프로세스 풀)
+# ==========================================
+def convert_batch(file_paths, profile, output_dir=None, max_workers=None,
+                  progress=None, cancel_event=None, manifest=None):
+    """
+    file_paths 를 CPU 코어 수만큼의 프로세스로 나눠 변환
+    - profile: 프로필 dict 또는 이름 ("PNG", "WEBP (무손실)" 등)
+    - output_dir: 없으면 프로필의 저장 폴더 -> 다운로드 폴더
+    - manifest(ConvertManifest): 주면 증분 모드 (바뀌지 않은 파일은 건너뛰고 결과를 기록)
+    - progress(완료 수, 전체 수): 파일 하나가 끝날 때마다 (끝난 순서대로)
+    - cancel_event(threading.Event)가 켜지면 새 작업을 넣지 않고, 돌던 것만 마무리
+    반환: {'results': [파일별 결과 (원본 경로 순)], 'success', 'skipped', 'failed', 'cancelled', 'output_dir',
+           'profile', 'encode_seconds', 'input_bytes', 'output_bytes'}
+    """
+    profile = get_profile(profile)
+    output_dir = output_dir or profile['output_dir'] or default_output_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    cancel_event = cancel_event or threading.Event()
+
+    jobs, skipped, failed = plan_outputs(file_paths, profile, output_dir, manifest)
+    phash = profile_hash(profile)
+    total = len(jobs) + len(skipped) + len(failed)
+    results = [None] * len(jobs)
+    done = len(skipped) + len(failed)
+    if progress and done: progress(done, total)
+    workers = min(max_workers or default_workers(), max(1, len(jobs)))
+
+    def finish(i, result):
+        nonlocal done
+        results[i] = result
+        done += 1
+        if result['status'] == STATUS_FAILED:
+            print(f"Error converting {result['path']}: {result['error']}", file=sys.stderr)
+        elif manifest is not None:
+            _source, _output, (size, mtime_ns) = jobs[i]
+            manifest.store(result['path'], phash, output_dir, size, mtime_ns, result['output'], result['output_size'])
+            if done % MANIFEST_COMMIT_EVERY == 0: manifest.commit()
+        if progress: progress(done, total)
+
+    if workers == 1:
+        # 한두 장은 프로세스를 띄우는 비용이 더 큼
+        for i, (source, output, _stamp) in enumerate(jobs):
+            if cancel_event.is_set(): break
+            finish(i, convert_one(source, profile, output))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            next_i = 0
+            limit = workers * INFLIGHT_PER_WORKER
+            while next_i < len(jobs) or pending:
+                while next_i < len(jobs) and len(pending) < limit and not cancel_event.is_set():
+                    source, output, _stamp = jobs[next_i]
+                    future = pool.submit(convert_one, source, profile, output)
+                    pending[future] = next_i
+                    next_i += 1
+                if not pending:
+                    break
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = pending.pop(future)
+                    try:
+                        finish(i, future.result())
+                    except Exception as e:
+                        # 자식 프로세스가 죽은 경우 등
+                        finish(i, make_result(jobs[i][0], STATUS_FAILED, error=str(e)))
+    if manifest is not None:
+        manifest.commit()
+
+    for i, (source, _output, _stamp) in enumerate(jobs):
+        if results[i] is None:
+            results[i] = make_result(source, STATUS_CANCELLED)
+
+    results = sorted(results + skipped + failed, key=lambda r: path_key(r['path']))
+    converted = [r for r in results if r['status'] == STATUS_OK]
+    return {
+        'results': results,
+        'success': len(converted),
+        'skipped': len(skipped),
+        'failed': sum(1 for r in results if r['status'] == STATUS_FAILED),
+        'cancelled': cancel_event.is_set(),
+        'output_dir': output_dir,
+        'profile': profile['name'],
+        'encode_seconds': sum(r['encode_seconds'] for r in converted),
+        'input_bytes': sum(r['input_size'] for r in converted),
+        'output_bytes': sum(r['output_size'] for r in converted),
+    }
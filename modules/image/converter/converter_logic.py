@@ -1,50 +1,62 @@
-import os
-from PIL import Image
-from PyQt6.QtCore import QObject, pyqtSignal
+import threading
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from .converter_engine import convert_batch, collect_images
+from .converter_manifest import ConvertManifest
+from .converter_profiles import get_profile, record_stats
 
 class ImageConverterLogic(QObject):
     progress_signal = pyqtSignal(int, int)
 
-    def convert_images(self, file_paths, target_ext):
-        # target_ext: "PNG", "ICO" 등 깔끔한 문자열이 들어옴
-        target_ext = target_ext.lower() # 소문자로 변환 (png, ico)
-        
-        download_path = os.path.join(os.path.expanduser("~"), "Downloads")
-        success_count = 0
-        total_count = len(file_paths)
-
-        for i, file_path in enumerate(file_paths):
-            try:
-                img = Image.open(file_path)
-                filename = os.path.splitext(os.path.basename(file_path))[0]
-                save_path = os.path.join(download_path, f"{filename}.{target_ext}")
-
-                if target_ext == "ico":
-                    # ICO는 256x256 리사이징 권장
-                    img.save(save_path, format='ICO', sizes=[(256, 256)])
-
-                elif target_ext in ["jpg", "pdf"]:
-                    # 투명 배경(RGBA)을 흰색으로 변경
-                    if img.mode in ("RGBA", "LA"):
-                        background = Image.new("RGB", img.size, (255, 255, 255))
-                        background.paste(img, mask=img.split()[3])
-                        img = background
-                    else:
-                        img = img.convert("RGB")
-                    
-                    img.save(save_path, quality=90)
-
-                elif target_ext == "webp":
-                    img.save(save_path, format='WEBP', quality=90)
-
-                else:
-                    # PNG 등
-                    img.save(save_path)
-
-                success_count += 1
-                self.progress_signal.emit(i + 1, total_count)
-
-            except Exception as e:
-                print(f"Error converting {file_path}: {e}")
-
-        return success_count, download_path
\ No newline at end of file
+    def __init__(self, max_workers=None):
+        super().__init__()
+        self.max_workers = max_workers # None 이면 CPU 코어 수
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def convert_images(self, file_paths, profile, output_dir=None, incremental=False):
+        # profile: 프로필 dict 또는 이름 ("PNG", "ICO", "WEBP (무손실)" 등)
+        # [수정] 프로세스 풀에서 변환하고 파일별 결과 보고서를 돌려줌 (백그라운드 스레드에서 호출)
+        # [NEW] incremental: 변환 기록(manifest)을 보고 바뀐/새 파일만 변환. 폴더도 받음
+        self._cancel.clear()
+        profile = get_profile(profile)
+        manifest = ConvertManifest() if incremental else None
+        try:
+            report = convert_batch(collect_images(file_paths), profile,
+                                   output_dir=output_dir,
+                                   max_workers=self.max_workers,
+                                   progress=self.progress_signal.emit,
+                                   cancel_event=self._cancel,
+                                   manifest=manifest)
+        finally:
+            if manifest: manifest.close()
+        # [NEW] 프로필별 인코딩 시간 / 출력 크기 누적
+        record_stats(profile['name'], report['success'], report['encode_seconds'],
+                     report['input_bytes'], report['output_bytes'])
+        return report
+
+# [NEW] 변환 일꾼 (GUI 스레드가 멈추지 않도록 convert_images 를 백그라운드에서 실행)
+class ImageConvertWorker(QThread):
+    finished_report = pyqtSignal(dict)
+    failed = pyqtSignal(str)  # 변환을 시작하지도 못한 경우 (저장 폴더 생성 실패 등)
+
+    def __init__(self, logic, file_paths, profile, incremental=False):
+        super().__init__()
+        self.logic = logic
+        self.file_paths = list(file_paths)
+        self.profile = profile
+        self.incremental = incremental
+
+    def cancel(self):
+        self.logic.cancel()
+
+    def run(self):
+        try:
+            report = self.logic.convert_images(self.file_paths, self.profile, incremental=self.incremental)
+        except Exception as e:
+            print(f"Convert Error: {e}")
+            self.failed.emit(str(e))
+            return
+        self.finished_report.emit(report)
@@ -0,0 +1,90 @@
+import os
+import time
+import sqlite3
+import threading
+from modules.app_paths import get_config_path
+
+
+def path_key(path):
+    # 경로 비교용 (Windows 는 대소문자 무시)
+    return os.path.normcase(os.path.abspath(path))
+
+
+class ConvertManifest:
+    """
+    증분 변환 기록 (SQLite)
+    - 키: 원본 경로 + 프로필 해시 + 저장 폴더
+    - 원본 크기/수정 시간이 같고 출력 파일이 그대로 있으면 다시 변환하지 않음
+    - 출력 경로 -> 원본 경로 로 이름 충돌을 판단 (한 번 정한 출력 이름은 계속 유지)
+    - output 은 비교용(normcase), output_path 는 실제로 쓸 경로 (Windows 에서 대소문자를 그대로 유지)
+    """
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_config_path("image_manifest.sqlite3")
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS convert_manifest (
+                source TEXT NOT NULL,
+                profile_hash TEXT NOT NULL,
+                output_dir TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                output TEXT NOT NULL,
+                output_size INTEGER NOT NULL,
+                converted_at REAL NOT NULL,
+                output_path TEXT,
+                PRIMARY KEY (source, profile_hash, output_dir)
+            )
+        """)
+        # 예전 기록 파일에는 output_path 가 없음 (그 행은 비교용 경로를 그대로 씀)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(convert_manifest)")]
+        if 'output_path' not in columns:
+            self.conn.execute("ALTER TABLE convert_manifest ADD COLUMN output_path TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_convert_manifest_output ON convert_manifest(output)")
+        self.conn.commit()
+
+    def lookup(self, source, profile_hash, output_dir):
+        # (크기, 수정 시간, 출력 경로, 출력 크기) 또는 None
+        with self._lock:
+            return self.conn.execute(
+                "SELECT size, mtime_ns, COALESCE(output_path, output), output_size FROM convert_manifest "
+                "WHERE source = ? AND profile_hash = ? AND output_dir = ?",
+                (path_key(source), profile_hash, path_key(output_dir))
+            ).fetchone()
+
+    def owners(self, output_dir):
+        # 이 폴더에 기록된 출력 경로 -> 원본 경로 (둘 다 비교용 path_key, 실제 경로는 lookup 으로)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT output, source FROM convert_manifest WHERE output_dir = ?", (path_key(output_dir),)
+            ).fetchall()
+        return {output: source for output, source in rows}
+
+    def store(self, source, profile_hash, output_dir, size, mtime_ns, output, output_size):
+        source, output_path = path_key(source), os.path.abspath(output)
+        output = path_key(output)
+        with self._lock:
+            # 같은 출력 파일을 가리키던 다른 기록(다른 프로필 등)은 이제 맞지 않음
+            self.conn.execute(
+                "DELETE FROM convert_manifest WHERE output = ? AND NOT (source = ? AND profile_hash = ?)",
+                (output, source, profile_hash))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO convert_manifest "
+                "(source, profile_hash, output_dir, size, mtime_ns, output, output_size, converted_at, output_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, profile_hash, path_key(output_dir), size, mtime_ns, output, output_size, time.time(),
+                 output_path))
+
+    def commit(self):
+        with self._lock:
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            try:
+                self.conn.commit()
+                self.conn.close()
+            except sqlite3.Error:
+                pass
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import hashlib
+from modules.app_paths import get_config_path
+
+PROFILES_FILENAME = "image_profiles.json"  # 사용자 프로필 + 프로필별 기록
+
+# 프로필 항목 (빠진 값은 이 기본값으로 채움)
+PROFILE_DEFAULTS = {
+    'name': "",
+    'format': "PNG",            # PNG / JPG / ICO / WEBP / PDF
+    'quality': 90,              # JPG / WEBP / PDF
+    'webp_method': 4,           # 0(빠름) ~ 6(작음)
+    'webp_lossless': False,
+    'png_compress_level': 6,    # 0(빠름) ~ 9(작음)
+    'png_optimize': False,      # 켜면 더 작지만 느림 (compress_level 무시)
+    'jpeg_progressive': False,
+    'jpeg_subsampling': "",     # "" (Pillow 기본) / "4:4:4" / "4:2:2" / "4:2:0"
+    'max_width': 0,             # 0 이면 제한 없음 (비율 유지하며 줄임)
+    'max_height': 0,
+    'output_dir': "",           # "" 이면 다운로드 폴더
+}
+
+FORMATS = ["PNG", "JPG", "ICO", "WEBP", "PDF"]
+ICO_MAX = 256
+
+# 기본 제공 프로필 (이름이 형식 코드와 같은 것이 그 형식의 기본값)
+BUILTIN_PROFILES = [
+    {'name': "PNG", 'format': "PNG"},
+    {'name': "PNG (빠르게)", 'format': "PNG", 'png_compress_level': 1},
+    {'name': "PNG (최대 압축)", 'format': "PNG", 'png_compress_level': 9, 'png_optimize': True},
+    {'name': "JPG", 'format': "JPG"},
+    {'name': "JPG (웹용 1920px)", 'format': "JPG", 'quality': 82, 'jpeg_progressive': True,
+     'jpeg_subsampling': "4:2:0", 'max_width': 1920, 'max_height': 1920},
+    {'name': "JPG (고화질 4:4:4)", 'format': "JPG", 'quality': 95, 'jpeg_subsampling': "4:4:4"},
+    {'name': "ICO", 'format': "ICO", 'max_width': ICO_MAX, 'max_height': ICO_MAX},
+    {'name': "WEBP", 'format': "WEBP"},
+    {'name': "WEBP (빠르게)", 'format': "WEBP", 'webp_method': 0},
+    {'name': "WEBP (무손실)", 'format': "WEBP", 'webp_lossless': True, 'webp_method': 6},
+    {'name': "PDF", 'format': "PDF"},
+]
+
+
+def make_profile(values):
+    profile = dict(PROFILE_DEFAULTS)
+    profile.update({k: v for k, v in values.items() if k in PROFILE_DEFAULTS})
+    profile['format'] = str(profile['format']).upper()
+    if profile['format'] not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {profile['format']}")
+    return profile
+
+
+# ==========================================
+# [1] 저장 옵션 (자식 프로세스에서도 사용 -> PyQt 없음)
+# ==========================================
+def output_ext(profile):
+    return profile['format'].lower()
+
+
+def output_size(profile):
+    # 최대 (가로, 세로). 제한이 없으면 None
+    w, h = profile['max_width'], profile['max_height']
+    if profile['format'] == "ICO":
+        w, h = min(w or ICO_MAX, ICO_MAX), min(h or ICO_MAX, ICO_MAX)
+    if not w and not h:
+        return None
+    # 한쪽만 정하면 다른 쪽은 제한 없음
+    return (w or 1 << 30, h or 1 << 30)
+
+
+def profile_hash(profile):
+    # 출력 결과에 영향을 주는 값만 (이름/저장 폴더는 제외)
+    values = {k: v for k, v in profile.items() if k in PROFILE_DEFAULTS and k not in ('name', 'output_dir')}
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def save_options(profile):
+    # img.save(path, **options) 에 넘길 인자
+    fmt = profile['format']
+    if fmt == "ICO":
+        size = output_size(profile)
+        return {'format': 'ICO', 'sizes': [(min(size), min(size))]}
+    if fmt == "JPG":
+        options = {'format': 'JPEG', 'quality': profile['quality'],
+                   'progressive': profile['jpeg_progressive']}
+        if profile['jpeg_subsampling']:
+            options['subsampling'] = profile['jpeg_subsampling']
+        return options
+    if fmt == "PDF":
+        return {'format': 'PDF', 'quality': profile['quality']}
+    if fmt == "WEBP":
+        return {'format': 'WEBP', 'quality': profile['quality'],
+                'method': profile['webp_method'], 'lossless': profile['webp_lossless']}
+    return {'format': 'PNG', 'compress_level': profile['png_compress_level'],
+            'optimize': profile['png_optimize']}
+
+
+# ==========================================
+# [2] 프로필 저장소 (설정 폴더의 JSON)
+# ==========================================
+def _read_store():
+    try:
+        with open(get_config_path(PROFILES_FILENAME), encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _write_store(data):
+    path = get_config_path(PROFILES_FILENAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def load_profiles():
+    # 기본 프로필 + 사용자 프로필 (같은 이름이면 사용자 것이 덮어씀)
+    profiles = {p['name']: make_profile(p) for p in BUILTIN_PROFILES}
+    for values in _read_store().get('profiles', []):
+        try:
+            profile = make_profile(values)
+        except (ValueError, TypeError) as e:
+            print(f"Skipping image profile {values.get('name')}: {e}", file=sys.stderr)
+            continue
+        if profile['name']:
+            profiles[profile['name']] = profile
+    return list(profiles.values())
+
+
+def get_profile(name_or_profile):
+    # 프로필 dict 또는 이름("PNG", "WEBP (무손실)" 등)
+    if isinstance(name_or_profile, dict):
+        return make_profile(name_or_profile)
+    for profile in load_profiles():
+        if profile['name'].lower() == str(name_or_profile).lower():
+            return profile
+    # 이름이 없으면 형식 코드로 보고 기본값 사용
+    return make_profile({'name': str(name_or_profile).upper(), 'format': name_or_profile})
+
+
+def save_profile(profile):
+    profile = make_profile(profile)
+    if not profile['name']:
+        raise ValueError("프로필 이름을 입력해주세요.")
+    data = _read_store()
+    others = [p for p in data.get('profiles', []) if p.get('name') != profile['name']]
+    data['profiles'] = others + [profile]
+    _write_store(data)
+    return profile
+
+
+def delete_profile(name):
+    data = _read_store()
+    data['profiles'] = [p for p in data.get('profiles', []) if p.get('name') != name]
+    _write_store(data)
+
+
+# ==========================================
+# [3] 프로필별 기록 (인코딩 시간 / 출력 크기 누적)
+# ==========================================
+def record_stats(name, files, encode_seconds, input_bytes, output_bytes):
+    if not files: return
+    data = _read_store()
+    stats = data.setdefault('stats', {}).setdefault(name, {
+        'files': 0, 'encode_seconds': 0.0, 'input_bytes': 0, 'output_bytes': 0})
+    stats['files'] += files
+    stats['encode_seconds'] += encode_seconds
+    stats['input_bytes'] += input_bytes
+    stats['output_bytes'] += output_bytes
+    try:
+        _write_store(data)
+    except OSError as e:
+        print(f"Failed to save image profile stats: {e}", file=sys.stderr)
+
+
+def load_stats(name):
+    return _read_store().get('stats', {}).get(name)
+
+
+def describe_stats(stats):
+    # "파일당 평균 인코딩 12ms · 평균 340KB (원본의 42%)"
+    if not stats or not stats.get('files'):
+        return ""
+    files = stats['files']
+    avg_ms = stats['encode_seconds'] * 1000 / files
+    avg_kb = stats['output_bytes'] / 1024 / files
+    text = f"파일당 평균 인코딩 {avg_ms:.0f}ms · 평균 {avg_kb:,.0f}KB"
+    if stats.get('input_bytes'):
+        text += f" (원본의 {stats['output_bytes'] * 100 / stats['input_bytes']:.0f}%)"
+    return text + f" · {files}개 기준"
@@ -1,11 +1,14 @@
 import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, 
-                             QLabel, QHBoxLayout, QFrame, QApplication, QSizePolicy) # QSizePolicy 추가됨
+                             QLabel, QHBoxLayout, QFrame, QSizePolicy, QProgressBar,
+                             QComboBox, QCheckBox) # QSizePolicy 추가됨
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QDragEnterEvent, QDropEvent
 from PyQt6.QtWidgets import QFileDialog
 
-from .converter_logic import ImageConverterLogic
+from .converter_logic import ImageConverterLogic, ImageConvertWorker
+from .converter_engine import STATUS_FAILED, IMAGE_EXTS, default_output_dir
+from .converter_profiles import load_profiles, save_profile, load_stats, describe_stats
 from modules.ui.custom_msg import CustomMessageBox
 
 # ▼ [UI] 드래그 앤 드롭 존
@@ -29,7 +32,7 @@ class DropZone(QFrame):
         """)
 
         layout = QVBoxLayout(self)
-        self.label = QLabel("여기에 이미지를 드래그하세요")
+        self.label = QLabel("여기에 이미지나 폴더를 드래그하세요")
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.label.setStyleSheet("color: #aaa; font-size: 16px; border: none; background: transparent;")
         layout.addWidget(self.label)
@@ -47,18 +50,21 @@ class DropZone(QFrame):
     def dropEvent(self, event: QDropEvent):
         self.setStyleSheet("border: 2px dashed #666; border-radius: 10px; background-color: #2b2b2b;")
         files = [u.toLocalFile() for u in event.mimeData().urls()]
-        image_files = [f for f in files if f.lower().endswith(('.png', '.jpg', '.jpeg', '.webp', '.bmp'))]
+        # [수정] 폴더도 받음 (하위 이미지를 모아서 변환)
+        image_files = [f for f in files if os.path.isdir(f) or f.lower().endswith(IMAGE_EXTS)]
         
         if image_files:
             self.parent_widget.run_conversion(image_files)
         else:
-            self.parent_widget.show_message("오류", "이미지 파일만 넣어주세요!")
+            self.parent_widget.show_message("오류", "이미지 파일이나 폴더만 넣어주세요!")
 
 # ▼ [UI] 메인 변환 위젯
 class ImageConverterWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.logic = ImageConverterLogic()
+        self.logic.progress_signal.connect(self.on_progress)
+        self.worker = None
         self.selected_format = "PNG"
         self.format_buttons = []
         
@@ -116,6 +122,39 @@ class ImageConverterWidget(QWidget):
         self.lbl_desc.setStyleSheet("color: #bbb; font-size: 14px; margin-top: 5px; margin-bottom: 5px;")
         layout.addWidget(self.lbl_desc)
 
+        # [NEW] 출력 프로필 (형식별 품질/압축/최대 크기/저장 폴더 묶음)
+        profile_layout = QHBoxLayout()
+        profile_layout.addStretch()
+        lbl_profile = QLabel("출력 프로필:")
+        lbl_profile.setStyleSheet("color: #bbb; font-size: 13px;")
+        profile_layout.addWidget(lbl_profile)
+
+        self.combo_profile = QComboBox()
+        self.combo_profile.setFixedWidth(220)
+        self.combo_profile.setStyleSheet("QComboBox { background-color: #3d3d3d; color: white; border: 1px solid #555; border-radius: 4px; padding: 4px; }")
+        self.combo_profile.currentIndexChanged.connect(self.update_profile_info)
+        profile_layout.addWidget(self.combo_profile)
+
+        self.btn_output_dir = QPushButton("저장 위치 변경")
+        self.btn_output_dir.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_output_dir.setStyleSheet("QPushButton { background-color: #555; color: white; border-radius: 4px; padding: 5px 10px; } QPushButton:hover { background-color: #666; }")
+        self.btn_output_dir.clicked.connect(self.change_output_dir)
+        profile_layout.addWidget(self.btn_output_dir)
+
+        # [NEW] 증분 변환: 이미 변환한 뒤 바뀌지 않은 파일은 건너뜀
+        self.chk_incremental = QCheckBox("바뀐 파일만 변환")
+        self.chk_incremental.setStyleSheet("color: #bbb; font-size: 13px;")
+        self.chk_incremental.setToolTip("이전 변환 기록과 원본 크기/수정 시간/프로필이 같고 결과 파일이 남아 있으면 건너뜁니다.\n"
+                                        "이름이 겹치는 파일은 '이름_해시' 로 저장하고, 기록에 없는 기존 파일은 덮어쓰지 않습니다.")
+        profile_layout.addWidget(self.chk_incremental)
+        profile_layout.addStretch()
+        layout.addLayout(profile_layout)
+
+        self.lbl_profile_info = QLabel("")
+        self.lbl_profile_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lbl_profile_info.setStyleSheet("color: #888; font-size: 12px;")
+        layout.addWidget(self.lbl_profile_info)
+
         # 4. [수정] 드래그 앤 드롭 존 (최대 크기로 확장)
         self.drop_zone = DropZone(self)
         # 고정 높이 삭제: self.drop_zone.setFixedHeight(250)
@@ -139,7 +178,7 @@ class ImageConverterWidget(QWidget):
 
         btn_layout.addSpacing(15)
 
-        self.btn_folder = QPushButton("📁 다운로드 폴더 열기")
+        self.btn_folder = QPushButton("📁 저장 폴더 열기")
         self.btn_folder.setFixedSize(180, 45)
         self.btn_folder.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn_folder.setStyleSheet("""
@@ -149,9 +188,31 @@ class ImageConverterWidget(QWidget):
         self.btn_folder.clicked.connect(self.open_download_folder)
         btn_layout.addWidget(self.btn_folder)
 
+        btn_layout.addSpacing(15)
+
+        # [NEW] 변환 취소 (변환 중에만 표시)
+        self.btn_cancel = QPushButton("⏹ 변환 취소")
+        self.btn_cancel.setFixedSize(140, 45)
+        self.btn_cancel.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_cancel.setStyleSheet("""
+            QPushButton { background-color: #c0392b; color: white; font-size: 14px; font-weight: bold; border-radius: 8px; }
+            QPushButton:hover { background-color: #e74c3c; }
+        """)
+        self.btn_cancel.clicked.connect(self.cancel_conversion)
+        self.btn_cancel.hide()
+        btn_layout.addWidget(self.btn_cancel)
+
         btn_layout.addStretch() 
         layout.addLayout(btn_layout)
 
+        # [NEW] 진행률 (파일 단위)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedHeight(8)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setStyleSheet("QProgressBar { background: #3d3d3d; border: none; border-radius: 4px; } QProgressBar::chunk { background: #0078D7; border-radius: 4px; }")
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
         # 6. 결과 메시지
         self.lbl_result = QLabel("")
         self.lbl_result.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -161,6 +222,7 @@ class ImageConverterWidget(QWidget):
         # 하단의 빈 여백(addStretch)을 제거하여 DropZone이 바닥까지 밀고 내려오게 함
         # layout.addStretch() 
         self.setLayout(layout)
+        self.reload_profiles()
 
     # --- 기능 로직 ---
     def on_format_changed(self, code, clicked_btn):
@@ -171,6 +233,55 @@ class ImageConverterWidget(QWidget):
         clicked_btn.setChecked(True)
         self.update_button_styles()
         self.lbl_desc.setText(self.descriptions.get(code, ""))
+        self.reload_profiles()
+
+    # --- [NEW] 출력 프로필 ---
+    def reload_profiles(self, select_name=None):
+        # 선택한 형식의 프로필만 표시 (형식 이름과 같은 프로필이 기본값)
+        self.profiles = [p for p in load_profiles() if p['format'] == self.selected_format]
+        self.combo_profile.blockSignals(True)
+        self.combo_profile.clear()
+        for profile in self.profiles:
+            self.combo_profile.addItem(profile['name'])
+        names = [p['name'] for p in self.profiles]
+        target = select_name if select_name in names else self.selected_format
+        self.combo_profile.setCurrentIndex(names.index(target) if target in names else 0)
+        self.combo_profile.blockSignals(False)
+        self.update_profile_info()
+
+    def current_profile(self):
+        i = self.combo_profile.currentIndex()
+        return self.profiles[i] if 0 <= i < len(self.profiles) else self.selected_format
+
+    def profile_output_dir(self):
+        profile = self.current_profile()
+        return (isinstance(profile, dict) and profile['output_dir']) or default_output_dir()
+
+    def update_profile_info(self):
+        profile = self.current_profile()
+        if not isinstance(profile, dict):
+            self.lbl_profile_info.setText("")
+            return
+        parts = [f"저장: {self.profile_output_dir()}"]
+        if profile['max_width'] or profile['max_height']:
+            parts.insert(0, f"최대 {profile['max_width'] or '-'}x{profile['max_height'] or '-'}")
+        stats = describe_stats(load_stats(profile['name']))
+        if stats:
+            parts.append(stats)
+        self.lbl_profile_info.setText(" · ".join(parts))
+
+    def change_output_dir(self):
+        profile = self.current_profile()
+        if not isinstance(profile, dict): return
+        folder = QFileDialog.getExistingDirectory(self, "저장 폴더 선택", self.profile_output_dir())
+        if not folder: return
+        # 사용자 프로필로 저장 (기본 프로필과 같은 이름이면 덮어씀)
+        try:
+            save_profile(dict(profile, output_dir=folder))
+        except (OSError, ValueError) as e:
+            self.show_message("오류", f"프로필을 저장하지 못했습니다.\n{e}")
+            return
+        self.reload_profiles(profile['name'])
 
     def update_button_styles(self):
         for btn, _ in self.format_buttons:
@@ -195,31 +306,102 @@ class ImageConverterWidget(QWidget):
                 """)
 
     def open_file_dialog(self):
-        files, _ = QFileDialog.getOpenFileNames(self, "이미지 선택", "", "Images (*.png *.jpg *.jpeg *.webp *.bmp)")
+        files, _ = QFileDialog.getOpenFileNames(self, "이미지 선택", "", "Images (" + " ".join("*" + e for e in IMAGE_EXTS) + ")")
         if files:
             self.run_conversion(files)
 
     def open_download_folder(self):
-        download_path = os.path.join(os.path.expanduser("~"), "Downloads")
+        # [수정] 현재 프로필의 저장 폴더 (기본: 다운로드 폴더)
+        download_path = self.profile_output_dir()
         if os.path.exists(download_path):
             os.startfile(download_path)
         else:
-            self.show_message("오류", "다운로드 폴더를 찾을 수 없습니다.")
+            self.show_message("오류", "저장 폴더를 찾을 수 없습니다.")
+
+    def is_busy(self):
+        return self.worker is not None and self.worker.isRunning()
 
     def run_conversion(self, files):
-        self.lbl_result.setText("⏳ 변환 중...")
+        # [수정] 백그라운드 일꾼 + 프로세스 풀에서 변환 (화면이 멈추지 않음)
+        if self.is_busy():
+            self.show_message("알림", "변환이 진행 중입니다. 끝난 뒤 다시 시도해주세요.")
+            return
+
+        self.lbl_result.setText("⏳ 변환 준비 중...")
         self.lbl_result.setStyleSheet("color: #aaa;")
-        QApplication.processEvents()
-        
-        target_ext = self.selected_format 
-        count, save_path = self.logic.convert_images(files, target_ext)
-        
-        if count > 0:
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.show()
+        self.btn_upload.setEnabled(False)
+
+        self.worker = ImageConvertWorker(self.logic, files, self.current_profile(),
+                                         incremental=self.chk_incremental.isChecked())
+        self.worker.finished_report.connect(self.on_conversion_finished)
+        self.worker.failed.connect(self.on_conversion_failed)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def cancel_conversion(self):
+        if self.is_busy():
+            self.worker.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.lbl_result.setText("⏳ 취소 중... (진행 중인 파일만 마무리합니다)")
+
+    def on_progress(self, done, total):
+        # 폴더를 넣으면 전체 개수는 일꾼이 모은 뒤에 알 수 있음
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+        if self.btn_cancel.isEnabled():
+            self.lbl_result.setText(f"⏳ 변환 중... ({done}/{total})")
+
+    def on_worker_finished(self):
+        # run() 이 완전히 끝난 뒤에 놓아줌 (finished_report 는 run() 안에서 보내므로 그때는 아직 실행 중)
+        if self.sender() is self.worker:
+            self.worker = None
+
+    def finish_conversion(self):
+        self.progress_bar.hide()
+        self.btn_cancel.hide()
+        self.btn_upload.setEnabled(True)
+
+    def on_conversion_failed(self, error):
+        self.finish_conversion()
+        self.lbl_result.setText("❌ 변환 실패")
+        self.lbl_result.setStyleSheet("color: #ff6b6b;")
+        self.show_message("오류", f"변환을 시작하지 못했습니다:\n{error}")
+
+    def on_conversion_finished(self, report):
+        self.finish_conversion()
+
+        count = report['success']
+        target_ext = report['profile']
+        if report['cancelled']:
+            self.lbl_result.setText(f"⏹ 취소됨: {count}개 변환 완료")
+            self.lbl_result.setStyleSheet("color: #f1c40f; font-size: 15px; font-weight: bold;")
+        elif count > 0 and report['skipped']:
+            self.lbl_result.setText(f"🎉 {count}개 변환 완료! (변경 없는 {report['skipped']}개 건너뜀)")
+            self.lbl_result.setStyleSheet("color: #00fa9a; font-size: 15px; font-weight: bold;")
+        elif count > 0:
             self.lbl_result.setText(f"🎉 총 {count}개 파일을 {target_ext}(으)로 변환 완료!")
             self.lbl_result.setStyleSheet("color: #00fa9a; font-size: 15px; font-weight: bold;")
+            self.lbl_result.setToolTip(f"인코딩 {report['encode_seconds']:.1f}초 · 출력 {report['output_bytes'] / 1024 / 1024:,.1f}MB")
+        elif report['skipped'] and not report['failed']:
+            self.lbl_result.setText(f"✅ 모두 최신 상태입니다. ({report['skipped']}개 건너뜀)")
+            self.lbl_result.setStyleSheet("color: #00fa9a; font-size: 15px; font-weight: bold;")
         else:
             self.lbl_result.setText("❌ 변환 실패")
             self.lbl_result.setStyleSheet("color: #ff6b6b;")
 
+        self.update_profile_info()
+
+        failed = [r for r in report['results'] if r['status'] == STATUS_FAILED]
+        if failed:
+            lines = [f"- {os.path.basename(r['path'])}: {r['error']}" for r in failed[:10]]
+            if len(failed) > 10:
+                lines.append(f"... 외 {len(failed) - 10}개")
+            self.show_message("변환 실패 목록", f"{len(failed)}개 파일을 변환하지 못했습니다.\n\n" + "\n".join(lines))
+
     def show_message(self, title, text):
         CustomMessageBox(title, text, is_question=False, parent=self).exec()
\ No newline at end of file
@@ -0,0 +1,36 @@
+import datetime
+from PIL import Image
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tiff')
+
+
+def default_pdf_name():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"Merged_Images_{timestamp}.pdf"
+
+
+def images_to_pdf(paths, save_path, progress=None):
+    """
+    이미지 여러 장을 순서대로 PDF 하나로 저장 (GUI 와 무관)
+    progress(읽은 이미지 수, 전체)
+    반환: {'output', 'pages'}
+    """
+    paths = list(paths)
+    if not paths:
+        raise ValueError("변환할 이미지를 추가해주세요.")
+    image_list = []
+    first_image = None
+    for i, path in enumerate(paths):
+        img = Image.open(path)
+        if img.mode in ("RGBA", "LA"):
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        else: img = img.convert("RGB")
+
+        if i == 0: first_image = img
+        else: image_list.append(img)
+        if progress: progress(i + 1, len(paths))
+
+    first_image.save(save_path, save_all=True, append_images=image_list)
+    return {'output': save_path, 'pages': len(paths)}
@@ -1,12 +1,11 @@
 import os
-import datetime
-from PIL import Image
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
                              QListWidget, QHBoxLayout, QFileDialog, QAbstractItemView, 
                              QListWidgetItem, QStyledItemDelegate, QStyle)
 from PyQt6.QtCore import Qt, QSize, QRect
 from PyQt6.QtGui import QDragEnterEvent, QDropEvent, QIcon, QPixmap, QPainter, QColor, QPen, QFontMetrics
 from modules.ui.custom_msg import CustomMessageBox
+from .img_to_pdf_logic import images_to_pdf, default_pdf_name
 
 # Delegate (그리기 담당) - 크기를 동적으로 받기 위해 수정 안 함, 로직에서 처리
 class ImageCardDelegate(QStyledItemDelegate):
@@ -190,28 +189,14 @@ class ImageToPdfWidget(QWidget):
             return
 
         download_dir = os.path.join(os.path.expanduser("~"), "Downloads")
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"Merged_Images_{timestamp}.pdf"
+        filename = default_pdf_name()
         save_path = os.path.join(download_dir, filename)
 
         try:
-            image_list = []
-            first_image = None
-            for i in range(count):
-                path = self.list_widget.item(i).data(Qt.ItemDataRole.UserRole)
-                img = Image.open(path)
-                if img.mode in ("RGBA", "LA"):
-                    background = Image.new("RGB", img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[-1])
-                    img = background
-                else: img = img.convert("RGB")
-
-                if i == 0: first_image = img
-                else: image_list.append(img)
-
-            if first_image:
-                first_image.save(save_path, save_all=True, append_images=image_list)
-                CustomMessageBox("성공", f"다운로드 폴더에 저장되었습니다!\n\n파일명: {filename}", parent=self).exec()
-                os.startfile(download_dir)
+            # [수정] 목록 순서대로 경로만 넘김 (변환은 img_to_pdf_logic)
+            paths = [self.list_widget.item(i).data(Qt.ItemDataRole.UserRole) for i in range(count)]
+            images_to_pdf(paths, save_path)
+            CustomMessageBox("성공", f"다운로드 폴더에 저장되었습니다!\n\n파일명: {filename}", parent=self).exec()
+            os.startfile(download_dir)
         except Exception as e:
             CustomMessageBox("오류", f"변환 중 오류 발생:\n{e}", parent=self).exec()
\ No newline at end of file
@@ -0,0 +1,253 @@
+import os
+import sys
+import time
+import threading
+from PyPDF2 import PdfMerger, PdfReader
+
+# PyMuPDF 가 있으면 큰 파일은 훨씬 빠르고 메모리도 적게 씀 (없으면 PyPDF2 만 사용)
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# 합치기 방식
+BACKEND_AUTO = "auto"     # 입력이 크면 PyMuPDF, 아니면 PyPDF2
+BACKEND_PYPDF = "pypdf"
+BACKEND_FITZ = "fitz"
+
+LARGE_INPUT_BYTES = 64 * 1024 * 1024   # auto: 입력 합계가 이 이상이면 PyMuPDF
+FLUSH_BYTES = 256 * 1024 * 1024        # PyMuPDF: 입력을 이만큼 넣을 때마다 임시 파일에 내려씀
+STAGE_COMPACT = "compact"              # progress 의 파일 이름 자리에 들어가는 단계 표시
+
+
+def choose_backend(backend, input_bytes):
+    if backend == BACKEND_AUTO:
+        backend = BACKEND_FITZ if fitz is not None and input_bytes >= LARGE_INPUT_BYTES else BACKEND_PYPDF
+    if backend == BACKEND_FITZ and fitz is None:
+        raise ValueError("PyMuPDF(fitz)가 설치되어 있지 않습니다.")
+    if backend not in (BACKEND_PYPDF, BACKEND_FITZ):
+        raise ValueError(f"알 수 없는 합치기 방식: {backend}")
+    return backend
+
+
+def merge_pdfs(paths, save_path, progress=None, cancel_event=None, backend=BACKEND_AUTO,
+               compact=False, recompress=False, linearize=False):
+    """
+    PDF 여러 개를 순서대로 하나로 합침 (GUI 와 무관)
+    - 임시 파일에 쓴 뒤 이름 변경 (실패하거나 취소하면 기존 파일은 그대로)
+    - backend: auto / pypdf / fitz
+    - compact: 합친 뒤 정리 단계 (compact_pdf 참고, PyMuPDF 필요). recompress / linearize 는 그 옵션
+    - progress(완료 페이지 수, 전체 페이지 수, 파일 이름): 파일 하나를 넣을 때마다 (정리 단계는 STAGE_COMPACT)
+    - cancel_event(threading.Event)가 켜지면 다음 파일로 넘어가지 않고 멈춤 (결과 파일 없음)
+    반환: {'output', 'files', 'pages', 'backend', 'cancelled', 'input_bytes', 'output_bytes', 'seconds',
+           'compaction'(정리 보고서 또는 None)}
+    """
+    paths = list(paths)
+    if len(paths) < 2:
+        raise ValueError("합치려면 최소 2개 이상의 파일이 필요합니다.")
+    compact = compact or recompress or linearize
+    if compact and not can_compact():
+        raise ValueError("출력 정리에는 PyMuPDF(fitz)가 필요합니다.")
+    cancel_event = cancel_event or threading.Event()
+    started = time.perf_counter()
+    input_bytes = sum(os.path.getsize(p) for p in paths)
+    backend = choose_backend(backend, input_bytes)
+
+    folder, name = os.path.split(os.path.abspath(save_path))
+    temp_path = os.path.join(folder, f".{name}.{os.getpid()}.merging")
+    report = {'output': "", 'files': len(paths), 'pages': 0, 'backend': backend, 'cancelled': False,
+              'input_bytes': input_bytes, 'output_bytes': 0, 'seconds': 0.0, 'compaction': None}
+    merge = _merge_fitz if backend == BACKEND_FITZ else _merge_pypdf
+    try:
+        pages = merge(paths, temp_path, progress, cancel_event)
+        if compact and not cancel_event.is_set():
+            # [NEW] 같은 글꼴/이미지가 파일마다 들어간 것을 하나로 (취소는 이 단계 전까지만)
+            if progress: progress(pages, pages, STAGE_COMPACT)
+            report['compaction'] = compact_pdf(temp_path, recompress=recompress, linearize=linearize)
+        if cancel_event.is_set():
+            report['cancelled'] = True
+        else:
+            os.replace(temp_path, save_path)
+            report.update(output=save_path, pages=pages, output_bytes=os.path.getsize(save_path))
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    report['seconds'] = time.perf_counter() - started
+    return report
+
+
+def _merge_pypdf(paths, temp_path, progress, cancel_event):
+    # 페이지 수만 먼저 (읽은 reader 는 바로 버림)
+    total = 0
+    for path in paths:
+        if cancel_event.is_set(): return 0
+        with open(path, "rb") as f:
+            total += len(PdfReader(f).pages)
+
+    # 파일은 넣을 차례에 하나씩 열고, 경로 대신 열린 파일을 넘김 (경로를 주면 PyPDF2 가 파일 전체를 메모리로 읽음)
+    # PdfMerger 는 write 할 때 원본에서 객체를 읽으므로 넣은 파일은 그때까지 열어 둬야 함
+    handles = []
+    merger = PdfMerger()
+    try:
+        done = 0
+        for path in paths:
+            if cancel_event.is_set(): return done
+            handles.append(open(path, "rb"))
+            reader = PdfReader(handles[-1])
+            merger.append(reader)
+            done += len(reader.pages)
+            if progress: progress(done, total, os.path.basename(path))
+        with open(temp_path, "wb") as f:
+            merger.write(f)
+        return total
+    finally:
+        merger.close()
+        for f in handles:
+            f.close()
+
+
+def _merge_fitz(paths, temp_path, progress, cancel_event):
+    # 페이지 수만 먼저 (문서를 열어도 페이지 내용은 읽지 않음)
+    counts = []
+    for path in paths:
+        if cancel_event.is_set(): return 0
+        with fitz.open(path) as doc:
+            counts.append(doc.page_count)
+    total = sum(counts)
+
+    out = fitz.open()
+    saved = False
+    unsaved_bytes = 0
+    toc = []
+    done = 0
+    try:
+        for path, pages in zip(paths, counts):
+            if cancel_event.is_set(): return done
+            with fitz.open(path) as src:
+                out.insert_pdf(src)
+                # insert_pdf 는 책갈피를 옮기지 않으므로 페이지 번호만 밀어서 모아둠
+                toc.extend([level, title, page + done if page > 0 else page]
+                           for level, title, page in src.get_toc(simple=True))
+            done += pages
+            unsaved_bytes += os.path.getsize(path)
+            if unsaved_bytes >= FLUSH_BYTES:
+                # 지금까지 넣은 것을 임시 파일에 내려쓰고 다시 열어 메모리를 비움
+                _save(out, temp_path, saved)
+                out.close()
+                out = fitz.open(temp_path)
+                saved = True
+                unsaved_bytes = 0
+            if progress: progress(done, total, os.path.basename(path))
+
+        if toc:
+            try:
+                out.set_toc(toc)
+            except Exception as e:
+                print(f"Merge bookmarks skipped: {e}", file=sys.stderr)
+        _save(out, temp_path, saved)
+        return total
+    finally:
+        if not out.is_closed:
+            out.close()
+
+
+def _save(doc, path, saved):
+    # 처음엔 새로 저장, 그다음부터는 바뀐 부분만 덧붙임
+    if saved:
+        doc.saveIncr()
+    else:
+        doc.save(path)
+
+
+def can_compact():
+    # 정리 단계는 PyMuPDF 의 저장 옵션을 씀
+    return fitz is not None
+
+
+_linearize_supported = None
+
+
+def can_linearize():
+    # MuPDF 1.24 부터 선형화가 빠져서 저장할 때마다 예외 -> 한 페이지짜리 문서로 한 번만 확인
+    global _linearize_supported
+    if _linearize_supported is None:
+        _linearize_supported = False
+        if fitz is not None:
+            try:
+                with fitz.open() as doc:
+                    doc.new_page()
+                    doc.tobytes(linear=True)
+                _linearize_supported = True
+            except Exception:
+                pass
+    return _linearize_supported
+
+
+def compact_pdf(path, recompress=False, linearize=False):
+    """
+    PDF 를 제자리에서 다시 씀 (임시 파일 -> 이름 변경)
+    - 내용이 같은 스트림/객체(여러 파일에 들어간 같은 글꼴, 이미지, ICC 프로필)는 하나만 남기고
+      아무 데서도 쓰지 않는 객체는 삭제 (PyMuPDF garbage=4)
+    - recompress: 압축 안 된 스트림을 deflate 로 압축하고 페이지 내용 정리 (clean, 느림)
+    - linearize: 빠른 웹 보기용 선형화 (can_linearize() 가 아니면 건너뜀)
+    반환: {'before_bytes', 'after_bytes', 'seconds', 'recompressed', 'linearized'}
+    """
+    started = time.perf_counter()
+    before = os.path.getsize(path)
+    folder, name = os.path.split(os.path.abspath(path))
+    temp_path = os.path.join(folder, f".{name}.{os.getpid()}.compacting")
+    options = {'garbage': 4}
+    if recompress:
+        options.update(deflate=True, deflate_images=True, deflate_fonts=True, clean=True)
+
+    linearized = False
+    try:
+        with fitz.open(path) as doc:
+            if linearize and can_linearize():
+                try:
+                    doc.save(temp_path, linear=True, **options)
+                    linearized = True
+                except Exception as e:
+                    print(f"Linearize skipped: {e}", file=sys.stderr)
+            if not linearized:
+                doc.save(temp_path, **options)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    return {'before_bytes': before, 'after_bytes': os.path.getsize(path),
+            'seconds': time.perf_counter() - started, 'recompressed': recompress, 'linearized': linearized}
+
+
+def describe_compaction(result):
+    # "정리: 512.3MB -> 120.4MB (-76%) · 8.2초"
+    if not result: return ""
+    before, after = result['before_bytes'], result['after_bytes']
+    text = f"정리: {before / 1024 / 1024:,.1f}MB -> {after / 1024 / 1024:,.1f}MB"
+    if before:
+        text += f" ({(after - before) * 100 / before:+.0f}%)"
+    text += f" · {result['seconds']:.1f}초"
+    if result['linearized']:
+        text += " · 선형화"
+    return text
+
+
+def merge_job(paths, save_path, options, events, cancel_event):
+    """
+    자식 프로세스용: merge_pdfs 를 실행하고 진행 상황과 결과를 events(Queue)로 보냄
+    - options: merge_pdfs 의 추가 인자 (backend, compact, recompress, linearize)
+    ('progress', 완료, 전체, 파일 이름) / ('done', 보고서) / ('error', 메시지)
+    """
+    def progress(done, total, name=""):
+        events.put(("progress", done, total, name))
+
+    try:
+        events.put(("done", merge_pdfs(paths, save_path, progress, cancel_event, **options)))
+    except Exception as e:
+        events.put(("error", str(e)))
@@ -1,14 +1,60 @@
 import os
-from PyPDF2 import PdfMerger
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
+import queue
+import multiprocessing
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, QProgressBar, QCheckBox,
                              QListWidget, QHBoxLayout, QFileDialog, QAbstractItemView, QListWidgetItem)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from modules.ui.custom_msg import CustomMessageBox
 from ...ui.pdf_preview import PdfPreviewWidget
+from .merge_logic import merge_job, can_compact, can_linearize, describe_compaction, STAGE_COMPACT
+
+# [NEW] 합치기 일꾼
+# 실제 합치기는 자식 프로세스에서 (PyMuPDF/PyPDF2 가 오래 붙잡고 있어도 화면이 멈추지 않고,
+# 끝나면 프로세스와 함께 메모리가 전부 반환됨). 이 스레드는 진행 상황만 받아서 전달
+class MergeWorker(QThread):
+    progress = pyqtSignal(int, int, str)  # (완료 페이지, 전체 페이지, 파일 이름)
+    finished_report = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, paths, save_path, options=None):
+        super().__init__()
+        ctx = multiprocessing.get_context("spawn")
+        self.events = ctx.Queue()
+        self.cancel_event = ctx.Event()
+        self.process = ctx.Process(target=merge_job, daemon=True,
+                                   args=(list(paths), save_path, options or {}, self.events, self.cancel_event))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        self.process.start()
+        while True:
+            try:
+                event = self.events.get(timeout=0.2)
+            except queue.Empty:
+                if self.process.is_alive(): continue
+                # 끝나기 직전에 보낸 결과가 아직 오는 중일 수 있음
+                try:
+                    event = self.events.get(timeout=1.0)
+                except queue.Empty:
+                    self.failed.emit("합치기 작업이 비정상 종료되었습니다.")
+                    break
+            if event[0] == "progress":
+                self.progress.emit(*event[1:])
+            elif event[0] == "done":
+                self.finished_report.emit(event[1])
+                break
+            else:
+                self.failed.emit(event[1])
+                break
+        self.process.join()
+
 
 class PdfMergeWidget(QWidget):
     def __init__(self):
         super().__init__()
+        self.worker = None
         self.init_ui()
 
     def init_ui(self):
@@ -57,6 +103,26 @@ class PdfMergeWidget(QWidget):
         
         left_layout.addLayout(btn_box)
 
+        # [NEW] 출력 정리 옵션 (여러 파일에 들어간 같은 글꼴/이미지를 하나로)
+        option_box = QHBoxLayout()
+        self.chk_compact = QCheckBox("중복 리소스 정리")
+        self.chk_compact.setToolTip("같은 글꼴·이미지·색 프로필을 하나만 남기고, 쓰지 않는 객체를 지웁니다.")
+        # 설치된 PyMuPDF 가 선형화를 못 하면 재압축만 약속
+        self.linearize = can_linearize()
+        if self.linearize:
+            self.chk_optimize = QCheckBox("재압축 + 웹 최적화 (느림)")
+            self.chk_optimize.setToolTip("스트림을 다시 압축하고, 웹에서 첫 페이지가 빨리 열리도록 선형화합니다.")
+        else:
+            self.chk_optimize = QCheckBox("재압축 (느림)")
+            self.chk_optimize.setToolTip("압축되지 않은 스트림과 글꼴·이미지를 다시 압축합니다.")
+        for chk in [self.chk_compact, self.chk_optimize]:
+            chk.setStyleSheet("color: #ddd;")
+            # 정리 단계는 PyMuPDF 가 있어야 함
+            chk.setEnabled(can_compact())
+            option_box.addWidget(chk)
+        option_box.addStretch()
+        left_layout.addLayout(option_box)
+
         # 실행 버튼
         self.btn_run = QPushButton("📄 하나로 합치기")
         self.btn_run.setFixedHeight(50)
@@ -65,6 +131,27 @@ class PdfMergeWidget(QWidget):
         self.btn_run.clicked.connect(self.run_merge)
         left_layout.addWidget(self.btn_run)
 
+        # [NEW] 진행률 + 취소 (합치는 중에만 표시)
+        progress_box = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedHeight(8)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setStyleSheet("QProgressBar { background: #3d3d3d; border: none; border-radius: 4px; } QProgressBar::chunk { background: #27ae60; border-radius: 4px; }")
+        progress_box.addWidget(self.progress_bar, 1)
+
+        self.btn_cancel = QPushButton("⏹ 취소")
+        self.btn_cancel.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_cancel.setStyleSheet("background-color: #c0392b; color: white; padding: 6px 12px; border-radius: 5px;")
+        self.btn_cancel.clicked.connect(self.cancel_merge)
+        progress_box.addWidget(self.btn_cancel)
+        self.progress_bar.hide()
+        self.btn_cancel.hide()
+        left_layout.addLayout(progress_box)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet("color: #aaa;")
+        left_layout.addWidget(self.lbl_status)
+
         # === [우측] 미리보기 영역 ===
         right_layout = QVBoxLayout()
         lbl_preview = QLabel("선택한 파일 미리보기")
@@ -120,7 +207,20 @@ class PdfMergeWidget(QWidget):
             path = item.data(Qt.ItemDataRole.UserRole)
             self.preview.load_pdf(path)
 
+    def is_busy(self):
+        return self.worker is not None and self.worker.isRunning()
+
+    def set_controls_enabled(self, enabled):
+        # 합치는 중에는 목록을 바꾸지 못하게
+        for btn in [self.btn_add, self.btn_remove, self.btn_clear, self.btn_run]:
+            btn.setEnabled(enabled)
+        for chk in [self.chk_compact, self.chk_optimize]:
+            chk.setEnabled(enabled and can_compact())
+        self.list_widget.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove if enabled
+                                         else QAbstractItemView.DragDropMode.NoDragDrop)
+
     def run_merge(self):
+        if self.is_busy(): return
         count = self.list_widget.count()
         if count < 2:
             CustomMessageBox("알림", "합치려면 최소 2개 이상의 파일이 필요합니다.", parent=self).exec()
@@ -129,18 +229,67 @@ class PdfMergeWidget(QWidget):
         save_path, _ = QFileDialog.getSaveFileName(self, "저장할 파일명", "merged.pdf", "PDF Files (*.pdf)")
         if not save_path: return
 
-        try:
-            merger = PdfMerger()
-            for i in range(count):
-                item = self.list_widget.item(i)
-                path = item.data(Qt.ItemDataRole.UserRole)
-                merger.append(path)
-            
-            merger.write(save_path)
-            merger.close()
-            
-            CustomMessageBox("성공", "성공적으로 합쳤습니다!", parent=self).exec()
-            os.startfile(os.path.dirname(save_path))
+        # [수정] 백그라운드 일꾼에서 합치기 (수백 개 / 수 GB 도 화면이 멈추지 않음)
+        paths = [self.list_widget.item(i).data(Qt.ItemDataRole.UserRole) for i in range(count)]
+        self.set_controls_enabled(False)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.show()
+        self.lbl_status.setText("⏳ 파일을 확인하는 중...")
+
+        optimize = self.chk_optimize.isChecked()
+        options = {'compact': self.chk_compact.isChecked() or optimize,
+                   'recompress': optimize, 'linearize': optimize and self.linearize}
+        self.worker = MergeWorker(paths, save_path, options)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished_report.connect(self.on_merge_finished)
+        self.worker.failed.connect(self.on_merge_failed)
+        # 결과가 와도 스레드는 자식 프로세스를 정리(join)하는 중 -> 참조는 스레드가 끝난 뒤에 놓음
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def cancel_merge(self):
+        if self.is_busy():
+            self.worker.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.lbl_status.setText("⏳ 취소 중...")
+
+    def on_progress(self, done, total, name):
+        if not self.btn_cancel.isEnabled(): return
+        self.progress_bar.setRange(0, max(1, total))
+        self.progress_bar.setValue(done)
+        if name == STAGE_COMPACT:
+            self.progress_bar.setRange(0, 0)
+            self.lbl_status.setText("⏳ 중복 리소스 정리 중...")
+        elif done >= total:
+            self.lbl_status.setText(f"⏳ 저장하는 중... ({total}페이지)")
+        else:
+            self.lbl_status.setText(f"⏳ {done}/{total}페이지 · {name}")
+
+    def on_worker_finished(self):
+        if self.sender() is self.worker:
+            self.worker = None
+
+    def finish_merge(self):
+        self.progress_bar.hide()
+        self.btn_cancel.hide()
+        self.set_controls_enabled(True)
+
+    def on_merge_finished(self, report):
+        self.finish_merge()
+        if report['cancelled']:
+            self.lbl_status.setText("⏹ 취소됨 (저장된 파일 없음)")
+            return
+        self.lbl_status.setText(
+            f"✅ {report['files']}개 파일 · {report['pages']}페이지 · "
+            f"{report['output_bytes'] / 1024 / 1024:,.1f}MB · {report['seconds']:.1f}초")
+        if report['compaction']:
+            self.lbl_status.setText(self.lbl_status.text() + "\n" + describe_compaction(report['compaction']))
+        CustomMessageBox("성공", "성공적으로 합쳤습니다!", parent=self).exec()
+        os.startfile(os.path.dirname(report['output']))
 
-        except Exception as e:
-            CustomMessageBox("오류", f"병합 실패:\n{e}", parent=self).exec()
\ No newline at end of file
+    def on_merge_failed(self, error):
+        self.finish_merge()
+        self.lbl_status.setText("❌ 병합 실패")
+        CustomMessageBox("오류", f"병합 실패:\n{error}", parent=self).exec()
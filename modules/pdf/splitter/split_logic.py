@@ -0,0 +1,73 @@
+import os
+from PyPDF2 import PdfReader, PdfWriter
+
+# 자르기 방식
+SPLIT_ALL = "all"       # 모든 페이지를 1장씩
+SPLIT_RANGE = "range"   # 범위 지정 (예: 1-3, 5, 7-9) -> 파일 하나
+SPLIT_EVERY = "every"   # N장씩 묶음
+
+
+def parse_page_ranges(text, total_pages):
+    # "1-3, 5" -> [0, 1, 2, 4] (범위를 벗어난 페이지는 무시)
+    if not text or not text.strip():
+        raise ValueError("범위를 입력해주세요.")
+    pages = []
+    for part in text.replace(" ", "").split(","):
+        if not part: continue
+        if "-" in part:
+            start, end = map(int, part.split("-"))
+            pages.extend(i for i in range(start - 1, end) if 0 <= i < total_pages)
+        else:
+            idx = int(part) - 1
+            if 0 <= idx < total_pages: pages.append(idx)
+    return pages
+
+
+def save_pdf(writer, folder, filename):
+    path = os.path.join(folder, filename)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def split_pdf(path, save_dir, mode=SPLIT_ALL, ranges="", step=2, progress=None):
+    """
+    PDF 하나를 방식(mode)에 따라 잘라서 save_dir 에 저장 (GUI 와 무관)
+    progress(완료 페이지 수, 전체)
+    반환: 만든 파일 경로 목록
+    """
+    reader = PdfReader(path)
+    total_pages = len(reader.pages)
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    outputs = []
+
+    if mode == SPLIT_ALL:
+        for i in range(total_pages):
+            writer = PdfWriter()
+            writer.add_page(reader.pages[i])
+            outputs.append(save_pdf(writer, save_dir, f"{base_name}_p{i+1}.pdf"))
+            if progress: progress(i + 1, total_pages)
+
+    elif mode == SPLIT_RANGE:
+        pages = parse_page_ranges(ranges, total_pages)
+        if not pages:
+            raise ValueError("선택된 페이지가 없습니다.")
+        writer = PdfWriter()
+        for i in pages:
+            writer.add_page(reader.pages[i])
+        outputs.append(save_pdf(writer, save_dir, f"{base_name}_extracted.pdf"))
+        if progress: progress(len(pages), len(pages))
+
+    elif mode == SPLIT_EVERY:
+        step = max(1, int(step))
+        for i in range(0, total_pages, step):
+            writer = PdfWriter()
+            end = min(i + step, total_pages)
+            for page_idx in range(i, end):
+                writer.add_page(reader.pages[page_idx])
+            outputs.append(save_pdf(writer, save_dir, f"{base_name}_part{i//step + 1}.pdf"))
+            if progress: progress(end, total_pages)
+
+    else:
+        raise ValueError(f"알 수 없는 자르기 방식: {mode}")
+    return outputs
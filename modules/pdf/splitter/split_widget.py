@@ -1,11 +1,11 @@
 import os
-from PyPDF2 import PdfReader, PdfWriter
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QLabel, 
                              QFileDialog, QHBoxLayout, QRadioButton, 
                              QLineEdit, QSpinBox, QButtonGroup)
 from PyQt6.QtCore import Qt
 from modules.ui.custom_msg import CustomMessageBox
 from ...ui.pdf_preview import PdfPreviewWidget
+from .split_logic import split_pdf, SPLIT_ALL, SPLIT_RANGE, SPLIT_EVERY
 
 class PdfSplitWidget(QWidget):
     def __init__(self):
@@ -139,51 +139,16 @@ class PdfSplitWidget(QWidget):
         if not save_dir: return
 
         try:
-            reader = PdfReader(self.current_pdf)
-            total_pages = len(reader.pages)
-            base_name = os.path.splitext(os.path.basename(self.current_pdf))[0]
-
+            # [수정] 자르기 엔진은 split_logic (헤드리스 실행과 공유)
             if self.radio_all.isChecked():
-                for i in range(total_pages):
-                    writer = PdfWriter()
-                    writer.add_page(reader.pages[i])
-                    self.save_pdf(writer, save_dir, f"{base_name}_p{i+1}.pdf")
-
+                split_pdf(self.current_pdf, save_dir, SPLIT_ALL)
             elif self.radio_range.isChecked():
-                txt = self.input_range.text()
-                if not txt:
-                    raise Exception("범위를 입력해주세요.")
-                ranges = txt.replace(" ", "").split(",")
-                writer = PdfWriter()
-                for part in ranges:
-                    if "-" in part: 
-                        start, end = map(int, part.split("-"))
-                        for i in range(start-1, end):
-                            if 0 <= i < total_pages: writer.add_page(reader.pages[i])
-                    else: 
-                        idx = int(part) - 1
-                        if 0 <= idx < total_pages: writer.add_page(reader.pages[idx])
-                
-                if len(writer.pages) > 0:
-                    self.save_pdf(writer, save_dir, f"{base_name}_extracted.pdf")
-                else:
-                    raise Exception("선택된 페이지가 없습니다.")
-
+                split_pdf(self.current_pdf, save_dir, SPLIT_RANGE, ranges=self.input_range.text())
             elif self.radio_split.isChecked():
-                step = self.spin_split.value()
-                for i in range(0, total_pages, step):
-                    writer = PdfWriter()
-                    end = min(i + step, total_pages)
-                    for page_idx in range(i, end):
-                        writer.add_page(reader.pages[page_idx])
-                    self.save_pdf(writer, save_dir, f"{base_name}_part{i//step + 1}.pdf")
+                split_pdf(self.current_pdf, save_dir, SPLIT_EVERY, step=self.spin_split.value())
 
             CustomMessageBox("성공", "작업이 완료되었습니다!", parent=self).exec()
             os.startfile(save_dir)
 
         except Exception as e:
             CustomMessageBox("오류", f"작업 중 오류 발생:\n{e}", parent=self).exec()
-
-    def save_pdf(self, writer, folder, filename):
-        with open(os.path.join(folder, filename), "wb") as f:
-            writer.write(f)
\ No newline at end of file
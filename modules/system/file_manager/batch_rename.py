@@ -0,0 +1,387 @@
+import os
+import json
+import time
+import uuid
+from modules.app_paths import get_config_path
+
+JOURNAL_DIRNAME = "rename_journal"
+KEEP_JOURNALS = 20     # 되돌리기용으로 남겨 둘 완료된 기록 수
+FSYNC_EVERY = 100      # 이만큼 진행할 때마다 기록을 디스크에 확정 (이름이 다시 쓰이는 사슬 단계는 매번)
+
+# 기록 상태
+STATE_PENDING = "pending"   # 진행 중 / 중단됨 (이어서 하기 가능)
+STATE_FAILED = "failed"     # 오류로 멈춤 (이어서 하기 또는 되돌리기)
+STATE_DONE = "done"
+STATE_UNDONE = "undone"
+
+_INVALID_CHARS = set('<>:"/\\|?*') if os.name == 'nt' else {'/'}
+
+
+def get_journal_dir():
+    path = get_config_path(JOURNAL_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _key(path):
+    # 같은 파일인지 비교할 때 쓰는 키 (Windows 는 대소문자 무시)
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _invalid_name(name):
+    if not name.strip() or name in ('.', '..'):
+        return "빈 이름"
+    if any(c in _INVALID_CHARS for c in name):
+        return "사용할 수 없는 문자"
+    if os.name == 'nt' and name[-1] in ' .':
+        return "끝에 공백/마침표"
+    return None
+
+
+# ==========================================
+# [1] 계획: 충돌/순환 확인 후 실행 순서 결정
+# ==========================================
+def plan_renames(pairs):
+    """
+    (기존 경로, 새 경로) 목록 -> 실행 계획
+    - 결과: {'moves': [[기존, 새]], 'steps': [[원본, 대상, move 번호]], 'skipped': [[기존, 새, 이유]]}
+    - 같은 대상으로 가는 이름이 여럿이거나, 대상이 이미 있으면 건너뜀
+    - a -> b, b -> c 처럼 이어지면 c 쪽부터, a <-> b 처럼 돌면 임시 이름을 거쳐서 실행
+    """
+    skipped = []
+    moves = []
+    seen = set()
+    for old, new in pairs:
+        k = _key(old)
+        if k in seen: continue
+        seen.add(k)
+        if old == new:
+            continue
+        reason = _invalid_name(os.path.basename(new))
+        if reason is None and os.path.dirname(new) != os.path.dirname(old):
+            reason = "사용할 수 없는 문자" # 새 이름에 폴더 구분 문자가 들어간 경우
+        if reason is None and not os.path.lexists(old):
+            reason = "원본 없음"
+        if reason:
+            skipped.append([old, new, reason])
+        else:
+            moves.append([old, new])
+
+    # 같은 대상으로 가는 이동은 모두 제외
+    by_target = {}
+    for m in moves:
+        by_target.setdefault(_key(m[1]), []).append(m)
+    for group in by_target.values():
+        if len(group) > 1:
+            for m in group:
+                skipped.append([m[0], m[1], "대상 이름 중복"])
+    moves = [m for m in moves if len(by_target[_key(m[1])]) == 1]
+
+    # 대상이 이미 있으면 제외 (단, 그 파일도 이번에 다른 이름으로 옮겨지면 통과)
+    # 제외된 이동의 원본은 그대로 남으므로 더 이상 바뀌지 않을 때까지 반복
+    while True:
+        sources = {_key(m[0]) for m in moves}
+        kept = []
+        for old, new in moves:
+            k_new = _key(new)
+            if k_new != _key(old) and k_new not in sources and os.path.lexists(new):
+                skipped.append([old, new, "같은 이름 파일 있음"])
+            else:
+                kept.append([old, new])
+        if len(kept) == len(moves): break
+        moves = kept
+
+    return {'moves': moves, 'steps': _order_steps(moves), 'skipped': skipped}
+
+
+def _order_steps(moves):
+    # 각 이동의 다음 이동 = 내 대상 이름을 지금 쓰고 있는 파일의 이동 (먼저 비워줘야 함)
+    by_source = {_key(old): i for i, (old, _new) in enumerate(moves)}
+    blocked_by = {}
+    is_blocker = set()
+    for i, (old, new) in enumerate(moves):
+        j = by_source.get(_key(new))
+        if j is not None and j != i:
+            blocked_by[i] = j
+            is_blocker.add(j)
+
+    steps = []
+    visited = set()
+
+    def run_chain(start):
+        # start 부터 막고 있는 이동을 따라가서 뒤에서부터 실행
+        chain = []
+        i = start
+        while i is not None and i not in visited:
+            visited.add(i)
+            chain.append(i)
+            i = blocked_by.get(i)
+        for i in reversed(chain):
+            steps.append([moves[i][0], moves[i][1], i])
+
+    # 1) 사슬: 아무도 막지 않는(다른 이동의 대상이 아닌) 이동부터
+    for i in range(len(moves)):
+        if i not in is_blocker:
+            run_chain(i)
+
+    # 2) 남은 건 순환: 하나를 임시 이름으로 빼고 나머지를 돌린 뒤 제자리로
+    for i in range(len(moves)):
+        if i in visited: continue
+        old, new = moves[i]
+        temp = os.path.join(os.path.dirname(old), f".{os.path.basename(old)}.{uuid.uuid4().hex[:8]}.renaming")
+        steps.append([old, temp, i])
+        visited.add(i)
+        j = blocked_by.get(i)
+        chain = []
+        while j is not None and j not in visited:
+            visited.add(j)
+            chain.append(j)
+            j = blocked_by.get(j)
+        for j in reversed(chain):
+            steps.append([moves[j][0], moves[j][1], j])
+        steps.append([temp, new, i])
+    return steps
+
+
+# ==========================================
+# [2] 기록(journal): 한 줄에 하나씩 추가 -> 중단돼도 어디까지 했는지 남음
+# ==========================================
+class RenameJournal:
+    def __init__(self, path, plan, label="", state=STATE_PENDING, done=None, dismissed=False):
+        self.path = path
+        self.plan = plan
+        self.label = label
+        self.state = state
+        self.done = done if done is not None else set()  # 지금 적용되어 있는 단계 번호
+        self.dismissed = dismissed  # 이어서 하기/되돌리기를 모두 거절함 -> 다시 묻지 않음
+        self._file = None
+        self._unsynced = 0
+
+    @classmethod
+    def create(cls, plan, label=""):
+        name = time.strftime("%Y%m%d-%H%M%S") + f"-{uuid.uuid4().hex[:6]}.jsonl"
+        journal = cls(os.path.join(get_journal_dir(), name), plan, label)
+        with open(journal.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({'type': 'plan', 'label': label, 'created': time.time(), 'plan': plan},
+                               ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        prune_journals()
+        return journal
+
+    @classmethod
+    def load(cls, path):
+        plan, label, state = None, "", STATE_PENDING
+        done = set()
+        dismissed = False
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break # 마지막 줄이 쓰다 만 상태일 수 있음
+                kind = record.get('type')
+                if kind == 'plan':
+                    plan = record['plan']
+                    label = record.get('label', "")
+                elif kind == 'done':
+                    done.add(record['step'])
+                elif kind == 'undone':
+                    done.discard(record['step'])
+                elif kind == 'state':
+                    state = record['state']
+                    dismissed = False
+                elif kind == 'dismissed':
+                    dismissed = True
+        if plan is None:
+            raise ValueError(f"잘못된 기록 파일: {path}")
+        return cls(path, plan, label, state, done, dismissed)
+
+    @property
+    def steps(self):
+        return self.plan['steps']
+
+    @property
+    def resumable(self):
+        return self.state in (STATE_PENDING, STATE_FAILED)
+
+    def _write(self, record, sync=False):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= FSYNC_EVERY:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def mark_done(self, step, sync=False):
+        self.done.add(step)
+        self._write({'type': 'done', 'step': step}, sync)
+
+    def mark_undone(self, step, sync=False):
+        self.done.discard(step)
+        self._write({'type': 'undone', 'step': step}, sync)
+
+    def dismiss(self):
+        # 중단된 작업을 더 이상 묻지 않음 (적용된 단계는 그대로, 되돌리기 목록에는 남음)
+        self.dismissed = True
+        self._write({'type': 'dismissed'}, sync=True)
+        self.close()
+
+    def set_state(self, state):
+        self.state = state
+        self._write({'type': 'state', 'state': state}, sync=True)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def renamed_moves(self):
+        # 모든 단계가 적용된 (기존, 새) 이름 목록
+        applied = {}
+        for n, (_src, _dst, move) in enumerate(self.steps):
+            applied[move] = applied.get(move, True) and n in self.done
+        return [tuple(self.plan['moves'][m]) for m, ok in applied.items() if ok]
+
+
+def find_incomplete_journals():
+    # 중단/실패한 기록 (최근 것부터)
+    result = []
+    folder = get_journal_dir()
+    for name in sorted(os.listdir(folder), reverse=True):
+        if not name.endswith(".jsonl"): continue
+        try:
+            journal = RenameJournal.load(os.path.join(folder, name))
+        except (OSError, ValueError, KeyError):
+            continue
+        if journal.resumable and not journal.dismissed and len(journal.done) < len(journal.steps):
+            result.append(journal)
+    return result
+
+
+def latest_journal(undoable=True):
+    # 되돌릴 수 있는 가장 최근 기록
+    folder = get_journal_dir()
+    for name in sorted(os.listdir(folder), reverse=True):
+        if not name.endswith(".jsonl"): continue
+        try:
+            journal = RenameJournal.load(os.path.join(folder, name))
+        except (OSError, ValueError, KeyError):
+            continue
+        if not undoable or journal.done:
+            return journal
+    return None
+
+
+def prune_journals():
+    # 오래된 완료 기록 정리 (중단된 기록은 남김)
+    folder = get_journal_dir()
+    names = sorted((n for n in os.listdir(folder) if n.endswith(".jsonl")), reverse=True)
+    for name in names[KEEP_JOURNALS:]:
+        path = os.path.join(folder, name)
+        try:
+            journal = RenameJournal.load(path)
+            if journal.state in (STATE_DONE, STATE_UNDONE) or journal.dismissed:
+                os.remove(path)
+        except (OSError, ValueError, KeyError):
+            pass
+
+
+# ==========================================
+# [3] 실행 / 되돌리기
+# ==========================================
+def _already_moved(src, dst):
+    # 이름을 바꾼 직후 기록 전에 멈췄던 경우 (원본은 없고 대상은 있음)
+    return not os.path.lexists(src) and os.path.lexists(dst)
+
+
+def execute_journal(journal, progress=None, cancel_event=None, stop_on_error=False):
+    """
+    기록의 남은 단계를 순서대로 실행 (처음 실행과 이어서 하기 모두)
+    - 실패한 단계는 report['failed'] 에 모으고 계속 (stop_on_error 면 그 자리에서 멈춤)
+    - 실패가 있으면 STATE_FAILED -> 나중에 이어서 하기(실패한 것만 재시도) 또는 되돌리기
+    - progress(완료, 전체) 는 호출하는 쪽에서 횟수를 조절
+    """
+    steps = journal.steps
+    total = len(steps)
+    failed = []
+    cancelled = False
+    # 다른 단계가 대상으로 다시 쓰는 원본 이름 (a -> b 다음 c -> a 같은 사슬/순환)
+    # 이런 단계는 다음 이름 변경 전에 기록을 디스크에 확정 -> 기록 없이 둘 다 적용된 상태가 생기지 않음
+    reused = {_key(dst) for _src, dst, _move in steps}
+    try:
+        for n, (src, dst, _move) in enumerate(steps):
+            if n in journal.done: continue
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            if _already_moved(src, dst):
+                journal.mark_done(n, sync=_key(src) in reused)
+                continue
+            # 계획 이후에 같은 이름 파일이 생겼으면 덮어쓰지 않음 (대소문자만 바뀌는 경우 제외)
+            if os.path.lexists(dst) and _key(src) != _key(dst):
+                error = "같은 이름 파일 있음"
+            else:
+                try:
+                    os.rename(src, dst)
+                    error = None
+                except OSError as e:
+                    error = str(e)
+            if error:
+                failed.append((src, dst, error))
+                if stop_on_error: break
+                continue
+            journal.mark_done(n, sync=_key(src) in reused)
+            if progress: progress(len(journal.done), total)
+
+        if cancelled:
+            status = STATE_PENDING
+        elif failed:
+            status = STATE_FAILED
+        else:
+            status = STATE_DONE
+        journal.set_state(status)
+    finally:
+        journal.close()
+    return {'status': status, 'total': total, 'done': len(journal.done), 'failed': failed,
+            'renamed': journal.renamed_moves(), 'journal': journal.path}
+
+
+def undo_journal(journal, progress=None, cancel_event=None):
+    """실행한 단계를 거꾸로 되돌림 (대상 -> 원본). 하나라도 실패하면 그 자리에서 멈춤"""
+    targets = sorted(journal.done, reverse=True)
+    before = journal.renamed_moves() # 되돌리기 전 이름 목록 (색인 등 갱신용)
+    # 되돌리면서 비운 이름을 앞 단계가 다시 쓰면 기록을 바로 확정 (execute_journal 과 같은 이유)
+    reused = {_key(src) for src, _dst, _move in journal.steps}
+    failed = []
+    status = STATE_UNDONE
+    count = 0
+    try:
+        for n in targets:
+            if cancel_event is not None and cancel_event.is_set():
+                status = STATE_PENDING
+                break
+            src, dst, _move = journal.steps[n]
+            if os.path.lexists(dst) or not os.path.lexists(src):
+                if os.path.lexists(src) and _key(src) != _key(dst):
+                    failed.append((dst, src, "원래 이름 파일이 이미 있음"))
+                    break
+                try:
+                    os.rename(dst, src)
+                except OSError as e:
+                    failed.append((dst, src, str(e)))
+                    break
+            journal.mark_undone(n, sync=_key(dst) in reused)
+            count += 1
+            if progress: progress(count, len(targets))
+        if failed: status = STATE_FAILED
+        journal.set_state(status)
+    finally:
+        journal.close()
+    after = set(journal.renamed_moves())
+    # 원래 이름으로 돌아간 (새 이름, 기존 이름) 목록
+    renamed = [(new, old) for old, new in before if (old, new) not in after]
+    return {'status': status, 'total': len(targets), 'done': count, 'failed': failed,
+            'renamed': renamed, 'journal': journal.path}
@@ -0,0 +1,190 @@
+import os
+import re
+import fnmatch
+from modules.app_paths import get_config_path
+
+# 기본 무시 목록 (규칙 파일이 없을 때 이 내용으로 만들어 줌)
+DEFAULT_IGNORE_PATTERNS = [
+    # 파이썬/개발 관련
+    'venv', '.venv', 'env', '__pycache__',
+    '*.pyc', '*.pyd', '*.pyo',
+    '.git', '.vscode', '.idea',
+    'node_modules', 'dist', 'build',
+
+    # Visual Studio 관련
+    'obj', 'bin', '.vs',
+
+    # 시스템 파일
+    'Desktop.ini', 'Thumbs.db',
+    '$RECYCLE.BIN', 'System Volume Information'
+]
+
+USER_RULES_FILENAME = "folder_ignore.txt"   # 설정 폴더의 사용자 규칙
+LOCAL_RULES_FILENAME = ".toolpilotignore"   # 스캔 폴더 최상위에 두는 규칙
+
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+def get_user_rules_path(create=True):
+    # 사용자가 직접 고칠 수 있는 규칙 파일. 없으면 기본 목록으로 생성 (규칙 편집을 열 때만, 스캔은 create=False)
+    path = get_config_path(USER_RULES_FILENAME)
+    if create and not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# ToolPilot 파일 관리자 무시 규칙 (.gitignore 형식)\n")
+            f.write("# 예) *.log / build/ (폴더만) / docs/*.tmp (경로 기준) / !keep.log (예외)\n")
+            f.write("\n".join(DEFAULT_IGNORE_PATTERNS) + "\n")
+    return path
+
+
+def read_user_rules():
+    # 파일을 아직 만들지 않았으면 기본 목록 (스캔할 때마다 설정 폴더에 쓰지 않음)
+    path = get_user_rules_path(create=False)
+    if not os.path.exists(path):
+        return list(DEFAULT_IGNORE_PATTERNS)
+    return read_rules_file(path)
+
+
+def _translate_path(pattern):
+    """
+    경로 규칙용 glob -> 정규식 (.gitignore 와 같게)
+    - '*', '?' 는 '/' 를 넘지 않음 (fnmatch 는 넘어감)
+    - '**/' 는 0단계 이상의 폴더, 나머지 '**' 는 아무 문자열
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[' and pattern.find(']', i + 2) != -1:
+            j = pattern.find(']', i + 2)
+            body = pattern[i + 1:j].replace('\\', '\\\\')
+            if body.startswith('!'): body = '^' + body[1:]
+            parts.append(f'[{body}]')
+            i = j + 1
+            continue
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return re.compile('(?s:' + ''.join(parts) + r')\Z')
+
+
+def read_rules_file(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+
+class IgnoreMatcher:
+    """
+    무시 규칙을 한 번만 컴파일해서 빠르게 검사
+    - 단순 이름(와일드카드 없음)은 set 조회
+    - 와일드카드 이름은 정규식 하나로 합쳐서 한 번에 검사
+    - '/' 가 들어간 규칙은 스캔 루트 기준 상대 경로로 검사, 끝의 '/' 는 폴더 전용, '!' 는 예외
+    """
+    def __init__(self, lines):
+        self.exact = set()
+        self.exact_dirs = set()
+        name_globs = []
+        dir_globs = []
+        # 순서가 중요한 규칙 (예외 '!' 가 하나라도 있으면 전부 여기서 순서대로 평가)
+        self.ordered = []
+        self.has_negation = False
+        self.needs_path = False
+
+        for raw in lines:
+            line = raw.strip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+                self.has_negation = True
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            # 앞이나 중간에 '/' 가 있으면 루트 기준 경로 규칙
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+
+            # Windows 는 대소문자 무시 (normcase 가 '/' 를 '\' 로 바꾸므로 되돌림)
+            pattern = os.path.normcase(line).replace(os.sep, '/')
+            regex = _translate_path(pattern) if anchored else re.compile(fnmatch.translate(pattern))
+            self.ordered.append((regex, negate, dir_only, anchored))
+            if anchored:
+                self.needs_path = True
+                continue
+            if negate:
+                continue
+
+            is_glob = _GLOB_CHARS.search(pattern) is not None
+            if dir_only:
+                if is_glob: dir_globs.append(pattern)
+                else: self.exact_dirs.add(pattern)
+            else:
+                if is_glob: name_globs.append(pattern)
+                else: self.exact.add(pattern)
+
+        self.name_regex = self._combine(name_globs)
+        self.dir_regex = self._combine(dir_globs)
+        self.anchored = [(r, d) for r, n, d, a in self.ordered if a and not n]
+
+    @staticmethod
+    def _combine(globs):
+        if not globs:
+            return None
+        return re.compile('|'.join(f'(?:{fnmatch.translate(g)})' for g in globs))
+
+    @classmethod
+    def from_sources(cls, root_path=None, extra_lines=None):
+        # 사용자 규칙 파일 + 스캔 루트의 .toolpilotignore 를 합쳐서 생성
+        lines = read_user_rules()
+        if root_path:
+            lines += read_rules_file(os.path.join(root_path, LOCAL_RULES_FILENAME))
+        if extra_lines:
+            lines += list(extra_lines)
+        return cls(lines)
+
+    def is_ignored(self, name, rel_path=None, is_dir=False):
+        name = os.path.normcase(name)
+        if rel_path is not None:
+            rel_path = os.path.normcase(rel_path).replace(os.sep, '/')
+
+        if self.has_negation:
+            # .gitignore 처럼 마지막으로 일치한 규칙이 이김
+            ignored = False
+            for regex, negate, dir_only, anchored in self.ordered:
+                if dir_only and not is_dir: continue
+                target = rel_path if anchored else name
+                if target is not None and regex.match(target):
+                    ignored = not negate
+            return ignored
+
+        # 빠른 경로: set 조회 -> 합친 정규식 -> 경로 규칙
+        if name in self.exact:
+            return True
+        if is_dir and name in self.exact_dirs:
+            return True
+        if self.name_regex and self.name_regex.match(name):
+            return True
+        if is_dir and self.dir_regex and self.dir_regex.match(name):
+            return True
+        if rel_path is not None:
+            for regex, dir_only in self.anchored:
+                if dir_only and not is_dir: continue
+                if regex.match(rel_path):
+                    return True
+        return False
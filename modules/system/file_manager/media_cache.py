@@ -0,0 +1,128 @@
+import time
+import sqlite3
+import threading
+from modules.app_paths import get_config_path
+
+class MediaMetaCache:
+    """
+    영상 재생 시간 디스크 캐시 (SQLite)
+    - 키: (경로, 크기, 수정 시간) -> 파일이 바뀌면 자동으로 무효
+    - max_entries 를 넘으면 오래 안 쓴 항목부터 삭제
+    - 스캔 스레드 여러 개가 동시에 쓰므로 연결 하나를 lock으로 보호
+    """
+    COMMIT_EVERY = 200     # 이 횟수만큼 쓰면 커밋
+    EVICT_CHECK_EVERY = 1000
+    TOUCH_BATCH = 500      # 적중한 항목의 last_used 는 모아서 한 번에 갱신
+
+    def __init__(self, db_path=None, max_entries=200_000):
+        self.db_path = db_path or get_config_path("media_cache.sqlite3")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._since_evict = 0
+        self._touched = set()  # 적중했지만 last_used 를 아직 안 쓴 경로
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS media_meta (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                duration INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_media_last_used ON media_meta(last_used)")
+        self.conn.commit()
+
+    def get(self, path, size, mtime):
+        # 캐시에 있고 크기/수정 시간이 같으면 저장된 초(sec) 반환, 없으면 None
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT size, mtime, duration FROM media_meta WHERE path = ?", (path,)
+            ).fetchone()
+            if row and row[0] == size and row[1] == mtime:
+                self.hits += 1
+                # 적중할 때마다 쓰지 않고 모아둠 (캐시가 잘 맞을수록 읽기만 하게)
+                self._touched.add(path)
+                if len(self._touched) >= self.TOUCH_BATCH:
+                    self._write_touches()
+                return row[2]
+            self.misses += 1
+            return None
+
+    def put(self, path, size, mtime, duration):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO media_meta (path, size, mtime, duration, last_used) VALUES (?, ?, ?, ?, ?)",
+                (path, size, mtime, duration, time.time())
+            )
+            self._mark_dirty()
+            self._since_evict += 1
+            if self._since_evict >= self.EVICT_CHECK_EVERY:
+                self._since_evict = 0
+                self._evict()
+
+    def _mark_dirty(self):
+        self._dirty += 1
+        if self._dirty >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self._dirty = 0
+
+    def _write_touches(self):
+        if not self._touched: return
+        now = time.time()
+        self.conn.executemany("UPDATE media_meta SET last_used = ? WHERE path = ?",
+                              [(now, path) for path in self._touched])
+        self._touched.clear()
+        self._mark_dirty()
+
+    def _evict(self):
+        # 오래된 순서가 맞도록 모아둔 last_used 부터 반영
+        self._write_touches()
+        count = self.conn.execute("SELECT COUNT(*) FROM media_meta").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self.conn.execute(
+                "DELETE FROM media_meta WHERE path IN (SELECT path FROM media_meta ORDER BY last_used LIMIT ?)",
+                (overflow,)
+            )
+
+    def flush(self):
+        with self._lock:
+            self._evict()
+            self.conn.commit()
+            self._dirty = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': hit_rate}
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_media_cache():
+    # 앱 전체에서 하나만 사용 (처음 필요할 때 열기)
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = MediaMetaCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Media cache disabled: {e}")
+                _cache = False
+        return _cache or None
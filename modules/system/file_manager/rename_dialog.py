@@ -1,20 +1,75 @@
 import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QLineEdit, 
-                             QProgressBar, QFormLayout, QDialogButtonBox, QApplication, QWidget)
-from PyQt6.QtCore import Qt
+                             QProgressBar, QFormLayout, QDialogButtonBox, QWidget, QPushButton,
+                             QComboBox, QCheckBox, QSpinBox, QTreeWidget, QTreeWidgetItem, QHeaderView)
+from PyQt6.QtCore import Qt, QTimer
 from modules.ui.title_bar import CustomTitleBar
+from modules.ui.custom_msg import CustomMessageBox
+from modules.ui.thread_keeper import retire_thread
+from .batch_rename import find_incomplete_journals, STATE_DONE, STATE_UNDONE
+from .worker import BatchRenameWorker, RenamePreviewWorker
+from .rename_rules import RULE_REPLACE, RULE_REGEX, RULE_TEMPLATE, CASE_LOWER, CASE_UPPER, CASE_TITLE
+
+
+# [NEW] 중단된 일괄 변경이 있으면 이어서 할지 / 되돌릴지 묻기
+# 반환: (기록, 되돌리기 여부) 또는 None (그대로 둠)
+def ask_incomplete_rename(parent):
+    journals = find_incomplete_journals()
+    if not journals: return None
+    journal = journals[0]
+    remaining = len(journal.steps) - len(journal.done)
+    text = (f"완료되지 않은 이름 변경 작업이 있습니다.\n({journal.label}, 남은 {remaining:,}개)\n\n"
+            "이어서 진행하시겠습니까?")
+    if CustomMessageBox("중단된 작업", text, is_question=True, parent=parent).exec() == 1:
+        return journal, False
+    text = f"이미 변경된 {len(journal.done):,}개를 원래 이름으로 되돌리시겠습니까?"
+    if CustomMessageBox("중단된 작업", text, is_question=True, parent=parent).exec() == 1:
+        return journal, True
+    # 둘 다 거절하면 이 작업은 다시 묻지 않음 (되돌리기 버튼으로는 여전히 가능)
+    journal.dismiss()
+    return None
+
+
+def describe_rename_report(report, undo=False):
+    verb = "되돌림" if undo else "변경"
+    lines = [f"{report['done']:,}개 {verb} 완료"]
+    if report.get('skipped'):
+        lines.append(f"건너뜀 {len(report['skipped']):,}개 (이름 충돌/원본 없음 등)")
+    if report.get('failed'):
+        lines.append(f"실패 {len(report['failed']):,}개 - 다시 시도하거나 되돌릴 수 있음")
+    if report['status'] not in (STATE_DONE, STATE_UNDONE) and not report.get('failed'):
+        lines.append("중단됨 - 다음에 이어서 할 수 있음")
+    for old, new, reason in report.get('skipped', [])[:20]:
+        print(f"Rename skipped: {old} -> {os.path.basename(new)} ({reason})")
+    for src, dst, err in report.get('failed', [])[:20]:
+        print(f"Rename failed: {src} -> {dst} ({err})")
+    return ", ".join(lines)
 
 class RenameDialog(QDialog):
+    WIDTH, HEIGHT = 620, 640
+    PREVIEW_LIMIT = 200   # 미리보기에 보여줄 최대 개수
+    PREVIEW_DELAY = 200   # 입력이 멈춘 뒤 미리보기 시작까지 (ms)
+
     # ▼▼▼ 이 부분(__init__)이 반드시 있어야 에러가 안 납니다! ▼▼▼
     def __init__(self, folder_path, parent=None, target_files=None):
         super().__init__(parent)
         self.folder_path = folder_path
         self.target_files = target_files
+        self.worker = None
+        self.last_journal = None
+        # [NEW] 미리보기 상태 (폴더는 한 번만 훑고 재사용)
+        self.files = sorted(target_files, key=lambda p: p.lower()) if target_files else None
+        self.preview_worker = None
+        self.preview_pairs = None   # 지금 규칙으로 계산이 끝난 전체 변경 목록
+        self.run_when_ready = False
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.timeout.connect(self.start_preview)
         
         # 1. 프레임리스 설정
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setFixedSize(450, 300)
+        self.setFixedSize(self.WIDTH, self.HEIGHT)
         
         # 2. 부모 중앙 배치
         if parent:
@@ -31,7 +86,7 @@ class RenameDialog(QDialog):
 
     def init_ui(self):
         container = QWidget(self)
-        container.setGeometry(0, 0, 450, 300)
+        container.setGeometry(0, 0, self.WIDTH, self.HEIGHT)
         
         # 스타일시트 적용 (밑줄 잘 보이게 수정된 버전)
         container.setStyleSheet("""
@@ -93,14 +148,61 @@ class RenameDialog(QDialog):
 
         form_layout = QFormLayout()
         form_layout.setSpacing(15)
+
+        # [NEW] 규칙 종류: 찾아 바꾸기 / 정규식 / 템플릿
+        self.combo_mode = QComboBox()
+        self.combo_mode.addItem("찾아 바꾸기", RULE_REPLACE)
+        self.combo_mode.addItem("정규식 (캡처 그룹 \\1 사용 가능)", RULE_REGEX)
+        self.combo_mode.addItem("템플릿 ({name}, {n:03}, {date}, {duration})", RULE_TEMPLATE)
         
         self.input_find = QLineEdit()
         self.input_replace = QLineEdit()
+
+        # 템플릿 전용: 순번 시작 값
+        self.spin_start = QSpinBox()
+        self.spin_start.setRange(0, 999999)
+        self.spin_start.setValue(1)
+
+        self.combo_case = QComboBox()
+        self.combo_case.addItem("그대로", None)
+        self.combo_case.addItem("소문자", CASE_LOWER)
+        self.combo_case.addItem("대문자", CASE_UPPER)
+        self.combo_case.addItem("단어 첫 글자 대문자", CASE_TITLE)
+
+        self.chk_ignore_case = QCheckBox("대소문자 무시")
+        self.chk_ignore_case.setStyleSheet("color: #ddd; border: none;")
+
+        for combo in [self.combo_mode, self.combo_case, self.spin_start]:
+            combo.setStyleSheet("background-color: #3d3d3d; color: white; border: 1px solid #555; border-radius: 3px; padding: 3px;")
         
+        form_layout.addRow("규칙:", self.combo_mode)
         form_layout.addRow("찾을 문자:", self.input_find)
         form_layout.addRow("바꿀 문자:", self.input_replace)
+        form_layout.addRow("순번 시작:", self.spin_start)
+        form_layout.addRow("대/소문자:", self.combo_case)
+        form_layout.addRow("", self.chk_ignore_case)
+        self.form_layout = form_layout
         layout.addLayout(form_layout)
 
+        # [NEW] 미리보기 (앞쪽 일부만, 계산은 백그라운드)
+        self.preview = QTreeWidget()
+        self.preview.setHeaderLabels(["현재 이름", "새 이름"])
+        self.preview.setRootIsDecorated(False)
+        self.preview.setUniformRowHeights(True)
+        self.preview.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.preview.setStyleSheet("""
+            QTreeWidget { background-color: #1e1e1e; color: #ddd; border: 1px solid #444; border-radius: 3px; font-weight: normal; }
+            QHeaderView::section { background-color: #333; color: white; border: none; }
+        """)
+        layout.addWidget(self.preview, 1)
+
+        for widget in [self.input_find, self.input_replace]:
+            widget.textChanged.connect(self.schedule_preview)
+        self.combo_mode.currentIndexChanged.connect(self.on_mode_changed)
+        self.combo_case.currentIndexChanged.connect(self.schedule_preview)
+        self.spin_start.valueChanged.connect(self.schedule_preview)
+        self.chk_ignore_case.toggled.connect(self.schedule_preview)
+
         self.status_label = QLabel("")
         self.status_label.setStyleSheet("color: #00fa9a; font-size: 12px; margin-top: 10px; font-weight: normal;")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -120,60 +222,184 @@ class RenameDialog(QDialog):
         self.buttons.button(QDialogButtonBox.StandardButton.Cancel).setText("취소")
         self.buttons.accepted.connect(self.run_rename)
         self.buttons.rejected.connect(self.reject)
+
+        # [NEW] 방금 한 변경 되돌리기 (완료 후에만 보임)
+        self.btn_undo = QPushButton("↩️ 되돌리기")
+        self.btn_undo.setStyleSheet("background-color: #555;")
+        self.btn_undo.clicked.connect(self.undo_rename)
+        self.btn_undo.hide()
+        self.buttons.addButton(self.btn_undo, QDialogButtonBox.ButtonRole.ActionRole)
         layout.addWidget(self.buttons)
         
         layout_total.addWidget(content_widget)
         
+        self.on_mode_changed()
         self.input_find.setFocus()
 
+    # ==========================================
+    # [NEW] 규칙 입력 + 미리보기
+    # ==========================================
+    def settings(self):
+        mode = self.combo_mode.currentData()
+        settings = {'mode': mode, 'case': self.combo_case.currentData(),
+                    'ignore_case': self.chk_ignore_case.isChecked()}
+        if mode == RULE_TEMPLATE:
+            settings['template'] = self.input_find.text()
+            settings['start'] = self.spin_start.value()
+        else:
+            settings['find'] = self.input_find.text()
+            settings['replace'] = self.input_replace.text()
+        return settings
+
+    def on_mode_changed(self):
+        template = self.combo_mode.currentData() == RULE_TEMPLATE
+        self.form_layout.labelForField(self.input_find).setText("템플릿:" if template else "찾을 문자:")
+        self.input_find.setPlaceholderText("예) {date:%Y-%m-%d}_{n:03}{ext}" if template else "")
+        self.input_replace.setEnabled(not template)
+        self.spin_start.setEnabled(template)
+        self.chk_ignore_case.setEnabled(not template)
+        self.schedule_preview()
+
+    def schedule_preview(self):
+        # 입력할 때마다 계산하지 않고 잠깐 멈추면 시작
+        self.preview_pairs = None
+        self.preview_timer.start(self.PREVIEW_DELAY)
+
+    def start_preview(self):
+        if self.preview_worker and self.preview_worker.isRunning():
+            self.preview_worker.cancel()
+        # 취소한 일꾼은 끝날 때까지 붙잡아 둠 (결과는 sender 검사로 버려짐)
+        retire_thread(self.preview_worker)
+        self.preview_worker = None
+        if not self.input_find.text() and self.combo_case.currentData() is None:
+            self.preview.clear()
+            self.status_label.setText("")
+            return
+
+        self.preview_worker = RenamePreviewWorker(self.settings(), files=self.files,
+                                                  folder_path=self.folder_path, limit=self.PREVIEW_LIMIT)
+        self.preview_worker.files_ready.connect(self.on_files_ready)
+        self.preview_worker.preview_ready.connect(self.on_preview_ready)
+        self.preview_worker.progress.connect(self.on_preview_progress)
+        self.preview_worker.finished_preview.connect(self.on_preview_finished)
+        self.preview_worker.failed.connect(self.on_preview_failed)
+        self.preview_worker.start()
+        self.status_label.setText("미리보기 계산 중...")
+
+    def on_files_ready(self, files):
+        self.files = files
+
+    def on_preview_ready(self, pairs):
+        if self.sender() is not self.preview_worker: return
+        items = []
+        for old, new in pairs:
+            item = QTreeWidgetItem([os.path.basename(old), os.path.basename(new)])
+            item.setToolTip(0, old)
+            items.append(item)
+        self.preview.clear()
+        self.preview.addTopLevelItems(items)
+
+    def on_preview_progress(self, done, total):
+        if self.sender() is not self.preview_worker: return
+        self.status_label.setText(f"미리보기 계산 중... ({done:,}/{total:,})")
+
+    def on_preview_finished(self, pairs, total):
+        if self.sender() is not self.preview_worker: return
+        self.preview_pairs = pairs
+        shown = min(len(pairs), self.PREVIEW_LIMIT)
+        more = f" (앞 {shown:,}개 표시)" if len(pairs) > shown else ""
+        self.status_label.setText(f"전체 {total:,}개 중 {len(pairs):,}개 변경 예정{more}")
+        if self.run_when_ready:
+            self.run_when_ready = False
+            self.run_rename()
+
+    def on_preview_failed(self, message):
+        if self.sender() is not self.preview_worker: return
+        self.preview.clear()
+        self.run_when_ready = False
+        self.status_label.setText(f"⚠️ {message}")
+
     def run_rename(self):
-        target = self.input_find.text()
-        replace = self.input_replace.text()
-        
-        if not target:
+        if not self.input_find.text() and self.combo_case.currentData() is None:
             self.status_label.setText("⚠️ 찾을 문자를 입력해주세요!")
             return
 
-        files_to_work = []
-        if self.target_files:
-            for full_path in self.target_files:
-                filename = os.path.basename(full_path)
-                root = os.path.dirname(full_path)
-                if target in filename:
-                    files_to_work.append((root, filename))
-        else:
-            for root, dirs, files in os.walk(self.folder_path):
-                for filename in files:
-                    if target in filename:
-                        files_to_work.append((root, filename))
+        # [NEW] 중단된 작업 먼저 처리
+        pending = ask_incomplete_rename(self)
+        if pending:
+            journal, undo = pending
+            self.start_worker(BatchRenameWorker(journal=journal, undo=undo), undo)
+            return
+
+        # 미리보기 계산이 끝나야 실행 (미리보기와 실제 변경이 항상 같음)
+        if self.preview_pairs is None:
+            self.run_when_ready = True
+            if not self.preview_timer.isActive() and not (self.preview_worker and self.preview_worker.isRunning()):
+                self.start_preview()
+            return
 
-        total_count = len(files_to_work)
-        if total_count == 0:
+        if not self.preview_pairs:
             self.status_label.setText("⚠️ 조건에 맞는 파일이 없습니다.")
             return
 
-        self.input_find.setEnabled(False)
-        self.input_replace.setEnabled(False)
-        self.buttons.setEnabled(False)
-        self.progress_bar.setMaximum(total_count)
+        # [수정] 파일마다 바로 바꾸지 않고 계획 -> 기록 -> 백그라운드 실행 (충돌/순환 확인, 되돌리기 가능)
+        pairs = self.preview_pairs
+        settings = self.settings()
+        rule = settings.get('template') or f"'{settings.get('find', '')}' -> '{settings.get('replace', '')}'"
+        label = f"{rule} ({len(pairs)}개)"
+        self.start_worker(BatchRenameWorker(pairs, label=label), False)
+
+    def start_worker(self, worker, undo):
+        for widget in [self.input_find, self.input_replace, self.combo_mode, self.combo_case,
+                       self.spin_start, self.chk_ignore_case]:
+            widget.setEnabled(False)
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
+        self.btn_undo.hide()
+        self.progress_bar.setValue(0)
         self.progress_bar.show()
+        self.status_label.setText("되돌리는 중..." if undo else "변경 중...")
+
+        self.worker = worker
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished_report.connect(lambda report: self.on_finished(report, undo))
+        self.worker.start()
+
+    def on_progress(self, done, total):
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"진행 중 ({done:,}/{total:,})")
+
+    def on_finished(self, report, undo):
+        self.last_journal = self.worker.journal
+        self.status_label.setText(("↩️ " if undo else "🎉 ") + describe_rename_report(report, undo))
+        # 되돌릴 변경이 남아 있으면 되돌리기 버튼
+        self.btn_undo.setVisible(bool(self.last_journal and self.last_journal.done))
+        ok = self.buttons.button(QDialogButtonBox.StandardButton.Ok)
+        ok.setText("닫기")
+        ok.setEnabled(True)
+        try: self.buttons.accepted.disconnect()
+        except TypeError: pass
+        self.buttons.accepted.connect(self.accept)
+
+    def undo_rename(self):
+        if not self.last_journal or (self.worker and self.worker.isRunning()): return
+        self.start_worker(BatchRenameWorker(journal=self.last_journal, undo=True), True)
+
+    def reject(self):
+        # 진행 중이면 멈추기만 함 (기록이 남으므로 다음에 이어서 가능)
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            return
+        # 변경이 일어났으면 목록 새로고침이 필요하므로 accept 로 닫음
+        if self.last_journal is not None:
+            self.accept()
+            return
+        super().reject()
 
-        success_count = 0
-        for i, (root, filename) in enumerate(files_to_work):
-            old_path = os.path.join(root, filename)
-            new_filename = filename.replace(target, replace)
-            new_path = os.path.join(root, new_filename)
-            try:
-                os.rename(old_path, new_path)
-                success_count += 1
-                self.status_label.setText(f"[{new_filename}] 완료 ({i+1}/{total_count})")
-                self.progress_bar.setValue(i + 1)
-                QApplication.processEvents()
-            except Exception as e:
-                print(f"Error: {e}")
-
-        self.status_label.setText(f"🎉 총 {success_count}개 변경 완료!")
-        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("닫기")
-        self.buttons.setEnabled(True)
-        self.buttons.accepted.disconnect()
-        self.buttons.accepted.connect(self.accept)
\ No newline at end of file
+    def done(self, result):
+        # 닫힐 때 미리보기 계산 중이면 정리
+        self.preview_timer.stop()
+        if self.preview_worker and self.preview_worker.isRunning():
+            self.preview_worker.cancel()
+            self.preview_worker.wait(2000)
+        super().done(result)
@@ -0,0 +1,247 @@
+import os
+import re
+import time
+
+# 이름 변경 규칙 종류
+RULE_REPLACE = "replace"    # 찾아 바꾸기 (일반 문자열)
+RULE_REGEX = "regex"        # 정규식 (캡처 그룹 \1, \g<name> 사용 가능)
+RULE_CASE = "case"          # 대/소문자
+RULE_TEMPLATE = "template"  # 템플릿 ({name}, {ext}, {n:03}, {date:%Y%m%d}, {duration})
+
+CASE_LOWER = "lower"
+CASE_UPPER = "upper"
+CASE_TITLE = "title"
+
+IMAGE_EXTS = {'.jpg', '.jpeg', '.tif', '.tiff', '.heic', '.png', '.webp'}
+
+_TOKEN = re.compile(r'\{(\w+)(?::([^}]*))?\}')
+
+
+class RuleError(ValueError):
+    pass
+
+
+def split_name(name):
+    stem, ext = os.path.splitext(name)
+    return stem, ext
+
+
+# ==========================================
+# [1] 메타데이터 (필요한 규칙이 있을 때만 읽음)
+# ==========================================
+def read_photo_date(path):
+    # EXIF 촬영 일시 -> 없으면 파일 수정 시간 (time.struct_time)
+    if os.path.splitext(path)[1].lower() in IMAGE_EXTS:
+        try:
+            from PIL import Image
+            with Image.open(path) as img:
+                exif = img.getexif()
+                # 36867: DateTimeOriginal (Exif IFD), 306: DateTime
+                value = exif.get_ifd(0x8769).get(36867) or exif.get(306)
+            if value:
+                return time.strptime(str(value).strip()[:19], "%Y:%m:%d %H:%M:%S")
+        except Exception:
+            pass
+    try:
+        return time.localtime(os.path.getmtime(path))
+    except OSError:
+        return None
+
+
+def read_duration(path):
+    # 파일 관리자 스캔 때 저장된 재생 시간 캐시 사용 (없으면 그때 측정)
+    from .utils import get_video_duration
+    _text, seconds = get_video_duration(path)
+    return seconds if seconds and seconds > 0 else None
+
+
+def format_duration_token(seconds, fmt):
+    h, rest = divmod(int(seconds), 3600)
+    m, s = divmod(rest, 60)
+    if fmt == "s":
+        return str(int(seconds))
+    if fmt == "m":
+        return str(int(seconds) // 60)
+    # 파일 이름에 ':' 는 쓸 수 없어서 '-' 로 구분
+    return f"{h}-{m:02d}-{s:02d}" if h else f"{m:02d}-{s:02d}"
+
+
+# ==========================================
+# [2] 규칙: 만들 때 한 번만 컴파일
+# ==========================================
+class ReplaceRule:
+    def __init__(self, find, replace="", ignore_case=False):
+        if not find:
+            raise RuleError("찾을 문자를 입력해주세요.")
+        self.find = find
+        self.replace = replace
+        self.pattern = re.compile(re.escape(find), re.IGNORECASE) if ignore_case else None
+
+    def apply(self, name, ctx):
+        if self.pattern is not None:
+            return self.pattern.sub(lambda _m: self.replace, name)
+        return name.replace(self.find, self.replace)
+
+
+class RegexRule:
+    def __init__(self, pattern, replace="", ignore_case=False, stem_only=True):
+        try:
+            self.pattern = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        except re.error as e:
+            raise RuleError(f"정규식 오류: {e}")
+        self.replace = replace
+        self.stem_only = stem_only
+        # 바꿀 문자에서 없는 그룹(\3 등)을 참조하면 미리 오류
+        for ref in re.findall(r'\\(\d+)|\\g<(\d+)>', replace):
+            if int(ref[0] or ref[1]) > self.pattern.groups:
+                raise RuleError(f"없는 그룹 참조: {ref[0] or ref[1]}")
+
+    def apply(self, name, ctx):
+        try:
+            if not self.stem_only:
+                return self.pattern.sub(self.replace, name)
+            stem, ext = split_name(name)
+            return self.pattern.sub(self.replace, stem) + ext
+        except (re.error, IndexError) as e:
+            raise RuleError(f"바꿀 문자 오류: {e}")
+
+
+class CaseRule:
+    def __init__(self, mode, include_ext=False):
+        if mode not in (CASE_LOWER, CASE_UPPER, CASE_TITLE):
+            raise RuleError(f"알 수 없는 대/소문자 규칙: {mode}")
+        self.mode = mode
+        self.include_ext = include_ext
+
+    def _convert(self, text):
+        if self.mode == CASE_LOWER: return text.lower()
+        if self.mode == CASE_UPPER: return text.upper()
+        return text.title()
+
+    def apply(self, name, ctx):
+        if self.include_ext:
+            return self._convert(name)
+        stem, ext = split_name(name)
+        return self._convert(stem) + ext
+
+
+class TemplateRule:
+    """
+    새 이름을 템플릿으로 만듦 (파싱은 한 번만)
+    {name} 현재 이름(확장자 제외), {ext} 확장자, {n} 순번 ({n:03} 자리수 맞춤),
+    {date} 촬영/수정 일시 ({date:%Y-%m-%d} 형식 지정), {duration} 재생 시간 ({duration:s} 초, {duration:m} 분)
+    """
+    TOKENS = {'name', 'ext', 'n', 'date', 'duration'}
+
+    def __init__(self, template, start=1, step=1):
+        if not template:
+            raise RuleError("템플릿을 입력해주세요.")
+        self.parts = []  # 문자열 또는 (토큰, 형식)
+        pos = 0
+        for m in _TOKEN.finditer(template):
+            if m.start() > pos:
+                self.parts.append(template[pos:m.start()])
+            token, fmt = m.group(1), m.group(2)
+            if token not in self.TOKENS:
+                raise RuleError(f"알 수 없는 항목: {{{token}}}")
+            if token == 'n' and fmt:
+                if not fmt.isdigit():
+                    raise RuleError("순번 형식은 {n:03} 처럼 자리수만 쓸 수 있습니다.")
+            self.parts.append((token, fmt))
+            pos = m.end()
+        if pos < len(template):
+            self.parts.append(template[pos:])
+        used = {p[0] for p in self.parts if isinstance(p, tuple)}
+        self.uses_date = 'date' in used
+        self.uses_duration = 'duration' in used
+        self.start = start
+        self.step = step
+
+    def apply(self, name, ctx):
+        stem, ext = split_name(name)
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            token, fmt = part
+            if token == 'name':
+                out.append(stem)
+            elif token == 'ext':
+                out.append(ext)
+            elif token == 'n':
+                n = self.start + ctx['index'] * self.step
+                out.append(str(n).zfill(int(fmt)) if fmt else str(n))
+            elif token == 'date':
+                value = ctx['meta'].date(ctx['path'])
+                out.append(time.strftime(fmt or "%Y%m%d", value) if value else "")
+            elif token == 'duration':
+                value = ctx['meta'].duration(ctx['path'])
+                out.append(format_duration_token(value, fmt) if value else "")
+        return "".join(out)
+
+
+# ==========================================
+# [3] 규칙 묶음: 순서대로 적용
+# ==========================================
+class MetaReader:
+    # 같은 실행 안에서는 파일당 한 번만 읽음
+    def __init__(self):
+        self._dates = {}
+        self._durations = {}
+
+    def date(self, path):
+        if path not in self._dates:
+            self._dates[path] = read_photo_date(path)
+        return self._dates[path]
+
+    def duration(self, path):
+        if path not in self._durations:
+            self._durations[path] = read_duration(path)
+        return self._durations[path]
+
+
+class RulePipeline:
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.meta = MetaReader()
+        # 메타데이터를 읽는 규칙이 있으면 파일마다 디스크 접근이 생김 (미리보기 안내용)
+        self.reads_meta = any(getattr(r, 'uses_date', False) or getattr(r, 'uses_duration', False)
+                              for r in self.rules)
+
+    def new_name(self, path, index=0):
+        name = os.path.basename(path)
+        ctx = {'path': path, 'index': index, 'meta': self.meta}
+        for rule in self.rules:
+            name = rule.apply(name, ctx)
+        return name
+
+    def iter_changes(self, paths):
+        # 이름이 바뀌는 (기존 경로, 새 경로)만. 순번은 정렬된 목록 기준
+        for i, path in enumerate(paths):
+            new_name = self.new_name(path, i)
+            if new_name != os.path.basename(path):
+                yield path, os.path.join(os.path.dirname(path), new_name)
+
+
+def build_pipeline(settings):
+    """
+    설정 dict -> RulePipeline (잘못된 정규식 등은 RuleError)
+    settings: {'mode', 'find', 'replace', 'ignore_case', 'template', 'start', 'step', 'case'}
+    """
+    rules = []
+    mode = settings.get('mode', RULE_REPLACE)
+    if mode == RULE_REPLACE:
+        rules.append(ReplaceRule(settings.get('find', ""), settings.get('replace', ""),
+                                 settings.get('ignore_case', False)))
+    elif mode == RULE_REGEX:
+        if not settings.get('find'):
+            raise RuleError("정규식을 입력해주세요.")
+        rules.append(RegexRule(settings['find'], settings.get('replace', ""), settings.get('ignore_case', False)))
+    elif mode == RULE_TEMPLATE:
+        rules.append(TemplateRule(settings.get('template', ""), settings.get('start', 1), settings.get('step', 1)))
+    if settings.get('case'):
+        rules.append(CaseRule(settings['case']))
+    if not rules:
+        raise RuleError("적용할 규칙이 없습니다.")
+    return RulePipeline(rules)
@@ -1,7 +1,6 @@
 import os
 import shutil
 import subprocess
-from PyQt6.QtCore import Qt
 # 절대 경로로 UI 모듈 불러오기
 from modules.ui.custom_msg import CustomMessageBox
 
@@ -9,15 +8,15 @@ class TreeActionHandler:
     def __init__(self, parent_widget):
         self.parent = parent_widget
 
-    def open_file_explorer(self, current_folder, selected_items):
+    def open_file_explorer(self, current_folder, selected_paths):
         if not current_folder:
             return
 
         target_path = current_folder
         
-        if selected_items:
+        if selected_paths:
             # 첫 번째 선택된 아이템 기준
-            item_path = selected_items[0].data(0, Qt.ItemDataRole.UserRole)
+            item_path = selected_paths[0]
             
             if item_path and os.path.isfile(item_path):
                 # 파일이면: 탐색기를 열어서 해당 파일을 '선택'한 상태로 보여줌
@@ -31,7 +30,7 @@ class TreeActionHandler:
         if os.path.exists(target_path):
             os.startfile(target_path)
 
-    def delete_item(self, path, item, tree_widget):
+    def delete_item(self, path, index, model):
         # 삭제 확인
         msg = CustomMessageBox('삭제 확인', f"정말로 삭제하시겠습니까?\n\n대상: {os.path.basename(path)}", is_question=True, parent=self.parent)
         if msg.exec() == 1:
@@ -41,16 +40,15 @@ class TreeActionHandler:
                 elif os.path.isdir(path):
                     shutil.rmtree(path)
                 
-                # UI에서 제거
-                parent_item = item.parent() or tree_widget.invisibleRootItem()
-                parent_item.removeChild(item)
+                # UI(모델)에서 제거
+                model.remove_index(index)
                 return True
             except Exception as e:
                 self.show_error(f"삭제 실패:\n{e}")
         return False
 
-    def save_tree_to_downloads(self, tree_root_item):
-        content = self._tree_to_text(tree_root_item)
+    def save_tree_to_downloads(self, model):
+        content = self._tree_to_text(model, model.root)
         try:
             download_path = os.path.join(os.path.expanduser("~"), "Downloads")
             file_path = os.path.join(download_path, "FolderTree_List.txt")
@@ -63,20 +61,21 @@ class TreeActionHandler:
         except Exception as e:
             self.show_error(f"저장 실패:\n{e}")
 
-    def _tree_to_text(self, parent, prefix=""):
-        text = ""
-        count = parent.childCount()
-        for i in range(count):
-            item = parent.child(i)
-            name = item.text(0)
-            size = item.text(1)
-            duration = item.text(2)
+    def _tree_to_text(self, model, parent, prefix=""):
+        # 화면에 펼쳐진 것과 관계없이 노드 저장소 전체를 기록
+        lines = []
+        children = parent.children or []
+        count = len(children)
+        for i, node in enumerate(children):
+            name = model.display_text(node, 0)
+            size = model.display_text(node, 1)
+            duration = model.display_text(node, 2)
             connector = "└── " if i == count - 1 else "├── "
-            text += f"{prefix}{connector}{name}   ({size}, {duration})\n"
-            if item.childCount() > 0:
+            lines.append(f"{prefix}{connector}{name}   ({size}, {duration})\n")
+            if node.children:
                 extension = "    " if i == count - 1 else "│   "
-                text += self._tree_to_text(item, prefix + extension)
-        return text
+                lines.append(self._tree_to_text(model, node, prefix + extension))
+        return "".join(lines)
 
     # --- 헬퍼 함수 ---
     def show_error(self, text):
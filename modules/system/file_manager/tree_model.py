@@ -0,0 +1,320 @@
+import os
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QFileInfo
+from PyQt6.QtWidgets import QFileIconProvider
+
+from .tree_components import SORT_TYPE_ROLE
+
+# ==========================================
+# [1] 노드 저장소 (행마다 Qt 객체를 만들지 않음)
+# ==========================================
+class FileNode:
+    # __slots__ 로 노드당 메모리 최소화 (경로는 저장하지 않고 부모를 따라 계산)
+    __slots__ = ('name', 'parent', 'pos', 'is_dir', 'children', 'lookup', 'fetched', 'size', 'duration')
+
+    def __init__(self, name, parent=None, is_dir=False):
+        self.name = name
+        self.parent = parent
+        self.pos = 0           # 부모 children 안에서의 위치 (정렬/삭제 시 다시 매김)
+        self.is_dir = is_dir
+        self.children = None   # 폴더: 아직 스캔 전이면 None, 스캔 후 list
+        self.lookup = None     # 폴더: 이름 -> 자식 노드 (크기/재생 시간 갱신용, 처음 필요할 때 만듦)
+        self.fetched = 0       # 뷰에 노출된 자식 수 (fetchMore 로 늘어남)
+        self.size = None       # None: 측정 전, -1: 해당 없음
+        self.duration = None
+
+    @property
+    def path(self):
+        if self.parent is None:
+            return self.name
+        return os.path.join(self.parent.path, self.name)
+
+    def renumber(self, start=0):
+        # 자식들의 pos 를 다시 매김 (정렬/삭제 후)
+        for i in range(start, len(self.children)):
+            self.children[i].pos = i
+
+    def child(self, name):
+        # 이름으로 자식 찾기 (lookup 은 처음 찾을 때 한 번에 만듦)
+        if self.children is None: return None
+        if self.lookup is None:
+            self.lookup = {c.name: c for c in self.children}
+        return self.lookup.get(name)
+
+    @property
+    def exposed(self):
+        # 뷰가 이 노드의 행을 알고 있는지 (조상까지 모두 fetched 안쪽이어야 함)
+        node = self
+        while node.parent is not None:
+            if node.pos >= node.parent.fetched:
+                return False
+            node = node.parent
+        return True
+
+
+# ==========================================
+# [2] 모델: 이름 / 크기 / 재생 시간 / 삭제
+# ==========================================
+class FolderTreeModel(QAbstractItemModel):
+    HEADERS = ["이름", "크기", "재생 시간", "삭제"]
+    FETCH_CHUNK = 500  # 한 번에 뷰에 노출할 자식 수
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = FileNode("", is_dir=True)
+        self.root.children = []
+        self.dirs = {}          # 폴더 경로 -> 노드 (스트리밍 결과를 붙일 부모 찾기용)
+        self.sort_column = 0
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self.icon_provider = QFileIconProvider()
+        self.icon_cache = {}    # 확장자 -> 아이콘
+
+    # --- 데이터 채우기 ---
+    def reset(self, root_path):
+        self.beginResetModel()
+        self.root = FileNode(root_path, is_dir=True)
+        self.root.children = []
+        self.dirs = {root_path: self.root}
+        self.endResetModel()
+
+    def add_children(self, parent_path, children):
+        # worker가 보낸 폴더 하나 분량의 자식 목록을 붙임. 새 파일 경로 목록 반환
+        node = self.dirs.get(parent_path)
+        if node is None: return []
+
+        if node.children is None:
+            node.children = []
+
+        new_nodes = []
+        new_files = []
+        for child in children:
+            is_dir = child['type'] == 'folder'
+            child_node = FileNode(child['name'], node, is_dir)
+            if is_dir:
+                child_node.size = -1
+                child_node.duration = -1
+                self.dirs[child['path']] = child_node
+            else:
+                new_files.append(child['path'])
+            if node.lookup is not None:
+                node.lookup[child_node.name] = child_node
+            new_nodes.append(child_node)
+
+        new_nodes.sort(key=self._sort_key(self.sort_column), reverse=self._is_desc())
+        start = len(node.children)
+        node.children.extend(new_nodes)
+        node.renumber(start)
+
+        # 뷰가 아직 모르는 폴더면 데이터만 붙여 두고, 행이 노출될 때 fetchMore 가 보여줌
+        if not node.exposed:
+            return new_files
+
+        # 아직 한 묶음도 다 안 보여준 상태면 바로 노출, 아니면 fetchMore 로 미룸
+        parent_index = self.index_for_node(node)
+        if node.fetched < self.FETCH_CHUNK:
+            self._expose(node, parent_index, self.FETCH_CHUNK - node.fetched)
+        elif node is not self.root:
+            # 펼침 화살표 갱신
+            self.dataChanged.emit(parent_index, parent_index)
+        return new_files
+
+    def update_meta(self, results):
+        # MetadataProbeWorker 결과 반영 (행 단위 신호 대신 부모별로 묶어서 알림)
+        touched = {}
+        for path, raw_size, _size_str, _duration_str, duration_sec in results:
+            parent = self.dirs.get(os.path.dirname(path))
+            if parent is None: continue
+            node = parent.child(os.path.basename(path))
+            if node is None: continue
+            node.size = raw_size
+            node.duration = duration_sec
+            row = node.pos
+            if row < parent.fetched and parent.exposed:
+                lo, hi = touched.get(id(parent), (parent, row, row))[1:]
+                touched[id(parent)] = (parent, min(lo, row), max(hi, row))
+
+        for parent, lo, hi in touched.values():
+            parent_index = self.index_for_node(parent)
+            self.dataChanged.emit(self.index(lo, 1, parent_index), self.index(hi, 2, parent_index))
+
+    def remove_index(self, index):
+        node = self.node_from_index(index)
+        parent = node.parent
+        if parent is None: return
+        row = node.pos
+        visible = row < parent.fetched
+        if visible and parent.exposed:
+            self.beginRemoveRows(self.index_for_node(parent), row, row)
+        del parent.children[row]
+        parent.renumber(row)
+        if parent.lookup is not None:
+            parent.lookup.pop(node.name, None)
+        if visible:
+            parent.fetched -= 1
+            if parent.exposed:
+                self.endRemoveRows()
+        if node.is_dir:
+            prefix = node.path
+            for path in [p for p in self.dirs if p == prefix or p.startswith(prefix + os.sep)]:
+                del self.dirs[path]
+
+    # --- 인덱스 <-> 노드 ---
+    def node_from_index(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index_for_node(self, node):
+        if node is self.root or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.pos, 0, node)
+
+    def path_for_index(self, index):
+        return self.node_from_index(index).path
+
+    # --- QAbstractItemModel 필수 구현 ---
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        if node.children is None or not (0 <= row < node.fetched):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        return self.index_for_node(node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return self.node_from_index(parent).fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        if not node.is_dir: return False
+        # 스캔 전(None)인 폴더는 일단 펼칠 수 있게 표시
+        return node.children is None or len(node.children) > 0
+
+    def canFetchMore(self, parent):
+        node = self.node_from_index(parent)
+        return node.children is not None and node.fetched < len(node.children)
+
+    def fetchMore(self, parent):
+        node = self.node_from_index(parent)
+        self._expose(node, parent, self.FETCH_CHUNK)
+
+    def _expose(self, node, parent_index, count):
+        remaining = len(node.children) - node.fetched
+        count = min(count, remaining)
+        if count <= 0: return
+        self.beginInsertRows(parent_index, node.fetched, node.fetched + count - 1)
+        node.fetched += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        node = index.internalPointer()
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_text(node, column)
+        if role == Qt.ItemDataRole.UserRole:
+            if column == 0: return node.path
+            if column == 1: return node.size if node.size is not None else 0
+            if column == 2: return node.duration if node.duration is not None else 0
+            return None
+        if role == SORT_TYPE_ROLE:
+            return 0 if node.is_dir else 1
+        if role == Qt.ItemDataRole.DecorationRole and column == 0:
+            return self.icon_for(node)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (1, 2):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def display_text(self, node, column):
+        from .utils import format_size, format_duration
+
+        if column == 0:
+            return node.name
+        if column == 3:
+            return None
+        if node.is_dir:
+            return "-"
+        value = node.size if column == 1 else node.duration
+        if value is None:
+            return "…"
+        if value < 0:
+            return "-"
+        return format_size(value) if column == 1 else format_duration(value)
+
+    def icon_for(self, node):
+        # 아이콘은 확장자별로 한 번만 만들어서 재사용
+        if node.is_dir:
+            key = "<dir>"
+        else:
+            key = os.path.splitext(node.name)[1].lower()
+        icon = self.icon_cache.get(key)
+        if icon is None:
+            if node.is_dir:
+                icon = self.icon_provider.icon(QFileIconProvider.IconType.Folder)
+            else:
+                icon = self.icon_provider.icon(QFileInfo(node.path))
+            self.icon_cache[key] = icon
+        return icon
+
+    # --- 정렬: 폴더가 항상 위, 그 다음 선택 컬럼 ---
+    def _is_desc(self):
+        return self.sort_order == Qt.SortOrder.DescendingOrder
+
+    def _sort_key(self, column):
+        desc = self._is_desc()
+
+        def key(node):
+            # 내림차순(reverse)이어도 폴더가 위에 오도록 타입 값을 뒤집어 줌
+            type_key = (0 if node.is_dir else 1)
+            if desc: type_key = -type_key
+            if column == 1:
+                value = node.size if node.size is not None else 0
+            elif column == 2:
+                value = node.duration if node.duration is not None else 0
+            else:
+                value = node.name.lower()
+            return (type_key, value)
+        return key
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column == 3: return
+        self.sort_column = column
+        self.sort_order = order
+
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_nodes = [(idx.internalPointer(), idx.column()) for idx in old_indexes]
+
+        key = self._sort_key(column)
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not node.children: continue
+            node.children.sort(key=key, reverse=self._is_desc())
+            node.renumber()
+            stack.extend(c for c in node.children if c.is_dir)
+
+        # 정렬 후 아직 노출 안 된 위치로 밀려난 행은 무효 인덱스로
+        new_indexes = [self.createIndex(n.pos, col, n) if n.exposed else QModelIndex()
+                       for n, col in old_nodes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
@@ -1,23 +1,28 @@
 import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, 
-                             QTreeWidget, QTreeWidgetItem, QHeaderView,
-                             QFileDialog, QLabel, QApplication, 
-                             QHBoxLayout, QAbstractItemView, QCheckBox, 
-                             QFileIconProvider)
-from PyQt6.QtCore import Qt, QFileInfo, QSize
+                             QTreeView, QHeaderView,
+                             QFileDialog, QLabel, 
+                             QHBoxLayout, QAbstractItemView, QCheckBox)
+from PyQt6.QtCore import Qt, QSize, QPoint
 
 from .rename_dialog import RenameDialog
 from .tree_logic import TreeActionHandler
-# [수정] SORT_TYPE_ROLE 추가 임포트
-from .tree_components import SortableTreeWidgetItem, SORT_TYPE_ROLE
-from .worker import LoadingDialog, FolderScanWorker
+# [수정] 행마다 위젯을 만들지 않도록 모델/델리게이트 사용
+from .tree_components import DeleteButtonDelegate
+from .tree_model import FolderTreeModel
+from .ignore_rules import get_user_rules_path
+from .worker import LoadingDialog, FolderScanWorker, MetadataProbeWorker
+from ...ui.thread_keeper import retire_thread
 
 class FolderTreeWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.current_folder = None 
+        self.worker = None
+        self.probe_worker = None
+        self.loading = None
+        self.scanned_count = 0
         self.logic = TreeActionHandler(self)
-        self.icon_provider = QFileIconProvider()
         self.init_ui()
 
     def init_ui(self):
@@ -35,6 +40,13 @@ class FolderTreeWidget(QWidget):
         self.chk_ignore.setStyleSheet("QCheckBox { color: #00fa9a; font-weight: bold; } QCheckBox::indicator { width: 18px; height: 18px; }")
         self.chk_ignore.clicked.connect(lambda: self.process_folder(self.current_folder))
         top_layout.addWidget(self.chk_ignore)
+
+        # [NEW] 무시 규칙 파일(.gitignore 형식) 직접 편집
+        self.btn_rules = QPushButton("⚙️ 규칙 편집")
+        self.btn_rules.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_rules.setStyleSheet("background-color: #3d3d3d; color: white; padding: 4px 10px; border-radius: 4px;")
+        self.btn_rules.clicked.connect(self.open_ignore_rules)
+        top_layout.addWidget(self.btn_rules)
         layout.addLayout(top_layout)
 
         btn_layout = QHBoxLayout()
@@ -42,7 +54,7 @@ class FolderTreeWidget(QWidget):
         self.btn_open.clicked.connect(self.open_folder_dialog)
         
         self.btn_save = QPushButton("💾 목록 저장")
-        self.btn_save.clicked.connect(lambda: self.logic.save_tree_to_downloads(self.tree.invisibleRootItem()))
+        self.btn_save.clicked.connect(lambda: self.logic.save_tree_to_downloads(self.model))
         self.btn_save.setEnabled(False)
 
         self.btn_rename = QPushButton("✏️ 이름 변경")
@@ -50,7 +62,7 @@ class FolderTreeWidget(QWidget):
         self.btn_rename.setEnabled(False)
 
         self.btn_explorer = QPushButton("📁 폴더 열기")
-        self.btn_explorer.clicked.connect(lambda: self.logic.open_file_explorer(self.current_folder, self.tree.selectedItems()))
+        self.btn_explorer.clicked.connect(lambda: self.logic.open_file_explorer(self.current_folder, self.selected_paths()))
         self.btn_explorer.setEnabled(False)
 
         buttons = [
@@ -67,12 +79,23 @@ class FolderTreeWidget(QWidget):
         
         layout.addLayout(btn_layout)
 
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["이름", "크기", "재생 시간", "삭제"]) 
+        self.model = FolderTreeModel(self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True) # 행 높이 계산 생략 (대용량 필수)
         self.tree.setSortingEnabled(True) 
+        self.tree.sortByColumn(0, Qt.SortOrder.AscendingOrder)
         self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
-        self.tree.itemDoubleClicked.connect(self.on_double_click)
+        self.tree.doubleClicked.connect(self.on_double_click)
         self.tree.setIconSize(QSize(20, 20)) 
+        # [NEW] 화면에 보이는 행의 크기/재생 시간을 먼저 측정
+        self.tree.verticalScrollBar().valueChanged.connect(self.prioritize_visible)
+        self.tree.expanded.connect(self.prioritize_visible)
+
+        # [NEW] 삭제 버튼은 델리게이트가 직접 그림
+        self.delete_delegate = DeleteButtonDelegate(self.tree)
+        self.delete_delegate.delete_clicked.connect(self.on_delete_clicked)
+        self.tree.setItemDelegateForColumn(3, self.delete_delegate)
 
         header = self.tree.header()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
@@ -81,11 +104,11 @@ class FolderTreeWidget(QWidget):
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
         self.tree.setColumnWidth(1, 90); self.tree.setColumnWidth(2, 90); self.tree.setColumnWidth(3, 60)
         self.tree.setStyleSheet("""
-            QTreeWidget { background-color: #1e1e1e; color: #e0e0e0; border: 1px solid #333; font-family: 'Malgun Gothic'; font-size: 13px; }
+            QTreeView { background-color: #1e1e1e; color: #e0e0e0; border: 1px solid #333; font-family: 'Malgun Gothic'; font-size: 13px; }
             QHeaderView::section { background-color: #2d2d2d; color: #ffffff; padding: 5px; border-left: 1px solid #3d3d3d; font-weight: bold; }
-            QTreeWidget::item { padding: 5px; }
-            QTreeWidget::item:hover { background-color: #333333; }
-            QTreeWidget::item:selected { background-color: #0078D7; color: white; }
+            QTreeView::item { padding: 5px; }
+            QTreeView::item:hover { background-color: #333333; }
+            QTreeView::item:selected { background-color: #0078D7; color: white; }
         """)
         layout.addWidget(self.tree)
         self.setLayout(layout)
@@ -93,90 +116,114 @@ class FolderTreeWidget(QWidget):
     def process_folder(self, folder_path):
         if not folder_path: return
 
+        # 진행 중인 스캔이 있으면 먼저 중단 (끝날 때까지는 참조를 유지)
+        self.cancel_scan()
+        retire_thread(self.worker)
+        retire_thread(self.probe_worker)
+        self.worker = self.probe_worker = None
+        if self.loading:
+            self.loading.close()
+            self.loading = None
+
         self.current_folder = folder_path
         self.label.setText(f"📂 {folder_path}")
-        self.tree.clear()
+        self.model.reset(folder_path)
+        self.scanned_count = 0
         
-        self.loading = LoadingDialog(self)
+        self.loading = LoadingDialog(self, cancellable=True)
+        self.loading.cancel_requested.connect(self.cancel_scan)
         self.loading.show()
         
         is_filter_on = self.chk_ignore.isChecked()
         self.worker = FolderScanWorker(folder_path, filter_hidden=is_filter_on)
-        self.worker.finished_data.connect(self.on_scan_finished)
+        self.worker.batch_ready.connect(self.on_scan_batch)
+        self.worker.scan_done.connect(self.on_scan_finished)
         self.worker.start()
 
-    def on_scan_finished(self, data):
-        self.loading.close()
-        self.tree.setSortingEnabled(False)
-        self.populate_tree(self.tree.invisibleRootItem(), data)
-        self.tree.setSortingEnabled(True)
+        self.probe_worker = MetadataProbeWorker()
+        self.probe_worker.meta_ready.connect(self.on_meta_ready)
+        self.probe_worker.start()
+
+    def cancel_scan(self):
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+        if self.probe_worker and self.probe_worker.isRunning():
+            self.probe_worker.cancel()
+
+    def on_scan_batch(self, batch):
+        # 이전 스캔(취소된 worker)에서 늦게 도착한 결과는 무시
+        if self.sender() is not self.worker: return
+
+        new_files = []
+        for parent_path, children in batch:
+            new_files.extend(self.model.add_children(parent_path, children))
+            self.scanned_count += len(children)
+
+        self.probe_worker.enqueue(new_files)
+        self.prioritize_visible()
+
+        if self.loading:
+            self.loading.set_text(f"불러오는 중... ({self.scanned_count:,})")
+
+    def on_scan_finished(self, total, cancelled):
+        if self.sender() is not self.worker: return
+
+        if self.loading:
+            self.loading.close()
+            self.loading = None
+        if cancelled:
+            self.label.setText(f"📂 {self.current_folder} (스캔 취소됨)")
+            self.probe_worker.cancel()
+        else:
+            self.probe_worker.close_input()
         
         self.btn_save.setEnabled(True)
         self.btn_rename.setEnabled(True)
         self.btn_explorer.setEnabled(True)
 
-    def populate_tree(self, parent_item, data):
-        # 데이터가 섞여서 오더라도 여기서 먼저 '폴더'와 '파일'을 분리해서 넣는게 안전함
-        # 하지만 worker에서 이미 이름순 정렬은 되어 있음.
-        # TreeWidget 정렬 로직이 Type -> Name 순이므로 순서대로 넣기만 해도 됨.
-        
-        for child in data.get('children', []):
-            item = SortableTreeWidgetItem(parent_item)
-            item.setText(0, child['name'])
-            item.setData(0, Qt.ItemDataRole.UserRole, child['path'])
-            
-            # 시스템 아이콘
-            file_info = QFileInfo(child['path'])
-            icon = self.icon_provider.icon(file_info)
-            item.setIcon(0, icon)
-            
-            if child['type'] == 'file':
-                # [NEW] 파일이라는 표식 (1)
-                item.setData(0, SORT_TYPE_ROLE, 1)
-                
-                item.setText(1, child['size_str'])
-                item.setData(1, Qt.ItemDataRole.UserRole, child['raw_size'])
-                item.setText(2, child['duration_str'])
-                item.setData(2, Qt.ItemDataRole.UserRole, child['duration_sec'])
-            else:
-                # [NEW] 폴더라는 표식 (0) -> 숫자가 작으니 정렬 시 위로 감
-                item.setData(0, SORT_TYPE_ROLE, 0)
-                
-                item.setText(1, "-"); item.setData(1, Qt.ItemDataRole.UserRole, -1)
-                item.setText(2, "-"); item.setData(2, Qt.ItemDataRole.UserRole, -1)
-
-            item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            item.setTextAlignment(2, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-            btn_widget = QWidget(); btn_widget.setStyleSheet("background-color: transparent;")
-            btn_layout = QHBoxLayout(btn_widget); btn_layout.setContentsMargins(0, 0, 0, 0); btn_layout.setAlignment(Qt.AlignmentFlag.AlignCenter) 
-            btn_del = QPushButton("❌"); btn_del.setFixedSize(20, 20); btn_del.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn_del.setStyleSheet("QPushButton { background-color: transparent; border: none; font-size: 10px; } QPushButton:hover { background-color: #c0392b; border-radius: 3px; }")
-            btn_del.clicked.connect(lambda _, p=child['path'], i=item: self.logic.delete_item(p, i, self.tree))
-            btn_layout.addWidget(btn_del)
-            self.tree.setItemWidget(item, 3, btn_widget)
-            
-            if child['type'] == 'folder':
-                self.populate_tree(item, child)
-
-    def on_double_click(self, item, column):
-        if column == 3: return
-        path = item.data(0, Qt.ItemDataRole.UserRole)
+    def prioritize_visible(self, *_):
+        # 뷰포트 안에 보이는 파일 행을 찾아 측정 우선순위를 올림
+        if not self.probe_worker: return
+        viewport_h = self.tree.viewport().height()
+        index = self.tree.indexAt(QPoint(0, 0))
+        visible = []
+        while index.isValid():
+            if self.tree.visualRect(index).top() > viewport_h: break
+            node = self.model.node_from_index(index)
+            if not node.is_dir and node.size is None: visible.append(node.path)
+            index = self.tree.indexBelow(index)
+        if visible:
+            self.probe_worker.prioritize(visible)
+
+    def on_meta_ready(self, results):
+        if self.sender() is not self.probe_worker: return
+        # 묶음 단위로 한 번에 갱신 (부모 폴더별로 dataChanged 한 번)
+        self.model.update_meta(results)
+
+    def on_delete_clicked(self, index):
+        path = self.model.path_for_index(index)
+        self.logic.delete_item(path, index, self.model)
+
+    def selected_paths(self):
+        return [self.model.path_for_index(idx) for idx in self.tree.selectionModel().selectedRows(0)]
+
+    def on_double_click(self, index):
+        if index.column() == 3: return
+        path = self.model.path_for_index(index)
         if path and os.path.exists(path):
             os.startfile(path)
 
     def open_rename_dialog(self):
         if not self.current_folder: return
-        selected_items = self.tree.selectedItems()
-        target_files = []
-        if selected_items:
-            for item in selected_items:
-                path = item.data(0, Qt.ItemDataRole.UserRole)
-                if path and path != self.current_folder: target_files.append(path)
+        target_files = [p for p in self.selected_paths() if p and p != self.current_folder]
         final_targets = target_files if target_files else None
         dialog = RenameDialog(self.current_folder, self, target_files=final_targets)
         if dialog.exec(): self.process_folder(self.current_folder)
 
+    def open_ignore_rules(self):
+        # 저장 후 '잡동사니 숨기기'를 다시 누르거나 재스캔하면 반영됨
+        os.startfile(get_user_rules_path())
+
     def open_folder_dialog(self):
         folder = QFileDialog.getExistingDirectory(self, "폴더 선택")
-        if folder: self.process_folder(folder)
\ No newline at end of file
+        if folder: self.process_folder(folder)
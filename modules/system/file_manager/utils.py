@@ -1,6 +1,7 @@
 import os
 from tinytag import TinyTag
 import cv2  # [NEW] OpenCV 추가 (강력한 영상 처리 도구)
+from .media_cache import get_media_cache
 
 def format_size(size):
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -9,13 +10,17 @@ def format_size(size):
         size /= 1024.0
     return f"{size:.1f} TB"
 
-def get_video_duration(file_path):
-    video_exts = ['.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.ts', '.mpg', '.mpeg', '.3gp', '.m2ts']
-    ext = os.path.splitext(file_path)[1].lower()
-    
-    if ext not in video_exts:
-        return "-", -1
+VIDEO_EXTS = ['.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.ts', '.mpg', '.mpeg', '.3gp', '.m2ts']
 
+def format_duration(seconds):
+    if seconds > 0:
+        m, s = divmod(seconds, 60)
+        h, m = divmod(m, 60)
+        return f"{h}:{m:02d}:{s:02d}" if h > 0 else f"{m:02d}:{s:02d}"
+    return "-"
+
+def probe_video_duration(file_path):
+    # 실제로 파일을 열어서 재생 시간(초)을 구함. 실패하면 0
     seconds = 0
     
     # 1차 시도: 가벼운 TinyTag 사용
@@ -39,11 +44,33 @@ def get_video_duration(file_path):
         except:
             pass
 
+    return seconds
+
+def get_video_duration(file_path, size=None, mtime=None):
+    # size/mtime: 스캐너가 이미 stat 한 값이 있으면 넘겨받아 재사용
+    ext = os.path.splitext(file_path)[1].lower()
+    
+    if ext not in VIDEO_EXTS:
+        return "-", -1
+
+    # [NEW] 디스크 캐시 확인 (경로+크기+수정시간이 같으면 파일을 열지 않음)
+    cache = get_media_cache()
+    if cache and (size is None or mtime is None):
+        try:
+            st = os.stat(file_path)
+            size, mtime = st.st_size, st.st_mtime
+        except OSError:
+            cache = None
+
+    seconds = cache.get(file_path, size, mtime) if cache else None
+    if seconds is None:
+        seconds = probe_video_duration(file_path)
+        if cache:
+            # 실패(0)도 저장해서 다음 스캔 때 다시 열지 않음
+            cache.put(file_path, size, mtime, seconds)
+
     # 결과 포맷팅
     if seconds > 0:
-        m, s = divmod(seconds, 60)
-        h, m = divmod(m, 60)
-        time_str = f"{h}:{m:02d}:{s:02d}" if h > 0 else f"{m:02d}:{s:02d}"
-        return time_str, seconds
+        return format_duration(seconds), seconds
 
     return "-", -1
\ No newline at end of file
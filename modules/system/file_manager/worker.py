@@ -1,10 +1,15 @@
 import os
 import math
-import fnmatch # 와일드카드 매칭용
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QWidget
+import time
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QWidget, QPushButton
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QRectF
 from PyQt6.QtGui import QPainter, QColor, QPen
 
+from .ignore_rules import IgnoreMatcher
+
 # ==========================================
 # [1] UI: 로딩 스피너 (뱅글뱅글)
 # ==========================================
@@ -40,11 +45,14 @@ class LoadingSpinner(QWidget):
 # [2] UI: 로딩 다이얼로그 (팝업창)
 # ==========================================
 class LoadingDialog(QDialog):
-    def __init__(self, parent=None):
+    cancel_requested = pyqtSignal()
+
+    def __init__(self, parent=None, cancellable=False):
         super().__init__(parent)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Dialog)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setFixedSize(200, 150)
+        height = 190 if cancellable else 150
+        self.setFixedSize(200, height)
         
         if parent:
             # 부모 위젯 중앙에 위치
@@ -56,7 +64,7 @@ class LoadingDialog(QDialog):
         
         self.bg = QWidget(self)
         self.bg.setStyleSheet("background-color: rgba(40, 40, 40, 240); border-radius: 15px;")
-        self.bg.setGeometry(0, 0, 200, 150)
+        self.bg.setGeometry(0, 0, 200, height)
         
         inner_layout = QVBoxLayout(self.bg)
         inner_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -69,83 +77,382 @@ class LoadingDialog(QDialog):
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         inner_layout.addWidget(self.label)
 
+        # [NEW] 취소 버튼 (긴 스캔 도중 중단용)
+        if cancellable:
+            self.btn_cancel = QPushButton("취소")
+            self.btn_cancel.setCursor(Qt.CursorShape.PointingHandCursor)
+            self.btn_cancel.setStyleSheet("QPushButton { background-color: #555; color: white; border: none; padding: 5px 15px; border-radius: 4px; } QPushButton:hover { background-color: #c0392b; }")
+            self.btn_cancel.clicked.connect(self.cancel_requested.emit)
+            inner_layout.addWidget(self.btn_cancel, 0, Qt.AlignmentFlag.AlignCenter)
+
+    def set_text(self, text):
+        self.label.setText(text)
+
 # ==========================================
-# [3] Logic: 파일 스캔 일꾼 (필터링 포함)
+# [3] Logic: 파일 스캔 일꾼 (필터링 + 병렬 + 스트리밍)
 # ==========================================
 class FolderScanWorker(QThread):
-    finished_data = pyqtSignal(dict) 
+    # [(부모 폴더 경로, [자식 노드, ...]), ...] 를 폴더 단위로 묶어서 전달
+    batch_ready = pyqtSignal(list)
+    # (스캔한 항목 수, 취소 여부)
+    scan_done = pyqtSignal(int, bool)
+
+    MAX_WORKERS = 16          # NAS 등 느린 저장소는 I/O 대기가 길어서 CPU 수보다 넉넉하게
+    BATCH_INTERVAL = 0.1      # 최소 이 간격(초)마다 UI로 전달
+    BATCH_DIRS = 64           # 또는 폴더가 이만큼 모이면 전달
 
     def __init__(self, folder_path, filter_hidden=True):
         super().__init__()
         self.folder_path = folder_path
         self.filter_hidden = filter_hidden
-        
-        # [수정] 무시할 파일/폴더 패턴 목록 (obj, bin, .vs 추가)
-        self.ignore_patterns = [
-            # 파이썬/개발 관련
-            'venv', '.venv', 'env', '__pycache__', 
-            '*.pyc', '*.pyd', '*.pyo', 
-            '.git', '.vscode', '.idea',
-            'node_modules', 'dist', 'build',
-            
-            # Visual Studio 관련 (추가됨)
-            'obj', 'bin', '.vs',
-            
-            # 시스템 파일
-            'Desktop.ini', 'Thumbs.db',
-            '$RECYCLE.BIN', 'System Volume Information'
-        ]
+        self._cancelled = False
+        # [수정] 무시 규칙은 run() 시작 시 한 번만 컴파일 (ignore_rules.py, 사용자 규칙 파일 포함)
+        self.matcher = None
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
 
     def run(self):
-        result_data = self.scan_recursive(self.folder_path)
-        self.finished_data.emit(result_data)
+        # 규칙 파일을 못 읽는 등 도중에 실패해도 끝 신호는 항상 보냄 (안 그러면 로딩 창이 닫히지 않음)
+        self.total = 0
+        try:
+            self._scan()
+        except Exception as e:
+            print(f"Scan Error: {e}")
+        finally:
+            self.scan_done.emit(self.total, self._cancelled)
+
+    def _scan(self):
+        if self.filter_hidden:
+            self.matcher = IgnoreMatcher.from_sources(self.folder_path)
+
+        pending_batch = []
+        last_emit = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            futures = {pool.submit(self.scan_dir, self.folder_path)}
+
+            while futures and not self._cancelled:
+                done, futures = wait(futures, timeout=self.BATCH_INTERVAL, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    path, children, subdirs = future.result()
+                    pending_batch.append((path, children))
+                    self.total += len(children)
+                    # 부모 폴더 결과를 먼저 쌓은 뒤에 하위 폴더를 예약 -> UI에는 항상 부모가 먼저 도착
+                    if not self._cancelled:
+                        for sub in subdirs:
+                            futures.add(pool.submit(self.scan_dir, sub))
+
+                now = time.monotonic()
+                if pending_batch and (len(pending_batch) >= self.BATCH_DIRS or now - last_emit >= self.BATCH_INTERVAL):
+                    self.batch_ready.emit(pending_batch)
+                    pending_batch = []
+                    last_emit = now
+
+            # 취소된 경우 아직 시작 안 한 작업은 버림
+            for future in futures:
+                future.cancel()
+
+        if pending_batch and not self._cancelled:
+            self.batch_ready.emit(pending_batch)
+
+    def should_skip(self, entry, is_dir):
+        # [필터링 로직] 체크박스가 켜져있고, 무시 규칙에 해당하면 건너뜀
+        # 폴더는 여기서 걸러지면 하위 목록을 아예 읽지 않음 (node_modules 등)
+        if self.matcher is None:
+            return False
+        rel_path = None
+        if self.matcher.needs_path:
+            rel_path = os.path.relpath(entry.path, self.folder_path)
+        return self.matcher.is_ignored(entry.name, rel_path, is_dir)
+
+    def scan_dir(self, path):
+        # 폴더 하나만 읽어서 (경로, 자식 노드 목록, 하위 폴더 경로 목록) 반환
+        # 크기/재생 시간은 MetadataProbeWorker가 나중에 채움 (구조 먼저 표시)
+        children = []
+        subdirs = []
+        if self._cancelled:
+            return path, children, subdirs
+
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name) # 이름순 정렬
+        except OSError:
+            return path, children, subdirs
+
+        for entry in entries:
+            if self._cancelled:
+                break
+            try:
+                # DirEntry 캐시를 그대로 사용 (isfile/isdir 별도 호출 없음)
+                # 심볼릭 링크/정션 폴더는 순환 위험이 있어 따라가지 않음
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if self.should_skip(entry, is_dir):
+                    continue
+
+                if not is_dir and entry.is_file():
+                    children.append({
+                        'name': entry.name,
+                        'path': entry.path,
+                        'type': 'file'
+                    })
+
+                elif is_dir:
+                    children.append({
+                        'name': entry.name,
+                        'path': entry.path,
+                        'type': 'folder'
+                    })
+                    subdirs.append(entry.path)
+            except OSError:
+                pass
+
+        return path, children, subdirs
+
+
+# ==========================================
+# [4] Logic: 크기/재생 시간 지연 측정 일꾼
+# ==========================================
+class MetadataProbeWorker(QThread):
+    # [(경로, raw_size, size_str, duration_str, duration_sec), ...]
+    meta_ready = pyqtSignal(list)
+
+    MAX_WORKERS = 8
+    BATCH_INTERVAL = 0.15
+
+    PRIORITY_VISIBLE = 0   # 화면에 보이는 행
+    PRIORITY_NORMAL = 1    # 나머지
+
+    def __init__(self):
+        super().__init__()
+        self._heap = []            # (우선순위, 순번, 경로)
+        self._seq = 0
+        self._queued = {}          # 경로 -> 현재 우선순위
+        self._done = set()
+        self._results = []
+        self._cond = threading.Condition()
+        self._input_closed = False
+        self._in_flight = set()    # 풀에서 읽고 있는 경로
+        self._cancelled = False
+
+    def enqueue(self, paths, priority=PRIORITY_NORMAL):
+        # 이미 더 높은 우선순위로 들어가 있으면 무시, 아니면 (다시) 넣음
+        with self._cond:
+            for path in paths:
+                # 끝났거나 지금 읽고 있는 경로는 다시 넣지 않음
+                if path in self._done or path in self._in_flight: continue
+                current = self._queued.get(path)
+                if current is not None and current <= priority: continue
+                self._queued[path] = priority
+                self._seq += 1
+                heapq.heappush(self._heap, (priority, self._seq, path))
+            self._cond.notify_all()
+
+    def prioritize(self, paths):
+        self.enqueue(paths, self.PRIORITY_VISIBLE)
+
+    def close_input(self):
+        # 스캔이 끝나서 더 이상 들어올 경로가 없음 -> 큐가 비면 종료
+        with self._cond:
+            self._input_closed = True
+            self._cond.notify_all()
+
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._cond.notify_all()
 
-    def scan_recursive(self, path):
+    def _next_path(self):
+        with self._cond:
+            while not self._cancelled:
+                while self._heap:
+                    priority, _, path = heapq.heappop(self._heap)
+                    # 우선순위가 올라가서 중복으로 들어간 예전 항목은 건너뜀
+                    if self._queued.get(path) != priority: continue
+                    del self._queued[path]
+                    self._in_flight.add(path)
+                    return path
+                if self._input_closed:
+                    return None
+                self._cond.wait(0.2)
+            return None
+
+    def _probe_loop(self):
         from .utils import format_size, get_video_duration
-        
-        node = {
-            'name': os.path.basename(path),
-            'path': path,
-            'type': 'folder',
-            'children': []
-        }
-        
+
+        while True:
+            path = self._next_path()
+            if path is None: return
+            result = (path, -1, "-", "-", -1)
+            try:
+                st = os.stat(path)
+                time_str, seconds = get_video_duration(path, st.st_size, st.st_mtime)
+                result = (path, st.st_size, format_size(st.st_size), time_str, seconds)
+            except OSError:
+                pass
+            finally:
+                # 예상 못 한 예외로 이 반복이 끝나더라도 경로는 완료 처리
+                with self._cond:
+                    self._in_flight.discard(path)
+                    self._done.add(path)
+                    self._results.append(result)
+
+    @staticmethod
+    def _report_error(future):
+        # 풀에서 난 예외는 future 안에 묻히므로 직접 출력
+        error = future.exception()
+        if error is not None:
+            print(f"Metadata Probe Error: {error!r}")
+
+    def _take_results(self):
+        with self._cond:
+            results, self._results = self._results, []
+            return results
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as pool:
+            loops = [pool.submit(self._probe_loop) for _ in range(self.MAX_WORKERS)]
+            for f in loops:
+                f.add_done_callback(self._report_error)
+            while not all(f.done() for f in loops):
+                time.sleep(self.BATCH_INTERVAL)
+                results = self._take_results()
+                if results and not self._cancelled:
+                    self.meta_ready.emit(results)
+
+        results = self._take_results()
+        if results and not self._cancelled:
+            self.meta_ready.emit(results)
+
+        # 재생 시간 캐시 기록 마무리 + 적중률 출력
+        from .media_cache import get_media_cache
+        cache = get_media_cache()
+        if cache:
+            cache.flush()
+            stats = cache.stats()
+            print(f"[MediaCache] hit {stats['hits']} / miss {stats['misses']} ({stats['hit_rate'] * 100:.1f}%)")
+            cache.reset_stats()
+
+
+# ==========================================
+# [5] Logic: 일괄 이름 변경 일꾼 (계획 -> 기록 -> 실행/되돌리기)
+# ==========================================
+class BatchRenameWorker(QThread):
+    progress = pyqtSignal(int, int)      # (완료, 전체) - 초당 몇 번만
+    finished_report = pyqtSignal(dict)
+
+    UI_INTERVAL = 0.25
+
+    def __init__(self, pairs=None, journal=None, undo=False, label=""):
+        super().__init__()
+        self.pairs = pairs or []
+        self.journal = journal   # 주어지면 계획 없이 이어서 하기 / 되돌리기
+        self.undo = undo
+        self.label = label
+        self.cancel_event = threading.Event()
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _on_progress(self, done, total):
+        # 파일마다 신호를 보내지 않고 간격을 둠
+        now = time.perf_counter()
+        if now - self._last_emit >= self.UI_INTERVAL:
+            self._last_emit = now
+            self.progress.emit(done, total)
+
+    def run(self):
+        from .batch_rename import plan_renames, RenameJournal, execute_journal, undo_journal, STATE_DONE
+
+        skipped = []
+        if self.journal is None:
+            plan = plan_renames(self.pairs)
+            skipped = plan['skipped']
+            if not plan['steps']:
+                self.finished_report.emit({'status': STATE_DONE, 'total': 0, 'done': 0, 'failed': [],
+                                           'renamed': [], 'skipped': skipped, 'journal': None})
+                return
+            self.journal = RenameJournal.create(plan, self.label)
+
+        if self.undo:
+            report = undo_journal(self.journal, self._on_progress, self.cancel_event)
+        else:
+            report = execute_journal(self.journal, self._on_progress, self.cancel_event)
+        report['skipped'] = skipped
+        self.progress.emit(report['done'], report['total'])
+        self.finished_report.emit(report)
+
+
+# ==========================================
+# [6] Logic: 이름 변경 미리보기 일꾼 (입력할 때마다 새로 시작, 이전 것은 취소)
+# ==========================================
+class RenamePreviewWorker(QThread):
+    files_ready = pyqtSignal(list)          # 폴더를 훑었으면 파일 목록 (다음 미리보기에 재사용)
+    preview_ready = pyqtSignal(list)        # 앞쪽 (기존 경로, 새 경로) 몇 개
+    progress = pyqtSignal(int, int)         # (확인한 파일, 전체)
+    finished_preview = pyqtSignal(list, int)  # (바뀌는 전체 목록, 전체 파일 수)
+    failed = pyqtSignal(str)                # 규칙 오류
+
+    UI_INTERVAL = 0.25
+
+    def __init__(self, settings, files=None, folder_path=None, limit=200):
+        super().__init__()
+        self.settings = dict(settings)
+        self.files = files
+        self.folder_path = folder_path
+        self.limit = limit
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        from .rename_rules import build_pipeline, RuleError
+
+        try:
+            pipeline = build_pipeline(self.settings)
+        except RuleError as e:
+            self.failed.emit(str(e))
+            return
+
+        if self.files is None:
+            files = []
+            for root, _dirs, names in os.walk(self.folder_path):
+                if self._cancelled: return
+                files.extend(os.path.join(root, n) for n in names)
+            # 순번이 매번 같도록 경로 순 정렬
+            files.sort(key=lambda p: p.lower())
+            self.files = files
+            self.files_ready.emit(files)
+
+        pairs = []
+        sent_preview = False
+        last_emit = time.perf_counter()
+        total = len(self.files)
         try:
-            items = os.listdir(path)
-            items.sort() # 이름순 정렬
-
-            for name in items:
-                # [필터링 로직] 체크박스가 켜져있고, 무시 목록에 해당하면 건너뜀
-                if self.filter_hidden:
-                    should_skip = False
-                    for pattern in self.ignore_patterns:
-                        if fnmatch.fnmatch(name, pattern):
-                            should_skip = True
-                            break
-                    if should_skip:
-                        continue
-
-                full_path = os.path.join(path, name)
-                
-                if os.path.isfile(full_path):
-                    raw_size = os.path.getsize(full_path)
-                    time_str, seconds = get_video_duration(full_path)
-                    
-                    file_node = {
-                        'name': name,
-                        'path': full_path,
-                        'type': 'file',
-                        'size_str': format_size(raw_size),
-                        'raw_size': raw_size,
-                        'duration_str': time_str,
-                        'duration_sec': seconds
-                    }
-                    node['children'].append(file_node)
-                    
-                elif os.path.isdir(full_path):
-                    child_node = self.scan_recursive(full_path)
-                    node['children'].append(child_node)
-        except:
-            pass
-            
-        return node
\ No newline at end of file
+            for i, path in enumerate(self.files):
+                name = os.path.basename(path)
+                new_name = pipeline.new_name(path, i)
+                if new_name != name:
+                    pairs.append((path, os.path.join(os.path.dirname(path), new_name)))
+                if not sent_preview and len(pairs) >= self.limit:
+                    self.preview_ready.emit(pairs[:self.limit])
+                    sent_preview = True
+                if i % 500 == 0:
+                    if self._cancelled: return
+                    now = time.perf_counter()
+                    if now - last_emit >= self.UI_INTERVAL:
+                        last_emit = now
+                        self.progress.emit(i, total)
+        except RuleError as e:
+            self.failed.emit(str(e))
+            return
+        if self._cancelled: return
+        if not sent_preview:
+            self.preview_ready.emit(pairs)
+        self.finished_preview.emit(pairs, total)
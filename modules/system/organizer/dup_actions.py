@@ -0,0 +1,127 @@
+import os
+import sys
+import shutil
+
+from .dup_engine import full_digest
+
+MODE_HARDLINK = "hardlink"
+MODE_REFLINK = "reflink"
+
+# Linux FICLONE ioctl (btrfs, XFS 등에서 블록 공유 복사)
+FICLONE = 0x40049409
+
+
+def reflink_supported():
+    return sys.platform.startswith("linux")
+
+
+def plan_link_replacement(groups, mode=MODE_HARDLINK, keep_index=0):
+    """
+    중복 그룹마다 원본 하나(keep)를 남기고 나머지를 링크로 바꾸는 계획 작성 (실제 변경 없음)
+    반환: [{'keep', 'target', 'size', 'reclaim', 'status', 'reason'}] - status 는 'ready' / 'skip'
+    reclaim: 교체했을 때 실제로 줄어드는 용량 (다른 하드 링크가 남아 있는 파일은 0)
+    """
+    plan = []
+    for group in groups:
+        paths = group['paths']
+        if len(paths) < 2: continue
+        keep = paths[keep_index if keep_index < len(paths) else 0]
+        try:
+            keep_st = os.stat(keep)
+        except OSError as e:
+            for target in paths:
+                if target != keep:
+                    plan.append({'keep': keep, 'target': target, 'size': group['size'], 'reclaim': 0,
+                                 'status': 'skip', 'reason': f"원본 접근 불가: {e}"})
+            continue
+
+        for target in paths:
+            if target == keep: continue
+            entry = {'keep': keep, 'target': target, 'size': group['size'], 'reclaim': 0, 'status': 'ready', 'reason': ''}
+            try:
+                st = os.stat(target)
+                if st.st_nlink == 1:
+                    entry['reclaim'] = group['size']
+                if (st.st_dev, st.st_ino) == (keep_st.st_dev, keep_st.st_ino) and st.st_ino:
+                    entry.update(status='skip', reason="이미 같은 파일(하드 링크)")
+                elif mode == MODE_HARDLINK and st.st_dev != keep_st.st_dev:
+                    entry.update(status='skip', reason="다른 드라이브 (하드 링크 불가)")
+                elif mode == MODE_REFLINK and not reflink_supported():
+                    entry.update(status='skip', reason="이 OS 에서는 reflink 미지원")
+            except OSError as e:
+                entry.update(status='skip', reason=str(e))
+            plan.append(entry)
+    return plan
+
+
+def summarize_plan(plan):
+    ready = [p for p in plan if p['status'] == 'ready']
+    reasons = {}
+    for p in plan:
+        if p['status'] == 'skip':
+            reasons[p['reason']] = reasons.get(p['reason'], 0) + 1
+    return {
+        'ready': len(ready),
+        'skipped': len(plan) - len(ready),
+        'reclaim_bytes': sum(p['reclaim'] for p in ready),
+        'shared': sum(1 for p in ready if not p['reclaim']),  # 다른 하드 링크가 있어 용량이 줄지 않는 파일
+        'skip_reasons': reasons,
+    }
+
+
+def _reflink_copy(src, dst):
+    import fcntl
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    shutil.copystat(src, dst)
+
+
+def _replace_with_link(keep, target, mode):
+    # 같은 폴더에 임시 이름으로 링크를 만든 뒤 os.replace 로 한 번에 교체 (중간에 실패해도 원본 유지)
+    tmp = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.tplink")
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        if mode == MODE_HARDLINK:
+            os.link(keep, tmp)
+        else:
+            _reflink_copy(keep, tmp)
+        os.replace(tmp, target)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def execute_link_plan(plan, mode=MODE_HARDLINK, dry_run=True, verify=True, progress=None, cancel_event=None):
+    """
+    계획 실행. dry_run 이면 검증만 하고 보고서만 반환
+    verify: (실제 실행 시) 교체 직전에 두 파일 내용을 다시 해시해서 확인 (스캔 이후 바뀐 파일 보호)
+    """
+    ready = [p for p in plan if p['status'] == 'ready']
+    report = []
+    keep_digests = {}  # 원본 해시는 그룹마다 한 번만
+
+    def keep_digest(path):
+        if path not in keep_digests:
+            keep_digests[path] = full_digest(path)
+        return keep_digests[path]
+
+    for i, entry in enumerate(ready):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        result = dict(entry)
+        try:
+            if verify and not dry_run and keep_digest(entry['keep']) != full_digest(entry['target']):
+                result.update(status='skip', reason="스캔 이후 내용이 바뀜")
+            elif dry_run:
+                result.update(status='dry-run')
+            else:
+                _replace_with_link(entry['keep'], entry['target'], mode)
+                result.update(status='done')
+        except Exception as e:
+            result.update(status='error', reason=str(e))
+        report.append(result)
+        if progress:
+            progress(i + 1, len(ready))
+    return report
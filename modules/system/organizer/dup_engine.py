@@ -0,0 +1,277 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# xxhash 가 설치되어 있으면 훨씬 빠름 (없으면 표준 라이브러리 BLAKE2 사용)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+SAMPLE_SIZE = 16 * 1024        # 앞/뒤 샘플 크기
+READ_BUFFER = 1024 * 1024      # 전체 해시용 읽기 버퍼 (1 MB)
+
+
+# 해시 색인에 함께 저장 (알고리즘이 바뀌면 예전 값은 쓰지 않음)
+HASH_ALGO = "xxh3_128" if xxhash is not None else "blake2b_128"
+
+
+def new_hasher():
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def quick_digest(path, size):
+    # 작은 파일은 그냥 전체 해시 ("full"), 큰 파일은 앞/뒤 일부만 읽어서 1차 구분 ("sample")
+    with open(path, "rb") as f:
+        if size <= SAMPLE_SIZE * 2:
+            h = new_hasher()
+            h.update(f.read())
+            return ("full", h.hexdigest())
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f.read(SAMPLE_SIZE))
+        f.seek(size - SAMPLE_SIZE)
+        h.update(f.read(SAMPLE_SIZE))
+        return ("sample", h.hexdigest())
+
+
+def full_digest(path, cancel_event=None):
+    h = new_hasher()
+    buf = bytearray(READ_BUFFER)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            n = f.readinto(buf)
+            if not n: break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def default_workers(folders):
+    # 네트워크 경로(UNC)는 대기 시간이 길어서 동시 요청을 늘리고,
+    # 로컬 디스크는 CPU 수 기준 (HDD 에서 너무 많으면 오히려 탐색이 늘어남)
+    if any(f.startswith('\\\\') or f.startswith('//') for f in folders):
+        return 16
+    return max(2, min(8, os.cpu_count() or 4))
+
+
+class DuplicateFinder:
+    """
+    내용이 같은 파일 찾기 (GUI 와 무관하게 동작)
+    1단계: 크기별 그룹
+    2단계: 앞/뒤 샘플 해시로 다시 나눔
+    3단계: 남은 후보만 전체 해시 (스레드 풀)
+    progress(stage, done, total) 콜백으로 진행 상황 전달, cancel() 로 중단
+    index(HashIndex) 를 주면 바뀌지 않은 파일은 저장된 해시를 재사용
+    """
+    STAGE_WALK = "walk"
+    STAGE_SAMPLE = "sample"
+    STAGE_HASH = "hash"
+    REPORT_INTERVAL = 0.2  # 진행 상황은 이 간격(초)마다 + 단계가 바뀔 때/끝날 때 (GUI 이벤트 큐가 넘치지 않게)
+
+    def __init__(self, folders, workers=None, progress=None, min_size=0, index=None):
+        self.folders = list(folders)
+        self.index = index
+        self.seen_paths = set()
+        self.hardlinks = {}
+        self.workers = workers or default_workers(self.folders)
+        self.progress = progress
+        self.min_size = min_size
+        self.cancel_event = threading.Event()
+        self.stats = {}
+        self._last_report = (None, 0.0)  # (단계, 시각)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _report(self, stage, done, total, final=False):
+        if not self.progress: return
+        now = time.perf_counter()
+        last_stage, last_time = self._last_report
+        if not final and stage == last_stage and now - last_time < self.REPORT_INTERVAL:
+            return
+        self._last_report = (stage, now)
+        self.progress(stage, done, total)
+
+    # --- 1단계: 파일 수집 + 크기별 그룹 ---
+    def collect_sizes(self):
+        size_map = {}
+        seen = set()
+        count = 0
+        stack = list(self.folders)
+        while stack and not self.cancelled:
+            folder = stack.pop()
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                # 폴더가 겹쳐서 같은 파일이 두 번 잡히는 경우 방지
+                                key = os.path.normcase(os.path.abspath(entry.path))
+                                if key in seen: continue
+                                seen.add(key)
+                                if self.index is not None:
+                                    self.seen_paths.add(entry.path)
+                                st = entry.stat()
+                                if st.st_size < self.min_size: continue
+                                # (경로, 장치, inode, 수정 시간) - 해시 색인 키로 사용
+                                info = (entry.path, st.st_dev, st.st_ino, st.st_mtime_ns)
+                                size_map.setdefault(st.st_size, []).append(info)
+                                count += 1
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+            self._report(self.STAGE_WALK, count, 0)
+        self._report(self.STAGE_WALK, count, 0, final=True)
+        self.stats['files'] = count
+        return size_map
+
+    def collapse_hardlinks(self, size_map):
+        # 크기가 겹치는 후보만 (장치, inode) 확인. Windows 는 scandir 결과에 inode 가 없어 os.stat 로 보충
+        collapsed = {}
+        collapsed_count = 0
+        for size, infos in size_map.items():
+            if len(infos) < 2:
+                collapsed[size] = infos
+                continue
+            by_inode = {}
+            kept = []
+            for info in infos:
+                path, dev, ino, mtime_ns = info
+                if not ino:
+                    try:
+                        st = os.stat(path)
+                        dev, ino = st.st_dev, st.st_ino
+                        info = (path, dev, ino, mtime_ns)
+                    except OSError:
+                        pass
+                if ino:
+                    first = by_inode.get((dev, ino))
+                    if first is not None:
+                        self.hardlinks.setdefault(first, []).append(path)
+                        collapsed_count += 1
+                        continue
+                    by_inode[(dev, ino)] = path
+                kept.append(info)
+            collapsed[size] = kept
+        self.stats['hardlinks'] = collapsed_count
+        return collapsed
+
+    # --- 2/3단계 공통: 스레드 풀로 해시 계산 후 같은 값끼리 묶기 ---
+    def _group_by(self, stage, candidates, func):
+        # candidates: [(그룹 키, 경로, 크기)] -> {(그룹 키, 해시): [경로...]}
+        groups = {}
+        total = len(candidates)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(func, path, size): (key, path) for key, path, size in candidates}
+            for future in as_completed(futures):
+                if self.cancelled:
+                    for f in futures: f.cancel()
+                    break
+                key, path = futures[future]
+                try:
+                    digest = future.result()
+                except OSError:
+                    digest = None
+                if digest is not None:
+                    groups.setdefault((key, digest), []).append(path)
+                done += 1
+                self._report(stage, done, total, final=done == total)
+        return groups
+
+    def _remember(self, digests, info, size, digest):
+        digests[info[0]] = (size, digest)
+        if self.index is not None:
+            path, dev, ino, mtime_ns = info
+            self.index.store(path, dev, ino, size, mtime_ns, HASH_ALGO, digest)
+
+    def run(self):
+        started = time.perf_counter()
+        size_map = self.collect_sizes()
+        if self.cancelled: return []
+
+        # 이번에 못 본 파일은 색인에서 정리 (디스크를 다시 읽지 않고 목록 비교만)
+        if self.index is not None:
+            self.stats['pruned'] = self.index.prune_missing(self.folders, self.seen_paths)
+
+        # 같은 inode(하드 링크)는 하나만 남기고 나머지는 별칭으로 기록 -> 두 번 읽지 않음
+        self.hardlinks = {}  # 대표 경로 -> [같은 inode 의 다른 경로]
+        size_map = self.collapse_hardlinks(size_map)
+
+        # 1단계 결과: 같은 크기가 2개 이상인 것만 후보, 색인에 있으면 바로 확정
+        digests = {}        # 경로 -> (크기, 전체 해시)
+        pending = []        # 해시가 필요한 (크기, info)
+        cached_sizes = set()
+        mtimes = {}         # 경로 -> 수정 시간 (결과 화면의 '오래된 것 남기기' 규칙용)
+        for size, infos in size_map.items():
+            if len(infos) < 2: continue
+            for info in infos:
+                mtimes[info[0]] = info[3]
+                digest = None
+                if self.index is not None:
+                    path, dev, ino, mtime_ns = info
+                    digest = self.index.lookup(path, dev, ino, size, mtime_ns, HASH_ALGO)
+                if digest:
+                    digests[info[0]] = (size, digest)
+                    cached_sizes.add(size)
+                else:
+                    pending.append((size, info))
+        self.stats['size_candidates'] = len(digests) + len(pending)
+        self.stats['index_hits'] = len(digests)
+
+        # 2단계: 샘플 해시 (작은 파일은 여기서 전체 해시까지 끝남)
+        info_by_path = {info[0]: info for _, info in pending}
+        sampled = self._group_by(self.STAGE_SAMPLE, [(size, info[0], size) for size, info in pending], quick_digest)
+        if self.cancelled: return []
+
+        survivors = []
+        for (size, (kind, digest)), paths in sampled.items():
+            if kind == "full":
+                for p in paths:
+                    self._remember(digests, info_by_path[p], size, digest)
+            elif len(paths) > 1 or size in cached_sizes:
+                # 샘플이 겹치거나, 색인에 같은 크기 파일이 있으면 전체 비교 필요
+                survivors.extend((size, p, size) for p in paths)
+        self.stats['hash_candidates'] = len(survivors)
+
+        # 3단계: 전체 해시
+        hashed = self._group_by(self.STAGE_HASH, survivors,
+                                lambda path, size: full_digest(path, self.cancel_event))
+        if self.cancelled: return []
+
+        for (size, digest), paths in hashed.items():
+            for p in paths:
+                self._remember(digests, info_by_path[p], size, digest)
+        if self.index is not None:
+            self.index.flush()
+
+        # 같은 (크기, 해시) 끼리 묶기
+        buckets = {}
+        for path, key in digests.items():
+            buckets.setdefault(key, []).append(path)
+        result = []
+        for (size, digest), paths in buckets.items():
+            if len(paths) < 2: continue
+            paths.sort()
+            links = {p: self.hardlinks[p] for p in paths if p in self.hardlinks}
+            result.append({'size': size, 'digest': digest, 'paths': paths, 'hardlinks': links,
+                           'mtimes': [mtimes.get(p, 0) for p in paths]})
+
+        # 낭비 용량이 큰 그룹부터
+        result.sort(key=lambda g: g['size'] * (len(g['paths']) - 1), reverse=True)
+        self.stats['groups'] = len(result)
+        self.stats['elapsed'] = time.perf_counter() - started
+        return result
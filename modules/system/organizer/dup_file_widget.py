@@ -1,15 +1,116 @@
 import os
-import hashlib
+import threading
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                             QLabel, QListWidget, QTreeWidget, QTreeWidgetItem, 
-                             QFileDialog, QHeaderView, QGroupBox)
-from PyQt6.QtCore import Qt
+                             QLabel, QListWidget, QTreeView,
+                             QFileDialog, QHeaderView, QGroupBox, QProgressBar, QCheckBox,
+                             QComboBox)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from ...ui.custom_msg import CustomMessageBox
+from ...ui.item_delegates import DeleteButtonDelegate
+from .dup_result_model import DuplicateResultModel, format_bytes
+from .dup_engine import DuplicateFinder
+from .hash_index import HashIndex
+from .dup_actions import (MODE_HARDLINK, MODE_REFLINK, plan_link_replacement,
+                          summarize_plan, execute_link_plan)
+
+# [NEW] 중복 검사 일꾼 (GUI 스레드가 멈추지 않도록 엔진을 백그라운드에서 실행)
+class DuplicateScanWorker(QThread):
+    progress = pyqtSignal(str, int, int)     # (단계, 완료, 전체)
+    finished_groups = pyqtSignal(list, bool) # (중복 그룹 목록, 취소 여부)
+
+    def __init__(self, folders, index=None):
+        super().__init__()
+        self.finder = DuplicateFinder(folders, progress=self.progress.emit, index=index)
+
+    def cancel(self):
+        self.finder.cancel()
+
+    def run(self):
+        groups = self.finder.run()
+        self.finished_groups.emit(groups, self.finder.cancelled)
+
+# [NEW] 중복 파일을 링크로 교체하는 일꾼 (삭제 대신 공간 회수)
+class LinkReplaceWorker(QThread):
+    progress = pyqtSignal(int, int)
+    finished_report = pyqtSignal(list, bool)  # (결과 목록, 취소 여부)
+
+    def __init__(self, plan, mode):
+        super().__init__()
+        self.plan = plan
+        self.mode = mode
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        # 지금 바꾸는 파일까지만 하고 멈춤 (이미 바꾼 파일은 그대로)
+        self.cancel_event.set()
+
+    def run(self):
+        report = execute_link_plan(self.plan, mode=self.mode, dry_run=False, progress=self.progress.emit,
+                                   cancel_event=self.cancel_event)
+        self.finished_report.emit(report, self.cancel_event.is_set())
+
+# [NEW] 해시 색인 정리 일꾼 (색인 전체의 존재 확인은 오래 걸리고 네트워크 경로에서 멈출 수 있음)
+class PruneIndexWorker(QThread):
+    progress = pyqtSignal(int, int)
+    finished_report = pyqtSignal(int, bool)  # (지운 항목 수, 취소 여부)
+
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        removed = 0
+        try:
+            removed = self.index.prune_missing(progress=self.progress.emit, cancel_event=self.cancel_event)
+        except Exception as e:
+            print(f"Index prune failed: {e}")
+        self.finished_report.emit(removed, self.cancel_event.is_set())
+
+# [NEW] 파일 삭제 일꾼 (수천 개를 지워도 화면이 멈추지 않도록 묶음 단위로 결과 전달)
+class DeleteFilesWorker(QThread):
+    deleted = pyqtSignal(list)          # 이번 묶음에서 지운 경로
+    progress = pyqtSignal(int, int)
+    finished_report = pyqtSignal(list, int)  # ([(경로, 오류 메시지)] 실패 목록, 실제로 줄어든 바이트)
+    BATCH_SIZE = 200
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = list(paths)
+
+    def run(self):
+        batch = []
+        failed = []
+        freed = 0
+        total = len(self.paths)
+        for i, path in enumerate(self.paths, 1):
+            try:
+                st = os.stat(path)
+                os.remove(path)
+                batch.append(path)
+                # 다른 하드 링크가 남아 있으면 용량은 그대로
+                if st.st_nlink == 1: freed += st.st_size
+            except OSError as e:
+                failed.append((path, str(e)))
+            if len(batch) >= self.BATCH_SIZE or i == total:
+                if batch: self.deleted.emit(batch)
+                batch = []
+                self.progress.emit(i, total)
+        self.finished_report.emit(failed, freed)
+
 
 class DuplicateFileWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.folders = []
+        self.worker = None
+        self.link_worker = None
+        self.delete_worker = None
+        self.prune_worker = None
+        self.hash_index = None # 처음 검사할 때 열기
         self.init_ui()
 
     def init_ui(self):
@@ -46,6 +147,19 @@ class DuplicateFileWidget(QWidget):
         f_layout.addLayout(btn_f_layout)
         layout.addWidget(folder_group)
 
+        # [NEW] 해시 색인 (바뀌지 않은 파일은 다시 읽지 않음)
+        index_layout = QHBoxLayout()
+        self.chk_index = QCheckBox("해시 색인 사용 (변경 없는 파일은 재검사 생략)")
+        self.chk_index.setChecked(True)
+        self.chk_index.setStyleSheet("QCheckBox { color: #00fa9a; font-weight: bold; }")
+        index_layout.addWidget(self.chk_index)
+        index_layout.addStretch()
+        self.btn_prune = QPushButton("🧹 색인 정리 (없는 파일 제거)")
+        self.btn_prune.setStyleSheet("background-color: #3d3d3d; color: white; padding: 5px; border-radius: 3px;")
+        self.btn_prune.clicked.connect(self.prune_index)
+        index_layout.addWidget(self.btn_prune)
+        layout.addLayout(index_layout)
+
         # 2. 실행 버튼
         self.btn_scan = QPushButton("🔍 내용 중복 검사 시작 (시간이 걸릴 수 있음)")
         self.btn_scan.setFixedHeight(45)
@@ -53,16 +167,82 @@ class DuplicateFileWidget(QWidget):
         self.btn_scan.clicked.connect(self.scan_duplicates)
         layout.addWidget(self.btn_scan)
 
-        # 3. 결과 트리
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["파일 정보", "경로", "삭제"])
-        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        # [NEW] 진행 상황
+        self.lbl_progress = QLabel("")
+        self.lbl_progress.setStyleSheet("color: #aaa;")
+        layout.addWidget(self.lbl_progress)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("""
+            QProgressBar { border: 1px solid #555; border-radius: 5px; text-align: center; background-color: #3d3d3d; color: white; }
+            QProgressBar::chunk { background-color: #0078D7; }
+        """)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
+        # 3. 결과 트리 [수정] 모델/뷰 + 델리게이트 (그룹이 수만 개여도 보이는 행만 그림)
+        self.model = DuplicateResultModel(self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setSortingEnabled(True)
+        self.tree.setMouseTracking(True)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
         self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.tree.header().setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
-        self.tree.setColumnWidth(2, 80)
-        self.tree.setStyleSheet("QTreeWidget { background-color: #1e1e1e; color: #ddd; border: 1px solid #444; }")
+        self.tree.header().setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
+        self.tree.header().setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
+        self.tree.setColumnWidth(0, 280)
+        self.tree.setColumnWidth(2, 90)
+        self.tree.setColumnWidth(3, 60)
+        self.tree.setColumnWidth(4, 80)
+        self.tree.setStyleSheet("QTreeView { background-color: #1e1e1e; color: #ddd; border: 1px solid #444; }")
+
+        # 삭제 버튼은 파일 행에만
+        self.delete_delegate = DeleteButtonDelegate(self.tree, text="삭제", width=60, filled=True,
+                                                    enabled_for=lambda idx: not self.model.is_group_index(idx))
+        self.delete_delegate.delete_clicked.connect(self.on_delete_clicked)
+        self.tree.setItemDelegateForColumn(DuplicateResultModel.COL_DELETE, self.delete_delegate)
         layout.addWidget(self.tree)
 
+        # [NEW] 선택 규칙 + 일괄 삭제 (체크된 파일이 삭제/교체 대상)
+        select_layout = QHBoxLayout()
+        self.combo_rule = QComboBox()
+        self.combo_rule.addItem("가장 오래된 파일 남기기", DuplicateResultModel.RULE_KEEP_OLDEST)
+        self.combo_rule.addItem("가장 최근 파일 남기기", DuplicateResultModel.RULE_KEEP_NEWEST)
+        self.combo_rule.addItem("경로가 가장 짧은 파일 남기기", DuplicateResultModel.RULE_KEEP_SHORTEST)
+        self.combo_rule.addItem("각 그룹 첫 파일 남기기", DuplicateResultModel.RULE_KEEP_FIRST)
+        self.combo_rule.setStyleSheet("background-color: #3d3d3d; color: white; padding: 5px;")
+        btn_apply_rule = QPushButton("✔ 규칙대로 선택")
+        btn_apply_rule.clicked.connect(lambda: self.model.apply_rule(self.combo_rule.currentData()))
+        btn_clear_checks = QPushButton("선택 해제")
+        btn_clear_checks.clicked.connect(self.model.clear_checks)
+        for btn in [btn_apply_rule, btn_clear_checks]:
+            btn.setStyleSheet("background-color: #3d3d3d; color: white; padding: 5px; border-radius: 3px;")
+        self.btn_bulk_delete = QPushButton("🗑️ 선택 항목 일괄 삭제")
+        self.btn_bulk_delete.setStyleSheet("background-color: #c0392b; color: white; padding: 6px; border-radius: 3px; font-weight: bold;")
+        self.btn_bulk_delete.clicked.connect(self.delete_checked)
+        self.btn_bulk_delete.setEnabled(False)
+        select_layout.addWidget(self.combo_rule)
+        select_layout.addWidget(btn_apply_rule)
+        select_layout.addWidget(btn_clear_checks)
+        select_layout.addStretch()
+        select_layout.addWidget(self.btn_bulk_delete)
+        layout.addLayout(select_layout)
+
+        # [NEW] 삭제 대신 링크로 교체 (체크된 파일을, 체크 안 된 파일의 링크로)
+        link_layout = QHBoxLayout()
+        self.combo_link_mode = QComboBox()
+        self.combo_link_mode.addItem("하드 링크", MODE_HARDLINK)
+        self.combo_link_mode.addItem("reflink 복사 (btrfs/XFS)", MODE_REFLINK)
+        self.combo_link_mode.setStyleSheet("background-color: #3d3d3d; color: white; padding: 5px;")
+        self.btn_link = QPushButton("🔗 선택 항목을 링크로 교체 (미리보기 후 실행)")
+        self.btn_link.setStyleSheet("background-color: #8e44ad; color: white; padding: 6px; border-radius: 3px; font-weight: bold;")
+        self.btn_link.clicked.connect(self.replace_with_links)
+        self.btn_link.setEnabled(False)
+        link_layout.addWidget(self.combo_link_mode)
+        link_layout.addWidget(self.btn_link, 1)
+        layout.addLayout(link_layout)
+
     def add_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "폴더 선택")
         if folder and folder not in self.folders:
@@ -72,95 +252,213 @@ class DuplicateFileWidget(QWidget):
     def clear_folders(self):
         self.folders = []
         self.list_folders.clear()
-        self.tree.clear()
-
-    def get_file_hash(self, path):
-        # 파일 내용을 읽어서 MD5 해시 생성 (내용이 같으면 해시값도 같음)
-        h = hashlib.md5()
-        try:
-            with open(path, "rb") as f:
-                # 큰 파일 대비 청크 단위 읽기
-                for chunk in iter(lambda: f.read(4096), b""):
-                    h.update(chunk)
-            return h.hexdigest()
-        except: return None
+        self.model.clear()
 
     def scan_duplicates(self):
+        # 검사 중에 다시 누르면 취소
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.btn_scan.setText("취소 중...")
+            self.btn_scan.setEnabled(False)
+            return
+
         if not self.folders:
             CustomMessageBox("알림", "폴더를 추가해주세요.", parent=self).exec()
             return
 
-        self.tree.clear()
-        self.btn_scan.setText("검사 중...")
-        self.btn_scan.setEnabled(False)
-        QApplication.processEvents() # UI 갱신
-
-        # 1차: 크기 비교 (크기가 다르면 내용도 다름 -> 속도 최적화)
-        size_map = {}
-        for folder in self.folders:
-            for root, _, files in os.walk(folder):
-                for f in files:
-                    path = os.path.join(root, f)
-                    try:
-                        sz = os.path.getsize(path)
-                        if sz not in size_map: size_map[sz] = []
-                        size_map[sz].append(path)
-                    except: pass
-        
-        # 2차: 해시 비교 (크기가 같은 애들끼리만 진짜 내용 비교)
-        hash_map = {}
-        for size, paths in size_map.items():
-            if len(paths) < 2: continue # 중복 가능성 없음
-            
-            for path in paths:
-                h = self.get_file_hash(path)
-                if h:
-                    if h not in hash_map: hash_map[h] = []
-                    hash_map[h].append(path)
-
-        # 결과 표시
-        count = 0
-        for h, paths in hash_map.items():
-            if len(paths) > 1:
-                count += 1
-                # 그룹 헤더 (크기 정보 표시)
-                size_str = f"{os.path.getsize(paths[0]) / 1024:.1f} KB"
-                root_item = QTreeWidgetItem(self.tree)
-                root_item.setText(0, f"중복 그룹 #{count} (크기: {size_str})")
-                root_item.setExpanded(True)
-                
-                for p in paths:
-                    child = QTreeWidgetItem(root_item)
-                    child.setText(0, os.path.basename(p))
-                    child.setText(1, p)
-                    
-                    # 삭제 버튼
-                    btn_del = QPushButton("삭제")
-                    btn_del.setCursor(Qt.CursorShape.PointingHandCursor)
-                    btn_del.setStyleSheet("background-color: #c0392b; color: white; border: none; border-radius: 3px;")
-                    btn_del.clicked.connect(lambda _, fp=p, it=child: self.delete_file(fp, it))
-                    
-                    self.tree.setItemWidget(child, 2, btn_del)
+        if self.is_busy(): return
+        self.model.clear()
+        self.set_result_actions_enabled(False)
+        self.btn_scan.setText("⏹ 검사 취소")
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
 
+        index = self.get_hash_index() if self.chk_index.isChecked() else None
+        self.worker = DuplicateScanWorker(self.folders, index=index)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished_groups.connect(self.on_scan_finished)
+        self.worker.start()
+
+    def on_progress(self, stage, done, total):
+        stage_names = {"walk": "1/3 파일 목록 수집", "sample": "2/3 앞/뒤 샘플 비교", "hash": "3/3 전체 내용 비교", "link": "링크 교체", "delete": "삭제", "prune": "색인 정리"}
+        if total > 0:
+            self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(done)
+            self.lbl_progress.setText(f"{stage_names.get(stage, stage)}: {done:,} / {total:,}")
+        else:
+            self.progress_bar.setMaximum(0) # 전체 개수를 모를 때는 흐르는 막대
+            self.lbl_progress.setText(f"{stage_names.get(stage, stage)}: {done:,}개")
+
+    def on_scan_finished(self, groups, cancelled):
+        self.progress_bar.hide()
         self.btn_scan.setEnabled(True)
         self.btn_scan.setText("🔍 내용 중복 검사 시작")
-        
-        if count == 0:
+
+        if cancelled:
+            self.lbl_progress.setText("검사가 취소되었습니다.")
+            return
+        stats = self.worker.finder.stats
+        text = f"파일 {stats.get('files', 0):,}개 검사, {stats.get('elapsed', 0):.1f}초"
+        if self.worker.finder.index is not None:
+            text += f" (색인 재사용 {stats.get('index_hits', 0):,}개, 새로 해시 {stats.get('hash_candidates', 0):,}개)"
+        if stats.get('hardlinks'):
+            text += f", 하드 링크 {stats['hardlinks']:,}개는 같은 파일로 처리"
+        self.lbl_progress.setText(text)
+
+        # 결과 표시 (모델에 한 번에 넘기고, 뷰는 보이는 행만 그림)
+        self.model.set_groups(groups)
+        self.tree.header().setSortIndicator(DuplicateResultModel.COL_WASTED, Qt.SortOrder.DescendingOrder)
+        if len(groups) <= 200:
+            self.tree.expandAll()
+        self.set_result_actions_enabled(bool(groups))
+
+        if not groups:
             CustomMessageBox("결과", "중복된 파일이 없습니다.", parent=self).exec()
         else:
-            CustomMessageBox("완료", f"총 {count}그룹의 중복 파일을 찾았습니다.", parent=self).exec()
+            CustomMessageBox("완료", f"총 {len(groups):,}그룹의 중복 파일을 찾았습니다.\n(회수 가능: {format_bytes(self.model.total_wasted())})", parent=self).exec()
 
-    def delete_file(self, path, item):
-        msg = CustomMessageBox("삭제 확인", f"이 파일을 영구 삭제하시겠습니까?\n{path}", is_question=True, parent=self)
-        if msg.exec() == 1:
+    def set_result_actions_enabled(self, enabled):
+        self.btn_link.setEnabled(enabled)
+        self.btn_bulk_delete.setEnabled(enabled)
+
+    def is_busy(self):
+        # 파일이나 색인을 바꾸는 작업(링크 교체/삭제/색인 정리)이 진행 중인지
+        return any(w is not None and w.isRunning() for w in (self.link_worker, self.delete_worker, self.prune_worker))
+
+    def replace_with_links(self):
+        # 교체 중에 다시 누르면 취소
+        if self.link_worker and self.link_worker.isRunning():
+            self.link_worker.cancel()
+            self.btn_link.setText("취소 중...")
+            self.btn_link.setEnabled(False)
+            return
+        if self.is_busy(): return
+        # 체크된 파일만 대상, 각 그룹에서 체크 안 된 첫 파일이 원본
+        groups = self.model.groups_for_action()
+        if not groups:
+            CustomMessageBox("알림", "교체할 파일을 체크하거나 선택 규칙을 적용해주세요.\n(그룹마다 원본으로 남길 파일 1개는 체크 해제)", parent=self).exec()
+            return
+        mode = self.combo_link_mode.currentData()
+
+        # 1) 미리보기 (dry-run): 실제로 바꾸지 않고 계획만 보고
+        plan = plan_link_replacement(groups, mode=mode)
+        summary = summarize_plan(plan)
+        lines = [f"교체 가능: {summary['ready']:,}개 ({summary['reclaim_bytes'] / (1024 * 1024):.1f} MB 회수)"]
+        if summary['shared']:
+            lines.append(f"다른 하드 링크가 남아 용량이 줄지 않음: {summary['shared']:,}개")
+        for reason, n in summary['skip_reasons'].items():
+            lines.append(f"건너뜀: {reason} {n:,}개")
+        if summary['ready'] == 0:
+            CustomMessageBox("미리보기", "\n".join(lines), parent=self).exec()
+            return
+        lines.append("\n실행하시겠습니까? (체크하지 않은 파일이 원본으로 남습니다)")
+        if CustomMessageBox("미리보기", "\n".join(lines), is_question=True, parent=self).exec() != 1:
+            return
+
+        # 2) 실행 (백그라운드, 교체 직전에 내용 재확인)
+        self.set_result_actions_enabled(False)
+        self.btn_link.setText("⏹ 링크 교체 취소")
+        self.btn_link.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.link_worker = LinkReplaceWorker(plan, mode)
+        self.link_worker.progress.connect(lambda done, total: self.on_progress("link", done, total))
+        self.link_worker.finished_report.connect(self.on_link_finished)
+        self.link_worker.start()
+
+    def on_link_finished(self, report, cancelled):
+        self.progress_bar.hide()
+        self.btn_link.setText("🔗 선택 항목을 링크로 교체 (미리보기 후 실행)")
+        done = [r for r in report if r['status'] == 'done']
+        failed = [r for r in report if r['status'] != 'done']
+        reclaimed = sum(r['reclaim'] for r in done)
+        text = f"링크 교체 {len(done):,}개 완료, {reclaimed / (1024 * 1024):.1f} MB 회수, 실패/건너뜀 {len(failed):,}개"
+        if cancelled: text += " (취소됨)"
+        self.lbl_progress.setText(text)
+        for r in failed:
+            print(f"Link replace skipped: {r['target']} ({r['reason']})")
+        # 링크로 바뀐 파일은 더 이상 공간을 차지하지 않으므로 결과에서 제외
+        self.model.remove_paths([r['target'] for r in done])
+        self.set_result_actions_enabled(self.model.rowCount() > 0)
+        CustomMessageBox("완료", f"{len(done):,}개 파일을 링크로 교체했습니다.\n실패/건너뜀: {len(failed):,}개", parent=self).exec()
+
+    def get_hash_index(self):
+        if self.hash_index is None:
             try:
-                os.remove(path)
-                # UI 제거
-                parent = item.parent()
-                parent.removeChild(item)
-                # 만약 그룹에 남은게 1개면 그룹 자체도 의미 없으니 제거? (선택사항)
+                self.hash_index = HashIndex()
             except Exception as e:
-                CustomMessageBox("오류", f"삭제 실패: {e}", parent=self).exec()
+                print(f"Hash index disabled: {e}")
+                return None
+        return self.hash_index
+
+    def prune_index(self):
+        # 정리 중에 다시 누르면 취소
+        if self.prune_worker and self.prune_worker.isRunning():
+            self.prune_worker.cancel()
+            self.btn_prune.setText("취소 중...")
+            self.btn_prune.setEnabled(False)
+            return
+        if (self.worker and self.worker.isRunning()) or self.is_busy(): return
+        index = self.get_hash_index()
+        if index is None: return
+
+        self.btn_prune.setText("⏹ 색인 정리 취소")
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.prune_worker = PruneIndexWorker(index)
+        self.prune_worker.progress.connect(lambda done, total: self.on_progress("prune", done, total))
+        self.prune_worker.finished_report.connect(self.on_prune_finished)
+        self.prune_worker.start()
+
+    def on_prune_finished(self, removed, cancelled):
+        self.progress_bar.hide()
+        self.btn_prune.setText("🧹 색인 정리 (없는 파일 제거)")
+        self.btn_prune.setEnabled(True)
+        text = f"색인에서 없는 파일 {removed:,}개를 정리했습니다.\n(남은 항목: {self.hash_index.count():,}개)"
+        if cancelled: text = "정리를 취소했습니다. " + text
+        CustomMessageBox("완료", text, parent=self).exec()
+
+    # [수정] 행 위젯 대신 델리게이트 클릭으로 삭제
+    def on_delete_clicked(self, index):
+        path = self.model.path_for_index(index)
+        if path is None or self.is_busy(): return
+        msg = CustomMessageBox("삭제 확인", f"이 파일을 영구 삭제하시겠습니까?\n{path}", is_question=True, parent=self)
+        if msg.exec() == 1:
+            self.start_delete([path])
+
+    def delete_checked(self):
+        if self.is_busy(): return
+        paths = [p for g in self.model.groups for p in g.paths if p in self.model.checked]
+        if not paths:
+            CustomMessageBox("알림", "삭제할 파일을 체크하거나 선택 규칙을 적용해주세요.", parent=self).exec()
+            return
+        # 그룹 전체가 체크되어 있으면 원본까지 사라지므로 거부
+        full = self.model.fully_checked_groups()
+        if full:
+            CustomMessageBox("경고", f"{len(full):,}개 그룹은 모든 파일이 체크되어 있습니다.\n그룹마다 최소 1개는 남겨주세요.", parent=self).exec()
+            return
+        # 검사에서 찾은 하드 링크가 남는 파일은 지워도 용량이 줄지 않음 (실제 회수량은 삭제 일꾼이 확인)
+        freed = sum(g.size for g in self.model.groups for p in g.paths if p in self.model.checked and p not in g.links)
+        msg = CustomMessageBox("삭제 확인", f"체크된 파일 {len(paths):,}개를 영구 삭제하시겠습니까?\n(회수 예상: {format_bytes(freed)})", is_question=True, parent=self)
+        if msg.exec() == 1:
+            self.start_delete(paths)
+
+    def start_delete(self, paths):
+        self.set_result_actions_enabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.delete_worker = DeleteFilesWorker(paths)
+        # 지운 묶음마다 모델에서 해당 행만 제거 (전체 다시 그리기 없음)
+        self.delete_worker.deleted.connect(self.model.remove_paths)
+        self.delete_worker.progress.connect(lambda done, total: self.on_progress("delete", done, total))
+        self.delete_worker.finished_report.connect(self.on_delete_finished)
+        self.delete_worker.start()
 
-# import 누락 방지
-from PyQt6.QtWidgets import QApplication
\ No newline at end of file
+    def on_delete_finished(self, failed, freed):
+        self.progress_bar.hide()
+        self.set_result_actions_enabled(self.model.rowCount() > 0)
+        self.lbl_progress.setText(f"{format_bytes(freed)} 회수 · 남은 중복 그룹 {self.model.rowCount():,}개 (회수 가능: {format_bytes(self.model.total_wasted())})")
+        if failed:
+            for path, err in failed:
+                print(f"Delete failed: {path} ({err})")
+            CustomMessageBox("오류", f"{len(failed):,}개 파일 삭제 실패\n{failed[0][0]}: {failed[0][1]}", parent=self).exec()
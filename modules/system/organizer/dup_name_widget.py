@@ -1,15 +1,84 @@
 import os
-import difflib # 문자열 비교용 라이브러리
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QListWidget, QTreeWidget, QTreeWidgetItem, 
-                             QFileDialog, QHeaderView, QLineEdit, QGroupBox, QApplication)
-from PyQt6.QtCore import Qt
+                             QFileDialog, QHeaderView, QLineEdit, QGroupBox, QProgressBar)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtGui import QColor
 from ...ui.custom_msg import CustomMessageBox
+from ...ui.thread_keeper import retire_thread
+from .name_patterns import PatternMiner, rank_patterns
+from .name_index import NameIndex
+from ..file_manager.worker import BatchRenameWorker
+from ..file_manager.rename_dialog import ask_incomplete_rename, describe_rename_report
+from ..file_manager.batch_rename import latest_journal
+
+# [NEW] 패턴 분석 일꾼 (폴더 탐색 + 색인 + 패턴 추출을 백그라운드에서)
+class PatternScanWorker(QThread):
+    progress = pyqtSignal(str, int, int)   # (단계, 완료, 전체)
+    batch_ready = pyqtSignal(list)         # [(패턴, 파일 수)] - 파일 수가 많은 순으로 나눠서 전달
+    finished_scan = pyqtSignal(int, bool)  # (패턴 수, 취소 여부)
+    BATCH_SIZE = 100
+
+    def __init__(self, folders, index=None, limit=None):
+        super().__init__()
+        self.folders = list(folders)
+        self.index = index # 주어지면 폴더 탐색 생략 (이름 변경 후 다시 분석할 때)
+        self.limit = limit
+        self.miner = None
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+        if self.miner is not None:
+            self.miner.cancel()
+
+    def run(self):
+        if self.index is None:
+            index = self.build_index()
+            if self._cancelled:
+                self.finished_scan.emit(0, True)
+                return
+            self.index = index
+
+        self.miner = PatternMiner(self.index.all_names(),
+                                  progress=lambda done, total: self.progress.emit("mine", done, total))
+        if self._cancelled: self.miner.cancel()
+        results = self.miner.run()
+        if self.miner.cancelled:
+            self.finished_scan.emit(0, True)
+            return
+
+        patterns = rank_patterns(results, limit=self.limit)
+        for i in range(0, len(patterns), self.BATCH_SIZE):
+            if self._cancelled: break
+            self.batch_ready.emit(patterns[i:i + self.BATCH_SIZE])
+            self.msleep(10) # GUI 가 묶음을 그릴 틈을 줌
+        self.finished_scan.emit(len(patterns), self._cancelled)
+
+    def build_index(self):
+        index = NameIndex()
+        count = 0
+        for folder in self.folders:
+            for root, _, files in os.walk(folder):
+                if self._cancelled: return index
+                for f in files:
+                    index.add(os.path.join(root, f), f)
+                count += len(files)
+                self.progress.emit("walk", count, 0)
+        return index
 
 class DuplicateNameWidget(QWidget):
+    MAX_PATTERNS = 1000 # 트리에 보여줄 최대 패턴 수 (파일 수가 많은 순)
+    CHILD_BATCH = 500   # 패턴을 펼칠 때 한 번에 만드는 파일 행 수 (나머지는 '더 보기')
+    MORE_ROLE = Qt.ItemDataRole.UserRole + 1  # '더 보기' 행에 남은 (이름, 경로) 목록
+
     def __init__(self):
         super().__init__()
         self.folders = []
+        self.index = None # [NEW] 수집한 파일명 색인 (패턴 클릭/일괄 변경 시 디스크 재탐색 없음)
+        self.worker = None
+        self.rename_worker = None
+        self.result_count = 0
         self.init_ui()
 
     def init_ui(self):
@@ -54,11 +123,26 @@ class DuplicateNameWidget(QWidget):
         self.btn_scan.clicked.connect(self.scan_duplicates)
         layout.addWidget(self.btn_scan)
 
+        # [NEW] 진행 상황
+        self.lbl_progress = QLabel("")
+        self.lbl_progress.setStyleSheet("color: #aaa;")
+        layout.addWidget(self.lbl_progress)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("""
+            QProgressBar { border: 1px solid #555; border-radius: 5px; text-align: center; background-color: #3d3d3d; color: white; }
+            QProgressBar::chunk { background-color: #0078D7; }
+        """)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
         # 3. 결과 트리
         self.tree = QTreeWidget()
         self.tree.setHeaderLabels(["공통된 문자열 / 파일명", "경로"])
-        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        # [수정] 결과가 계속 추가되므로 내용 맞춤(ResizeToContents) 대신 고정 폭 (행마다 전체 재계산 방지)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
         self.tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.tree.setColumnWidth(0, 360)
+        self.tree.setUniformRowHeights(True)
         self.tree.setStyleSheet("""
             QTreeWidget { background-color: #1e1e1e; color: #ddd; border: 1px solid #444; } 
             QHeaderView::section { background-color: #333; color: white; }
@@ -66,6 +150,8 @@ class DuplicateNameWidget(QWidget):
         """)
         # [NEW] 아이템 클릭 시 입력창에 텍스트 넣기 연결
         self.tree.itemClicked.connect(self.on_item_clicked)
+        # [NEW] 패턴을 펼칠 때 색인에서 파일 목록 채우기
+        self.tree.itemExpanded.connect(self.on_item_expanded)
         layout.addWidget(self.tree)
 
         # 4. 일괄 변경 도구
@@ -81,15 +167,20 @@ class DuplicateNameWidget(QWidget):
         for inp in [self.input_find, self.input_replace]:
             inp.setStyleSheet("background-color: #3d3d3d; color: white; border: 1px solid #555; padding: 5px;")
         
-        btn_rename = QPushButton("✏️ 변경 실행")
-        btn_rename.setStyleSheet("background-color: #e67e22; color: white; padding: 5px 15px; border-radius: 3px; font-weight: bold;")
-        btn_rename.clicked.connect(self.run_rename)
+        self.btn_rename = QPushButton("✏️ 변경 실행")
+        self.btn_rename.setStyleSheet("background-color: #e67e22; color: white; padding: 5px 15px; border-radius: 3px; font-weight: bold;")
+        self.btn_rename.clicked.connect(self.run_rename)
+        # [NEW] 마지막 일괄 변경 되돌리기 (기록 파일 기준)
+        self.btn_undo = QPushButton("↩️ 되돌리기")
+        self.btn_undo.setStyleSheet("background-color: #555; color: white; padding: 5px 10px; border-radius: 3px;")
+        self.btn_undo.clicked.connect(self.undo_rename)
 
         r_layout.addWidget(QLabel("찾기:"))
         r_layout.addWidget(self.input_find)
         r_layout.addWidget(QLabel("바꾸기:"))
         r_layout.addWidget(self.input_replace)
-        r_layout.addWidget(btn_rename)
+        r_layout.addWidget(self.btn_rename)
+        r_layout.addWidget(self.btn_undo)
         
         layout.addWidget(rename_group)
 
@@ -100,92 +191,143 @@ class DuplicateNameWidget(QWidget):
             self.list_folders.addItem(folder)
 
     def clear_folders(self):
+        # 돌던 분석은 취소하고 결과는 버림 (지운 폴더의 색인이 다시 들어오지 않도록 일꾼을 떼어냄)
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            retire_thread(self.worker)
+            self.progress_bar.hide()
+            self.lbl_progress.setText("")
+            self.btn_scan.setEnabled(True)
+            self.btn_scan.setText("🔍 공통 문자열 패턴 분석 시작")
+        self.worker = None
         self.folders = []
         self.list_folders.clear()
         self.tree.clear()
+        self.index = None
 
     # [NEW] 트리 아이템 클릭 시 '찾을 문자'에 자동 입력
     def on_item_clicked(self, item, column):
+        # '더 보기' 행이면 다음 묶음을 채움
+        rest = item.data(0, self.MORE_ROLE)
+        if rest is not None:
+            parent = item.parent()
+            parent.removeChild(item)
+            self.add_file_children(parent, rest)
+            return
         # 최상위 아이템(패턴)인 경우에만
-        if item.childCount() > 0:
-            # "패턴 (N개)" 형식에서 패턴만 추출
-            text = item.text(0)
-            if " (" in text and text.endswith("개)"):
-                pattern = text.rsplit(" (", 1)[0] # 뒤에서부터 첫번째 ' (' 로 자름
+        if item.parent() is None:
+            # [수정] 저장해 둔 원본 패턴 사용 (앞뒤 공백도 그대로 유지)
+            pattern = item.data(0, Qt.ItemDataRole.UserRole)
+            if pattern:
                 self.input_find.setText(pattern)
 
     def scan_duplicates(self):
+        # 분석 중에 다시 누르면 취소
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.btn_scan.setText("취소 중...")
+            self.btn_scan.setEnabled(False)
+            return
+
         if not self.folders:
             CustomMessageBox("알림", "검사할 폴더를 최소 하나 이상 추가해주세요.", parent=self).exec()
             return
 
+        # 1. 모든 파일 수집 -> [수정] 백그라운드에서 파일명 색인으로
+        self.index = None
+        self.start_scan(index=None)
+
+    def show_patterns(self):
+        # 색인에 있는 이름으로 패턴 분석만 다시 (디스크는 다시 읽지 않음)
+        if self.index is None or (self.worker and self.worker.isRunning()): return
+        self.start_scan(index=self.index)
+
+    def start_scan(self, index):
         self.tree.clear()
-        self.btn_scan.setText("분석 중... (시간이 걸릴 수 있습니다)")
-        self.btn_scan.setEnabled(False)
-        QApplication.processEvents()
+        self.result_count = 0
+        self.btn_scan.setText("⏹ 분석 취소")
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
 
-        # 1. 모든 파일 수집
-        all_files = []
-        for folder in self.folders:
-            for root, _, files in os.walk(folder):
-                for f in files:
-                    all_files.append((f, os.path.join(root, f)))
+        # 2. [수정] 인접한 이름끼리만 비교하던 방식 대신, 전체 이름에서 공통 문자열을 한 번에 추출
+        # (정렬해도 붙지 않는 패턴까지 찾고, 파일 수도 정확히 셈). 결과는 파일 수가 많은 순으로 나눠서 도착
+        self.worker = PatternScanWorker(self.folders, index=index, limit=self.MAX_PATTERNS)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.batch_ready.connect(self.on_patterns_ready)
+        self.worker.finished_scan.connect(self.on_scan_finished)
+        self.worker.start()
 
-        # 2. 이름순 정렬 (비슷한 이름끼리 붙여놓기 위해)
-        all_files.sort(key=lambda x: x[0])
+    def on_progress(self, stage, done, total):
+        if stage != "rename" and self.sender() is not self.worker: return
+        stage_names = {"walk": "1/2 파일 목록 수집", "mine": "2/2 공통 문자열 분석", "rename": "이름 변경"}
+        if total > 0:
+            self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(done)
+            self.lbl_progress.setText(f"{stage_names.get(stage, stage)}: {done:,} / {total:,}")
+        else:
+            self.progress_bar.setMaximum(0) # 전체 개수를 모를 때는 흐르는 막대
+            self.lbl_progress.setText(f"{stage_names.get(stage, stage)}: {done:,}개")
 
-        # 3. 인접한 파일끼리 비교하여 공통 패턴 추출
-        patterns = set()
-        
-        # 파일이 너무 많으면 오래 걸리므로 최대 비교 갯수 제한 등은 나중에 고려
-        for i in range(len(all_files) - 1):
-            name1 = all_files[i][0]
-            name2 = all_files[i+1][0]
-            
-            # 두 문자열의 공통 부분 찾기 (SequenceMatcher)
-            match = difflib.SequenceMatcher(None, name1, name2).find_longest_match(0, len(name1), 0, len(name2))
-            
-            if match.size > 5: # 최소 5글자 이상 겹쳐야 의미 있는 패턴으로 간주
-                substr = name1[match.a : match.a + match.size].strip()
-                # 너무 흔한 숫자나 확장자만 있는 경우는 제외
-                if substr and substr not in [".mp4", ".jpg", ".png", ".avi", ".mkv"]:
-                    patterns.add(substr)
-
-        # 4. 추출된 패턴이 실제로 몇 개의 파일에 포함되는지 카운트
-        # (패턴이 긴 순서대로 정렬하여 보여줌)
-        sorted_patterns = sorted(list(patterns), key=len, reverse=True)
-        
-        result_count = 0
-        
-        for pat in sorted_patterns:
-            # 이미 처리된 파일은 제외하거나, 중복 허용? 일단 중복 허용
-            matched_files = []
-            for fname, fpath in all_files:
-                if pat in fname:
-                    matched_files.append((fname, fpath))
-            
-            # 2개 이상 파일에 포함된 패턴만 표시
-            if len(matched_files) > 1:
-                result_count += 1
-                root_item = QTreeWidgetItem(self.tree)
-                root_item.setText(0, f"{pat} ({len(matched_files)}개)")
-                root_item.setExpanded(False) # 접어둠 (깔끔하게)
-                # 데이터에 패턴 저장
-                root_item.setData(0, Qt.ItemDataRole.UserRole, pat)
-
-                for fname, fpath in matched_files:
-                    child = QTreeWidgetItem(root_item)
-                    child.setText(0, fname)
-                    child.setText(1, fpath)
-                    child.setData(1, Qt.ItemDataRole.UserRole, fpath)
+    def on_patterns_ready(self, patterns):
+        if self.sender() is not self.worker: return
+        # 3. 패턴별 파일 목록은 펼칠 때 색인에서 채움
+        items = []
+        for pat, count in patterns:
+            root_item = QTreeWidgetItem()
+            root_item.setText(0, f"{pat} ({count}개)")
+            root_item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            # 데이터에 패턴 저장
+            root_item.setData(0, Qt.ItemDataRole.UserRole, pat)
+            items.append(root_item)
+        self.tree.addTopLevelItems(items)
+        self.result_count += len(items)
+        self.lbl_progress.setText(f"패턴 {self.result_count:,}개 표시 중...")
 
+    def on_scan_finished(self, count, cancelled):
+        if self.sender() is not self.worker: return
+        self.progress_bar.hide()
         self.btn_scan.setEnabled(True)
         self.btn_scan.setText("🔍 공통 문자열 패턴 분석 시작")
+        # 색인은 일꾼이 만든 것을 넘겨받음 (탐색을 끝까지 했으면 분석이 취소돼도 사용 가능)
+        if self.worker.index is not None:
+            self.index = self.worker.index
+
+        if cancelled:
+            self.lbl_progress.setText(f"분석이 취소되었습니다. (표시된 패턴 {self.result_count:,}개)")
+            return
+        stats = self.worker.miner.stats if self.worker.miner else {}
+        self.lbl_progress.setText(f"파일 {len(self.index) if self.index else 0:,}개, 패턴 {count:,}개 ({stats.get('elapsed', 0):.1f}초)")
 
-        if result_count == 0:
+        if count == 0:
             CustomMessageBox("결과", "반복되는 문자열 패턴을 찾지 못했습니다.", parent=self).exec()
         else:
-            CustomMessageBox("완료", f"총 {result_count}개의 공통 패턴을 발견했습니다.\n목록을 클릭하면 '찾을 문자'에 입력됩니다.", parent=self).exec()
+            CustomMessageBox("완료", f"총 {count}개의 공통 패턴을 발견했습니다.\n목록을 클릭하면 '찾을 문자'에 입력됩니다.", parent=self).exec()
+
+    def on_item_expanded(self, item):
+        if item.parent() is not None or item.childCount() > 0 or self.index is None: return
+        pattern = item.data(0, Qt.ItemDataRole.UserRole)
+        self.add_file_children(item, self.index.files_containing(pattern))
+
+    def add_file_children(self, item, files):
+        # 수십만 개를 한 번에 만들면 화면이 멈추므로 CHILD_BATCH 개씩, 남으면 '더 보기' 행
+        children = []
+        for fname, fpath in files[:self.CHILD_BATCH]:
+            child = QTreeWidgetItem()
+            child.setText(0, fname)
+            child.setText(1, fpath)
+            child.setData(1, Qt.ItemDataRole.UserRole, fpath)
+            children.append(child)
+        rest = files[self.CHILD_BATCH:]
+        if rest:
+            more = QTreeWidgetItem()
+            more.setText(0, f"… {len(rest):,}개 더 보기 (클릭)")
+            more.setForeground(0, QColor("#888"))
+            more.setData(0, self.MORE_ROLE, rest)
+            children.append(more)
+        item.addChildren(children)
+
+    def is_busy(self):
+        return any(w is not None and w.isRunning() for w in (self.worker, self.rename_worker))
 
     def run_rename(self):
         target = self.input_find.text()
@@ -194,26 +336,64 @@ class DuplicateNameWidget(QWidget):
             CustomMessageBox("알림", "찾을 문자를 입력해주세요.", parent=self).exec()
             return
 
-        count = 0
-        # 현재 트리에 보이는 항목들이 아니라, 전체 파일 대상으로 변경 시도
-        # (혹은 트리에 있는 것만? 사용자는 '전체'를 기대할 것임)
-        
-        # 안전하게 다시 스캔하며 변경
-        for folder in self.folders:
-            for root, _, files in os.walk(folder):
-                for filename in files:
-                    if target in filename:
-                        old_path = os.path.join(root, filename)
-                        new_filename = filename.replace(target, replace)
-                        new_path = os.path.join(root, new_filename)
-                        
-                        try:
-                            # 이미 같은 이름이 있으면 스킵
-                            if not os.path.exists(new_path):
-                                os.rename(old_path, new_path)
-                                count += 1
-                        except: pass
-        
-        CustomMessageBox("완료", f"총 {count}개의 파일 이름을 변경했습니다.", parent=self).exec()
-        # 변경 후 목록 새로고침
-        self.scan_duplicates()
\ No newline at end of file
+        if self.is_busy(): return
+        if self.index is None:
+            CustomMessageBox("알림", "먼저 패턴 분석을 실행해주세요.", parent=self).exec()
+            return
+
+        # [NEW] 중단된 작업 먼저 처리
+        pending = ask_incomplete_rename(self)
+        if pending:
+            journal, undo = pending
+            self.start_rename(BatchRenameWorker(journal=journal, undo=undo), undo)
+            return
+
+        # [수정] 폴더를 다시 훑지 않고 색인에서 대상 파일을 바로 찾음
+        # 바로 바꾸지 않고 계획 -> 기록 -> 백그라운드 실행 (충돌/순환 확인, 되돌리기 가능)
+        pairs = [(old_path, os.path.join(os.path.dirname(old_path), filename.replace(target, replace)))
+                 for filename, old_path in self.index.files_containing(target)]
+        if not pairs:
+            CustomMessageBox("알림", "조건에 맞는 파일이 없습니다.", parent=self).exec()
+            return
+        label = f"'{target}' -> '{replace}' ({len(pairs)}개)"
+        self.start_rename(BatchRenameWorker(pairs, label=label), False)
+
+    def undo_rename(self):
+        if self.is_busy(): return
+        journal = latest_journal()
+        if journal is None:
+            CustomMessageBox("알림", "되돌릴 변경 기록이 없습니다.", parent=self).exec()
+            return
+        text = f"마지막 변경을 되돌리시겠습니까?\n{journal.label} ({len(journal.done):,}개)"
+        if CustomMessageBox("되돌리기", text, is_question=True, parent=self).exec() != 1: return
+        self.start_rename(BatchRenameWorker(journal=journal, undo=True), True)
+
+    def start_rename(self, worker, undo):
+        self.btn_rename.setEnabled(False)
+        self.btn_undo.setEnabled(False)
+        self.btn_scan.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.lbl_progress.setText("되돌리는 중..." if undo else "이름 변경 중...")
+
+        self.rename_worker = worker
+        self.rename_worker.progress.connect(lambda done, total: self.on_progress("rename", done, total))
+        self.rename_worker.finished_report.connect(lambda report: self.on_rename_finished(report, undo))
+        self.rename_worker.start()
+
+    def on_rename_finished(self, report, undo):
+        self.progress_bar.hide()
+        self.btn_rename.setEnabled(True)
+        self.btn_undo.setEnabled(True)
+        self.btn_scan.setEnabled(True)
+
+        # 바뀐 이름만 색인에 반영
+        if self.index is not None:
+            for old_path, new_path in report['renamed']:
+                self.index.rename(old_path, new_path)
+
+        text = describe_rename_report(report, undo)
+        self.lbl_progress.setText(text)
+        CustomMessageBox("완료", text, parent=self).exec()
+        # 변경 후 목록 새로고침 (갱신된 색인으로)
+        self.show_patterns()
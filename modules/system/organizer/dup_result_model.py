@@ -0,0 +1,278 @@
+import os
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+# ==========================================
+# [1] 그룹 저장소
+# ==========================================
+class DupGroup:
+    __slots__ = ('pos', 'size', 'digest', 'paths', 'mtimes', 'links')
+
+    def __init__(self, data):
+        self.pos = 0
+        self.size = data['size']
+        self.digest = data['digest']
+        self.paths = list(data['paths'])
+        self.mtimes = list(data.get('mtimes') or [0] * len(self.paths))
+        self.links = data.get('hardlinks', {})
+
+    @property
+    def wasted(self):
+        # 하나만 남기면 회수되는 용량
+        return self.size * (len(self.paths) - 1)
+
+
+def _ranges(rows):
+    # 정렬된 행 번호 -> 연속 구간 [(시작, 끝)]
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+
+def format_bytes(size):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
+
+# ==========================================
+# [2] 모델: 그룹(최상위) -> 파일(자식)
+# ==========================================
+class DuplicateResultModel(QAbstractItemModel):
+    HEADERS = ["파일 정보", "경로", "낭비 용량", "개수", "삭제"]
+    COL_NAME, COL_PATH, COL_WASTED, COL_COUNT, COL_DELETE = range(5)
+
+    # 선택 규칙 (체크 = 삭제/교체 대상)
+    RULE_KEEP_FIRST = "keep_first"
+    RULE_KEEP_OLDEST = "keep_oldest"
+    RULE_KEEP_NEWEST = "keep_newest"
+    RULE_KEEP_SHORTEST = "keep_shortest"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.groups = []
+        self.checked = set()  # 체크된 파일 경로
+        self._group_of = {}   # 경로 -> 소속 그룹 (삭제 결과 반영용)
+
+    # --- 데이터 ---
+    def set_groups(self, groups):
+        self.beginResetModel()
+        self.groups = [DupGroup(g) for g in groups]
+        self._group_of = {p: g for g in self.groups for p in g.paths}
+        self._renumber()
+        self.checked = set()
+        self.endResetModel()
+
+    def clear(self):
+        self.set_groups([])
+
+    def _renumber(self, start=0):
+        for i in range(start, len(self.groups)):
+            self.groups[i].pos = i
+
+    def total_wasted(self):
+        return sum(g.wasted for g in self.groups)
+
+    def is_group_index(self, index):
+        return index.isValid() and index.internalPointer() is None
+
+    def path_for_index(self, index):
+        if not index.isValid() or index.internalPointer() is None: return None
+        return index.internalPointer().paths[index.row()]
+
+    # --- QAbstractItemModel 필수 구현 ---
+    # 그룹 행: internalPointer = None / 파일 행: internalPointer = 소속 그룹
+    def index(self, row, column, parent=QModelIndex()):
+        if not parent.isValid():
+            if 0 <= row < len(self.groups):
+                return self.createIndex(row, column, None)
+            return QModelIndex()
+        if parent.internalPointer() is not None:
+            return QModelIndex()
+        group = self.groups[parent.row()]
+        if 0 <= row < len(group.paths):
+            return self.createIndex(row, column, group)
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid() or index.internalPointer() is None:
+            return QModelIndex()
+        return self.createIndex(index.internalPointer().pos, 0, None)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.groups)
+        if parent.internalPointer() is None and parent.column() == 0:
+            return len(self.groups[parent.row()].paths)
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.internalPointer() is not None and index.column() == self.COL_NAME:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        group = index.internalPointer()
+        column = index.column()
+
+        # 그룹 행
+        if group is None:
+            group = self.groups[index.row()]
+            if role == Qt.ItemDataRole.DisplayRole:
+                if column == self.COL_NAME: return f"중복 그룹 #{index.row() + 1} (크기: {format_bytes(group.size)})"
+                if column == self.COL_WASTED: return format_bytes(group.wasted)
+                if column == self.COL_COUNT: return f"{len(group.paths)}개"
+            elif role == Qt.ItemDataRole.TextAlignmentRole and column in (self.COL_WASTED, self.COL_COUNT):
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            return None
+
+        # 파일 행
+        path = group.paths[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.COL_NAME:
+                links = group.links.get(path)
+                return os.path.basename(path) + (f"  (+하드 링크 {len(links)}개)" if links else "")
+            if column == self.COL_PATH: return path
+            return None
+        if role == Qt.ItemDataRole.CheckStateRole and column == self.COL_NAME:
+            return Qt.CheckState.Checked if path in self.checked else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.ToolTipRole and column == self.COL_NAME:
+            links = group.links.get(path)
+            return "\n".join(links) if links else None
+        if role == Qt.ItemDataRole.UserRole:
+            return path
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or self.path_for_index(index) is None:
+            return False
+        path = self.path_for_index(index)
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self.checked.add(path)
+        else:
+            self.checked.discard(path)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    # --- 정렬: 낭비 용량 / 개수 / 이름 ---
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column == self.COL_DELETE: return
+        reverse = order == Qt.SortOrder.DescendingOrder
+        if column == self.COL_WASTED:
+            key = lambda g: g.wasted
+        elif column == self.COL_COUNT:
+            key = lambda g: (len(g.paths), g.wasted)
+        else:
+            key = lambda g: g.paths[0].lower()
+
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_refs = [(idx.internalPointer(), self.groups[idx.row()] if idx.internalPointer() is None else None,
+                     idx.row(), idx.column()) for idx in old_indexes]
+        self.groups.sort(key=key, reverse=reverse)
+        self._renumber()
+        new_indexes = []
+        for owner, group, row, col in old_refs:
+            if owner is None:
+                new_indexes.append(self.createIndex(group.pos, col, None))
+            else:
+                new_indexes.append(self.createIndex(row, col, owner))
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    # --- 선택 규칙 ---
+    def apply_rule(self, rule):
+        # 그룹마다 하나를 남기고 나머지를 체크
+        self.checked = set()
+        for group in self.groups:
+            items = list(zip(group.paths, group.mtimes))
+            if rule == self.RULE_KEEP_OLDEST:
+                keep = min(items, key=lambda x: x[1])[0]
+            elif rule == self.RULE_KEEP_NEWEST:
+                keep = max(items, key=lambda x: x[1])[0]
+            elif rule == self.RULE_KEEP_SHORTEST:
+                keep = min(group.paths, key=lambda p: (len(p), p))
+            else:
+                keep = group.paths[0]
+            self.checked.update(p for p in group.paths if p != keep)
+        self._emit_all_checks()
+
+    def clear_checks(self):
+        self.checked = set()
+        self._emit_all_checks()
+
+    def _emit_all_checks(self):
+        roles = [Qt.ItemDataRole.CheckStateRole]
+        for group in self.groups:
+            parent = self.createIndex(group.pos, 0, None)
+            self.dataChanged.emit(self.index(0, 0, parent), self.index(len(group.paths) - 1, 0, parent), roles)
+
+    def fully_checked_groups(self):
+        # 전부 체크된 그룹 (하나도 안 남게 되는 위험한 상태)
+        return [g for g in self.groups if all(p in self.checked for p in g.paths)]
+
+    def groups_for_action(self):
+        # 체크 안 된 첫 파일을 원본으로, 체크된 파일을 대상으로 한 그룹 목록 (링크 교체용)
+        result = []
+        for g in self.groups:
+            targets = [p for p in g.paths if p in self.checked]
+            keepers = [p for p in g.paths if p not in self.checked]
+            if targets and keepers:
+                result.append({'size': g.size, 'digest': g.digest, 'paths': [keepers[0]] + targets})
+        return result
+
+    # --- 삭제 결과 반영 (배치) ---
+    def remove_paths(self, paths):
+        # 삭제된 파일 행을 지우고, 1개 이하만 남은 그룹은 그룹째 제거
+        # 묶음 하나에 O(묶음 크기 + 그룹 수): 경로 -> 그룹 조회, 빈 그룹은 연속 구간으로 제거, 번호는 한 번만
+        removed = set(paths)
+        self.checked.difference_update(removed)
+        touched = {}
+        for path in removed:
+            group = self._group_of.pop(path, None)
+            if group is not None:
+                touched[id(group)] = group
+
+        empty_rows = []
+        for group in touched.values():
+            rows = [i for i, p in enumerate(group.paths) if p in removed]
+            if len(group.paths) - len(rows) < 2:
+                empty_rows.append(group.pos)
+                for p in group.paths:
+                    self._group_of.pop(p, None)
+                continue
+            # 파일 행은 그룹 번호가 모두 맞을 때 먼저 제거
+            parent = self.createIndex(group.pos, 0, None)
+            for start, end in reversed(_ranges(rows)):
+                self.beginRemoveRows(parent, start, end)
+                del group.paths[start:end + 1]
+                del group.mtimes[start:end + 1]
+                self.endRemoveRows()
+            self.dataChanged.emit(self.index(group.pos, self.COL_WASTED), self.index(group.pos, self.COL_COUNT))
+
+        if not empty_rows: return
+        # 뒤 구간부터 지우므로, 번호를 다시 매기기 전까지 뒤쪽 그룹의 pos 는 실제보다 크기만 함
+        # (지우는 구간과 겹치지 않으므로 Qt 의 범위 판정은 그대로 맞음)
+        empty_rows.sort()
+        for start, end in reversed(_ranges(empty_rows)):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self.groups[start:end + 1]
+            self.endRemoveRows()
+        self._renumber(empty_rows[0])
@@ -0,0 +1,140 @@
+import os
+import time
+import sqlite3
+import threading
+from modules.app_paths import get_config_path
+
+class HashIndex:
+    """
+    파일 내용 해시 색인 (SQLite)
+    - 키: 경로 + (장치, inode, 크기, 수정 시간) -> 하나라도 바뀌면 다시 해시
+    - 경로가 바뀐(이동/이름 변경) 파일도 같은 (장치, inode) 면 재사용
+    - 스캔하면서 본 파일로 갱신하고, 사라진 파일은 prune_missing 으로 정리
+    """
+    COMMIT_EVERY = 500
+    PRUNE_BATCH = 500      # 정리할 때 이만큼 모아서 한 번에 삭제 / 진행 상황 보고
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_config_path("hash_index.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = 0
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_hash (
+                path TEXT PRIMARY KEY,
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                algo TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_file_hash_inode ON file_hash(dev, ino)")
+        self.conn.commit()
+
+    def lookup(self, path, dev, ino, size, mtime_ns, algo):
+        # 저장된 해시가 지금 파일과 맞으면 반환, 아니면 None
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT dev, ino, size, mtime_ns, algo, digest FROM file_hash WHERE path = ?", (path,)
+            ).fetchone()
+            if row and self._matches(row, dev, ino, size, mtime_ns, algo):
+                self.hits += 1
+                return row[5]
+
+            # 경로로 못 찾으면 inode 로 (이동/이름 변경된 파일). Windows 처럼 ino 가 0이면 생략
+            if ino:
+                row = self.conn.execute(
+                    "SELECT dev, ino, size, mtime_ns, algo, digest FROM file_hash WHERE dev = ? AND ino = ? LIMIT 1",
+                    (dev, ino)
+                ).fetchone()
+                if row and self._matches(row, dev, ino, size, mtime_ns, algo):
+                    self.hits += 1
+                    self._store(path, dev, ino, size, mtime_ns, algo, row[5])
+                    return row[5]
+
+            self.misses += 1
+            return None
+
+    @staticmethod
+    def _matches(row, dev, ino, size, mtime_ns, algo):
+        r_dev, r_ino, r_size, r_mtime, r_algo, _ = row
+        if r_size != size or r_mtime != mtime_ns or r_algo != algo:
+            return False
+        # inode 정보가 있는 쪽끼리만 비교
+        if ino and r_ino and (r_dev != dev or r_ino != ino):
+            return False
+        return True
+
+    def store(self, path, dev, ino, size, mtime_ns, algo, digest):
+        with self._lock:
+            self._store(path, dev, ino, size, mtime_ns, algo, digest)
+
+    def _store(self, path, dev, ino, size, mtime_ns, algo, digest):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO file_hash (path, dev, ino, size, mtime_ns, algo, digest, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, dev, ino, size, mtime_ns, algo, digest, time.time())
+        )
+        self._dirty += 1
+        if self._dirty >= self.COMMIT_EVERY:
+            self.conn.commit()
+            self._dirty = 0
+
+    def prune_missing(self, roots=None, seen_paths=None, progress=None, cancel_event=None):
+        # roots 아래에 있는데 이번 스캔에서 못 본(seen_paths 에 없는) 항목 삭제
+        # seen_paths 가 없으면 파일 존재 여부를 직접 확인 (느린 네트워크 경로가 있으면 오래 걸림 -> 일꾼 스레드에서)
+        # progress(확인한 수, 전체), cancel_event 가 켜지면 거기까지 지운 것만 남기고 멈춤
+        with self._lock:
+            if roots:
+                rows = []
+                for root in roots:
+                    prefix = os.path.join(root, "")
+                    rows += self.conn.execute(
+                        "SELECT path FROM file_hash WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+                    ).fetchall()
+            else:
+                rows = self.conn.execute("SELECT path FROM file_hash").fetchall()
+
+        # 존재 확인은 lock 밖에서, 삭제는 묶음으로
+        removed = 0
+        missing = []
+        total = len(rows)
+        for i, (path,) in enumerate(rows, 1):
+            if cancel_event is not None and cancel_event.is_set(): break
+            if (path not in seen_paths) if seen_paths is not None else not os.path.exists(path):
+                missing.append((path,))
+            if len(missing) >= self.PRUNE_BATCH:
+                removed += self._delete_paths(missing)
+                missing = []
+            if progress and (i % self.PRUNE_BATCH == 0 or i == total):
+                progress(i, total)
+        removed += self._delete_paths(missing)
+        self.flush()
+        return removed
+
+    def _delete_paths(self, rows):
+        if not rows: return 0
+        with self._lock:
+            self.conn.executemany("DELETE FROM file_hash WHERE path = ?", rows)
+        return len(rows)
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM file_hash").fetchone()[0]
+
+    def flush(self):
+        with self._lock:
+            self.conn.commit()
+            self._dirty = 0
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -0,0 +1,107 @@
+import os
+from array import array
+from bisect import bisect_left
+
+GRAM = 3            # 3글자 조각(trigram) 색인
+VERIFY_LIMIT = 256  # 후보가 이 정도로 줄면 교집합 대신 바로 문자열 확인
+MAX_INTERSECT = 3   # 교집합에 쓸 최대 trigram 목록 수
+
+
+class NameIndex:
+    """
+    파일명 trigram 역색인 (메모리)
+    - 같은 이름은 한 번만 색인하고, 이름 -> 경로 목록으로 연결
+    - names_containing(text): text 의 trigram 목록 중 짧은 것부터 교집합 -> 실제 포함 여부 확인
+    - 3글자 미만 검색은 (서로 다른) 이름 전체를 확인
+    - 이름 변경 결과를 rename() 으로 반영하므로 디스크를 다시 훑지 않아도 됨
+    """
+    def __init__(self, files=()):
+        self.names = []      # 이름 번호 -> 이름
+        self.paths = []      # 이름 번호 -> [경로...] (비면 사라진 이름)
+        self.name_ids = {}   # 이름 -> 이름 번호
+        self.postings = {}   # trigram -> array('i') 이름 번호 (오름차순)
+        for name, path in files:
+            self.add(path, name)
+
+    def __len__(self):
+        return sum(len(p) for p in self.paths)
+
+    def add(self, path, name=None):
+        name = name if name is not None else os.path.basename(path)
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.name_ids[name] = name_id
+            self.names.append(name)
+            self.paths.append([])
+            for g in {name[i:i + GRAM] for i in range(len(name) - GRAM + 1)}:
+                posting = self.postings.get(g)
+                if posting is None:
+                    self.postings[g] = posting = array('i')
+                posting.append(name_id)
+        self.paths[name_id].append(path)
+
+    def remove(self, path):
+        # 색인에는 이름 번호가 남지만 경로가 없으면 검색 결과에서 빠짐
+        name_id = self.name_ids.get(os.path.basename(path))
+        if name_id is None: return False
+        try:
+            self.paths[name_id].remove(path)
+            return True
+        except ValueError:
+            return False
+
+    def rename(self, old_path, new_path):
+        self.remove(old_path)
+        self.add(new_path)
+
+    # --- 검색 ---
+    def _candidate_ids(self, text):
+        if len(text) < GRAM:
+            return range(len(self.names))
+        grams = {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+        postings = []
+        for g in grams:
+            posting = self.postings.get(g)
+            if posting is None:
+                return ()
+            postings.append(posting)
+        # 짧은 목록부터 몇 개만 교집합 (나머지는 문자열 확인이 더 쌈)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:MAX_INTERSECT]:
+            if len(candidates) <= VERIFY_LIMIT:
+                break
+            if len(posting) > 16 * len(candidates):
+                # 다음 목록이 훨씬 길면 후보마다 이진 탐색 (목록은 이름 번호 오름차순)
+                n = len(posting)
+                kept = []
+                for name_id in candidates:
+                    i = bisect_left(posting, name_id)
+                    if i < n and posting[i] == name_id:
+                        kept.append(name_id)
+                candidates = kept
+            else:
+                keep = set(candidates)
+                candidates = [name_id for name_id in posting if name_id in keep]
+        return candidates
+
+    def names_containing(self, text):
+        # text 를 포함하는 (이름, [경로...]) 목록
+        result = []
+        for name_id in self._candidate_ids(text):
+            paths = self.paths[name_id]
+            if paths and text in self.names[name_id]:
+                result.append((self.names[name_id], paths))
+        return result
+
+    def files_containing(self, text):
+        # text 를 포함하는 (이름, 경로) 목록
+        return [(name, path) for name, paths in self.names_containing(text) for path in paths]
+
+    def count_containing(self, text):
+        return sum(len(paths) for _, paths in self.names_containing(text))
+
+    def all_names(self):
+        # 파일마다 이름 하나씩 (패턴 분석 입력용)
+        return [name for name, paths in zip(self.names, self.paths) for _ in paths]
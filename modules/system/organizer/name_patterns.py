@@ -0,0 +1,222 @@
+import time
+import threading
+from collections import Counter
+
+MIN_PATTERN_LEN = 6    # 이보다 짧은 공통 문자열은 무시
+MIN_PATTERN_COUNT = 2  # 최소 몇 개 파일에 나와야 패턴으로 볼지
+
+# 확장자만 겹치는 경우는 의미 없으므로 제외
+COMMON_EXTS = {".mp4", ".jpg", ".png", ".avi", ".mkv", ".jpeg", ".gif", ".mp3", ".txt", ".pdf", ".zip"}
+
+MIXED = object()  # 앞 글자가 여러 가지 (또는 이름 맨 앞)
+
+
+class PatternMiner:
+    """
+    여러 파일명에 공통으로 들어 있는 문자열(패턴) 찾기 (GUI 와 무관하게 동작)
+    - 같은 이름은 한 번만 보고 파일 수(가중치)로 계산
+    - 1) 길이 min_len 조각(n-gram)을 세어서 min_count 개 이상 파일에 나온 것만 씨앗으로
+    - 2) 씨앗의 등장 위치 목록을 다음 글자별로 나누며 오른쪽으로 늘림 (접미사 트리 탐색과 같은 방식)
+    - 모든 등장 위치의 바로 앞 글자가 같으면 더 긴 패턴에 포함되므로 그 가지는 통째로 생략
+      -> 긴 공통 문자열의 모든 부분 문자열을 일일이 늘리지 않아서 전체 글자 수에 거의 비례
+    - 결과는 '닫힌' 패턴만: 한 글자 더 붙여도 파일 수가 그대로인 패턴은 긴 쪽만 남김
+    - closed=False 면 조건을 만족하는 모든 부분 문자열을 정확한 개수와 함께 반환
+    """
+    JUMP = 8  # 뒤 글자가 모두 같은 구간은 이만큼씩 한 번에 늘림
+
+    def __init__(self, names, min_len=MIN_PATTERN_LEN, min_count=MIN_PATTERN_COUNT,
+                 closed=True, progress=None):
+        weights = Counter(names)
+        self.names = list(weights)
+        self.weights = [weights[n] for n in self.names]
+        self.min_len = max(1, min_len)
+        self.min_count = max(2, min_count)
+        self.closed = closed
+        self.progress = progress
+        self.cancel_event = threading.Event()
+        self.stats = {}
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _report(self, done, total):
+        if self.progress:
+            self.progress(done, total)
+
+    # --- 1단계: 씨앗 n-gram (이름마다 한 번만 셈) ---
+    def count_seeds(self):
+        n = self.min_len
+        support = Counter()
+        # 조각 -> 앞 글자 (서로 다른 앞 글자가 나오거나 이름 맨 앞이면 MIXED)
+        # 앞 글자가 항상 같은 조각은 더 긴 패턴의 일부일 뿐이라 씨앗에서 제외 -> 위치 목록 메모리 절약
+        left = {}
+        mixed = MIXED
+        for doc, name in enumerate(self.names):
+            if len(name) < n: continue
+            grams = set()
+            for i in range(len(name) - n + 1):
+                g = name[i:i + n]
+                grams.add(g)
+                if not self.closed: continue
+                c = name[i - 1] if i else mixed
+                prev = left.get(g)
+                if prev is None:
+                    left[g] = c
+                elif prev is not mixed and prev != c:
+                    left[g] = mixed
+            w = self.weights[doc]
+            for g in grams:
+                support[g] += w
+            if doc % 20000 == 0:
+                if self.cancelled: return set()
+                self._report(doc, len(self.names))
+        if not self.closed:
+            return {g for g, c in support.items() if c >= self.min_count}
+        return {g for g, c in support.items() if c >= self.min_count and left[g] is mixed}
+
+    def collect_seeds(self, frequent):
+        # 씨앗별 등장 위치 목록 [(이름 번호, 끝 위치)] - 이름 번호 순서로 쌓임
+        n = self.min_len
+        occ = {}
+        for doc, name in enumerate(self.names):
+            for i in range(len(name) - n + 1):
+                g = name[i:i + n]
+                if g in frequent:
+                    occ.setdefault(g, []).append((doc, i + n))
+            if doc % 20000 == 0 and self.cancelled:
+                return {}
+        return occ
+
+    # --- 등장 위치 목록 분석 ---
+    def _support(self, occurrences):
+        # 서로 다른 이름 수 (파일 수 가중치)
+        total = 0
+        last = -1
+        for doc, _ in occurrences:
+            if doc != last:
+                total += self.weights[doc]
+                last = doc
+        return total
+
+    def _left_chars(self, occurrences, length):
+        # 바로 앞 글자 -> 그 글자가 앞에 오는 이름의 파일 수. 이름 맨 앞이면 None
+        by_char = {}
+        seen = set()
+        for doc, end in occurrences:
+            start = end - length
+            c = self.names[doc][start - 1] if start > 0 else None
+            if (doc, c) in seen: continue
+            seen.add((doc, c))
+            by_char[c] = by_char.get(c, 0) + self.weights[doc]
+        return by_char
+
+    def _left_uniform(self, occurrences, length):
+        # 모든 등장 위치의 앞 글자가 같으면 True (그 가지의 패턴은 전부 더 긴 패턴에 포함됨)
+        first = None
+        for doc, end in occurrences:
+            start = end - length
+            if start == 0: return False
+            c = self.names[doc][start - 1]
+            if first is None:
+                first = c
+            elif c != first:
+                return False
+        return True
+
+    def _split_right(self, occurrences):
+        # 다음 글자별로 나눔 (이름 끝에 닿은 위치는 제외). 글자 -> [등장 위치, 파일 수, 마지막 이름 번호]
+        names = self.names
+        weights = self.weights
+        children = {}
+        for doc, end in occurrences:
+            name = names[doc]
+            if end >= len(name): continue
+            child = children.get(name[end])
+            if child is None:
+                children[name[end]] = [[(doc, end + 1)], weights[doc], doc]
+                continue
+            child[0].append((doc, end + 1))
+            if child[2] != doc:
+                child[1] += weights[doc]
+                child[2] = doc
+        return children
+
+    def _common_extension(self, occurrences):
+        # 모든 위치 뒤 JUMP 글자가 같으면 그 문자열 (중간 패턴은 전부 닫히지 않으므로 한 번에 건너뜀)
+        names = self.names
+        jump = self.JUMP
+        common = None
+        for doc, end in occurrences:
+            s = names[doc][end:end + jump]
+            if len(s) < jump or (common is not None and s != common):
+                return None
+            common = s
+        return common
+
+    # --- 2단계: 오른쪽으로 늘리며 탐색 ---
+    def run(self):
+        started = time.perf_counter()
+        frequent = self.count_seeds()
+        if self.cancelled: return []
+        seeds = self.collect_seeds(frequent)
+        if self.cancelled: return []
+        self.stats['names'] = len(self.names)
+        self.stats['seeds'] = len(seeds)
+
+        results = []
+        total = len(seeds)
+        for done, (seed, occurrences) in enumerate(seeds.items(), 1):
+            stack = [(seed, occurrences, self._support(occurrences))]
+            while stack:
+                pattern, occ, support = stack.pop()
+                if self.closed:
+                    common = self._common_extension(occ)
+                    if common is not None:
+                        # 같은 위치 집합 그대로 늘어나므로 앞 글자 조건도 변하지 않음
+                        stack.append((pattern + common, [(d, e + len(common)) for d, e in occ], support))
+                        continue
+                children = self._split_right(occ)
+                right_closed = True
+                for c, (child_occ, child_support, _) in children.items():
+                    if child_support < self.min_count: continue
+                    if child_support == support: right_closed = False
+                    child = pattern + c
+                    if self.closed and self._left_uniform(child_occ, len(child)):
+                        continue
+                    stack.append((child, child_occ, child_support))
+
+                if self.closed:
+                    if not right_closed: continue
+                    left = self._left_chars(occ, len(pattern))
+                    if any(c is not None and n == support for c, n in left.items()): continue
+                results.append((pattern, support))
+
+            if done % 500 == 0:
+                if self.cancelled: return []
+                self._report(done, total)
+
+        self.stats['patterns'] = len(results)
+        self.stats['elapsed'] = time.perf_counter() - started
+        return results
+
+
+def is_meaningful(pattern, min_len=MIN_PATTERN_LEN):
+    # 공백/확장자만 겹치는 패턴은 제외
+    text = pattern.strip()
+    return len(text) >= min_len and text.lower() not in COMMON_EXTS
+
+
+def rank_patterns(results, min_len=MIN_PATTERN_LEN, limit=None):
+    # 의미 없는 패턴 제외 후 파일 수가 많은 순, 같으면 긴 순
+    results = [(p, n) for p, n in results if is_meaningful(p, min_len)]
+    results.sort(key=lambda x: (-x[1], -len(x[0]), x[0]))
+    return results[:limit] if limit else results
+
+
+def mine_patterns(names, min_len=MIN_PATTERN_LEN, min_count=MIN_PATTERN_COUNT, limit=None):
+    miner = PatternMiner(names, min_len=min_len, min_count=min_count)
+    return rank_patterns(miner.run(), min_len, limit)
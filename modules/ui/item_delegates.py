@@ -0,0 +1,54 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """
+    삭제 버튼을 위젯 없이 직접 그리는 델리게이트
+    (행마다 QWidget/QPushButton 을 만들지 않으므로 보이는 행만큼만 비용이 듦)
+    - text/width: 버튼 글자와 너비 ("❌" 아이콘형, "삭제" 버튼형 등)
+    - filled: True 면 항상 빨간 배경, False 면 마우스를 올렸을 때만
+    - enabled_for: 버튼을 그릴 행인지 판단하는 함수 (없으면 모든 행)
+    """
+    delete_clicked = pyqtSignal(object) # QModelIndex
+
+    def __init__(self, parent=None, text="❌", width=20, height=20, filled=False, enabled_for=None):
+        super().__init__(parent)
+        self.text = text
+        self.width = width
+        self.height = height
+        self.filled = filled
+        self.enabled_for = enabled_for
+
+    def _button_rect(self, rect):
+        dx = max(0, (rect.width() - self.width) // 2)
+        dy = max(0, (rect.height() - self.height) // 2)
+        return rect.adjusted(dx, dy, -dx, -dy)
+
+    def _enabled(self, index):
+        return self.enabled_for is None or self.enabled_for(index)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        if not self._enabled(index): return
+        painter.save()
+        btn_rect = self._button_rect(option.rect)
+        # 마우스를 올리면 빨간 배경
+        if self.filled or option.state & QStyle.StateFlag.State_MouseOver:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#c0392b"))
+            painter.drawRoundedRect(btn_rect, 3, 3)
+        font = painter.font()
+        if not self.filled:
+            font.setPixelSize(10)
+        painter.setFont(font)
+        painter.setPen(QColor("white"))
+        painter.drawText(btn_rect, Qt.AlignmentFlag.AlignCenter, self.text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if self._enabled(index) and self._button_rect(option.rect).contains(event.position().toPoint()):
+                self.delete_clicked.emit(index)
+                return True
+        return super().editorEvent(event, model, option, index)
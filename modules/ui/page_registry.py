@@ -0,0 +1,53 @@
+import time
+import importlib
+from PyQt6.QtWidgets import QWidget
+
+class PageRegistry:
+    """
+    사이드바 메뉴별 페이지를 '처음 선택될 때' 만들어주는 지연 생성기.
+    - 등록 시점에는 빈 자리표시 위젯만 QStackedWidget에 넣어둠
+    - 해당 페이지가 처음 열릴 때 모듈 import + 위젯 생성 (각각 소요 시간 기록)
+    """
+    def __init__(self, stack):
+        self.stack = stack
+        self.entries = []   # index 순서대로 {'name', 'factory', 'widget'}
+        self.timings = {}   # name -> {'import': 초, 'build': 초}
+
+    def register(self, name, module_path, class_name):
+        # 모듈 경로/클래스명만 기억해두고, 실제 import는 나중에 함
+        def factory():
+            t0 = time.perf_counter()
+            module = importlib.import_module(module_path)
+            t1 = time.perf_counter()
+            widget = getattr(module, class_name)()
+            t2 = time.perf_counter()
+            self.timings[name] = {'import': t1 - t0, 'build': t2 - t1}
+            return widget
+
+        placeholder = QWidget()
+        index = self.stack.addWidget(placeholder)
+        self.entries.append({'name': name, 'factory': factory, 'widget': None})
+        return index
+
+    def is_built(self, index):
+        return self.entries[index]['widget'] is not None
+
+    def page(self, index):
+        entry = self.entries[index]
+        if entry['widget'] is None:
+            placeholder = self.stack.widget(index)
+            widget = entry['factory']()
+            # 자리표시 위젯을 실제 페이지로 교체 (인덱스는 그대로 유지)
+            self.stack.insertWidget(index, widget)
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            entry['widget'] = widget
+
+            t = self.timings[entry['name']]
+            print(f"[PageRegistry] {entry['name']}: import {t['import'] * 1000:.1f} ms, build {t['build'] * 1000:.1f} ms")
+        return entry['widget']
+
+    def show(self, index):
+        widget = self.page(index)
+        self.stack.setCurrentIndex(index)
+        return widget
@@ -1,107 +1,228 @@
-import fitz  # PyMuPDF
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QScrollArea, 
-                             QHBoxLayout)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QImage, QPixmap
+from collections import OrderedDict
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListView, QStyledItemDelegate,
+                             QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, QTimer
+from PyQt6.QtGui import QColor
+from .pdf_render import get_render_service
 
+PAGE_ROLE = Qt.ItemDataRole.UserRole + 1   # (가로, 세로) 썸네일 픽셀 크기
+IMAGE_ROLE = Qt.ItemDataRole.UserRole + 2  # QImage 또는 None (아직 렌더링 전)
+
+CARD_MARGIN = 10   # 카드 좌우 여백
+LABEL_HEIGHT = 22  # 페이지 번호 영역
+PREFETCH = 4       # 화면 앞뒤로 미리 그려둘 페이지 수
+IMAGE_LIMIT = 120  # 모델이 들고 있을 최대 이미지 수 (나머지는 렌더 캐시에서 다시 가져옴)
+
+
+# ==========================================
+# [1] 모델: 페이지 크기만 알고, 이미지는 보이는 것만
+# ==========================================
+class PdfPageModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sizes = []                 # 페이지별 썸네일 픽셀 크기
+        self.images = OrderedDict()     # 페이지 -> QImage (LRU, 렌더 캐시와 데이터 공유)
+
+    def reset(self, sizes):
+        self.beginResetModel()
+        self.sizes = sizes
+        self.images.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.sizes)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"- {row + 1} -"
+        if role == PAGE_ROLE:
+            return self.sizes[row]
+        if role == IMAGE_ROLE:
+            image = self.images.get(row)
+            if image is not None:
+                self.images.move_to_end(row)
+            return image
+        return None
+
+    def set_image(self, row, image):
+        if not 0 <= row < len(self.sizes): return
+        # [수정] QPixmap 으로 바꾸지 않음 (렌더 스레드에서 이미 화면 형식으로 변환됨)
+        self.images[row] = image
+        self.images.move_to_end(row)
+        while len(self.images) > IMAGE_LIMIT:
+            self.images.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [IMAGE_ROLE])
+
+    def has_image(self, row):
+        return row in self.images
+
+
+# ==========================================
+# [2] 델리게이트: 카드(썸네일 + 페이지 번호)를 위젯 없이 직접 그림
+# ==========================================
+class PdfPageDelegate(QStyledItemDelegate):
+    def sizeHint(self, option, index):
+        w, h = index.data(PAGE_ROLE)
+        return QSize(w + CARD_MARGIN * 2, h + LABEL_HEIGHT + CARD_MARGIN)
+
+    def paint(self, painter, option, index):
+        w, h = index.data(PAGE_ROLE)
+        rect = option.rect
+        img_rect = QRect(rect.x() + (rect.width() - w) // 2, rect.y() + CARD_MARGIN // 2, w, h)
+
+        painter.save()
+        image = index.data(IMAGE_ROLE)
+        if image is not None:
+            painter.drawImage(img_rect, image)
+        else:
+            # 렌더링 전: 자리만 잡아둔 빈 칸
+            painter.fillRect(img_rect, QColor("#2b2b2b"))
+        painter.setPen(QColor("#555"))
+        painter.drawRect(img_rect.adjusted(0, 0, -1, -1))
+
+        font = painter.font()
+        font.setPixelSize(12)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#aaa"))
+        label_rect = QRect(rect.x(), img_rect.bottom() + 2, rect.width(), LABEL_HEIGHT)
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignCenter, index.data(Qt.ItemDataRole.DisplayRole))
+        painter.restore()
+
+
+# ==========================================
+# [3] 미리보기 위젯
+# ==========================================
 class PdfPreviewWidget(QWidget):
+    """
+    PDF 페이지 미리보기 (가상 목록)
+    - 페이지 크기는 문서 정보로 먼저 받아 전체 스크롤 길이를 만들고
+    - 화면에 보이는(+앞뒤 몇 장) 페이지만 렌더 서비스에 요청 -> 2000페이지도 바로 열림
+    """
     # [NEW] is_vertical 인자 추가 (기본값 False: 가로)
     def __init__(self, parent=None, is_vertical=False):
         super().__init__(parent)
         self.is_vertical = is_vertical
+        # 해상도 설정 (세로는 조금 더 크게 보여줘도 좋음)
+        self.zoom = 0.35 if is_vertical else 0.25
+        self.current_path = None
         self.init_ui()
 
+        # [NEW] 공용 렌더 서비스 (여러 미리보기가 캐시를 같이 씀)
+        self.service = get_render_service()
+        self.service.doc_ready.connect(self.on_doc_ready)
+        self.service.doc_failed.connect(self.on_doc_failed)
+        self.service.page_ready.connect(self.on_page_ready)
+
     def init_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        
+        # [수정] 페이지마다 위젯을 만들지 않는 QListView + 델리게이트
+        self.model = PdfPageModel(self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(PdfPageDelegate(self.view))
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.view.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.view.setSpacing(5)
+
         # [수정] 모드에 따른 스타일 설정
         if self.is_vertical:
             # 세로 모드: 높이 제한 없음 (부모 레이아웃에 맞춰 늘어남)
-            pass 
+            self.view.setFlow(QListView.Flow.TopToBottom)
         else:
             # 가로 모드: 높이 고정 (자르기 화면용)
-            self.scroll.setFixedHeight(350)
+            self.view.setFlow(QListView.Flow.LeftToRight)
+            self.view.setFixedHeight(350)
+        self.view.setWrapping(False)
 
-        self.scroll.setStyleSheet("""
-            QScrollArea { border: 1px solid #444; background-color: #222; border-radius: 5px; }
+        self.view.setStyleSheet("""
+            QListView { border: 1px solid #444; background-color: #222; border-radius: 5px; }
             QScrollBar:horizontal, QScrollBar:vertical { background: #2b2b2b; }
             QScrollBar::handle:horizontal, QScrollBar::handle:vertical { background: #555; border-radius: 6px; }
         """)
+        layout.addWidget(self.view)
+
+        # 스크롤/크기 변경이 끝나면 보이는 페이지만 요청 (연속 스크롤 중에는 몰아서)
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(30)
+        self.visible_timer.timeout.connect(self.request_visible)
+        self.view.verticalScrollBar().valueChanged.connect(self.visible_timer.start)
+        self.view.horizontalScrollBar().valueChanged.connect(self.visible_timer.start)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.visible_timer.start()
 
-        self.content_widget = QWidget()
-        self.content_widget.setStyleSheet("background-color: #222;")
-        
-        # [수정] 모드에 따라 레이아웃 방향 결정
+    def load_pdf(self, file_path):
+        # [수정] 렌더링은 렌더 스레드에서, 끝난 페이지부터 채워 넣음 (한 번 그린 페이지는 캐시)
+        self.service.cancel(self.current_path)
+        self.model.reset([])
+        self.current_path = file_path
+        if not file_path: return
+        self.service.open(file_path)
+
+    def on_doc_ready(self, path, stamp, sizes):
+        if path != self.current_path: return
+        thumb_sizes = [(max(1, int(w * self.zoom)), max(1, int(h * self.zoom))) for w, h in sizes]
+        # 모든 페이지 크기가 같으면 (대부분의 문서) 목록 배치 계산을 건너뜀
+        self.view.setUniformItemSizes(len(set(thumb_sizes)) <= 1)
+        self.model.reset(thumb_sizes)
+        self.view.scrollToTop()
+        # 배치는 이벤트 루프에서 끝나므로 그 뒤에 요청
+        self.visible_timer.start()
+
+    def visible_rows(self):
+        # 화면에 걸친 페이지 범위 (+앞뒤 PREFETCH). 배치 순서대로 놓이므로 이진 탐색
+        count = self.model.rowCount()
+        if not count: return range(0)
+        viewport = self.view.viewport().rect()
         if self.is_vertical:
-            self.thumb_layout = QVBoxLayout(self.content_widget)
-            self.thumb_layout.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter) # 위에서부터 중앙 정렬
+            view_start, view_end = viewport.top(), viewport.bottom()
+            span = lambda r: (r.top(), r.bottom())
         else:
-            self.thumb_layout = QHBoxLayout(self.content_widget)
-            self.thumb_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
+            view_start, view_end = viewport.left(), viewport.right()
+            span = lambda r: (r.left(), r.right())
 
-        self.thumb_layout.setSpacing(15)
-        self.thumb_layout.setContentsMargins(10, 10, 10, 10)
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if span(self.view.visualRect(self.model.index(mid)))[1] < view_start:
+                lo = mid + 1
+            else:
+                hi = mid
+        end = lo
+        while end + 1 < count and span(self.view.visualRect(self.model.index(end + 1)))[0] <= view_end:
+            end += 1
+        return range(max(0, lo - PREFETCH), min(count, end + 1 + PREFETCH))
 
-        self.scroll.setWidget(self.content_widget)
-        layout.addWidget(self.scroll)
+    def request_visible(self):
+        path = self.current_path
+        if not path or not self.model.rowCount(): return
+        missing = []
+        for row in self.visible_rows():
+            if self.model.has_image(row): continue
+            image = self.service.cached(path, row, self.zoom)
+            if image is not None:
+                self.model.set_image(row, image)
+            else:
+                missing.append(row)
+        # 화면에서 벗어난 페이지 요청은 버리고 지금 보이는 것만
+        self.service.cancel(path)
+        self.service.request(path, missing, self.zoom)
 
-    def load_pdf(self, file_path):
-        # 기존 썸네일 지우기
-        for i in reversed(range(self.thumb_layout.count())): 
-            widget = self.thumb_layout.itemAt(i).widget()
-            if widget: widget.setParent(None)
-
-        if not file_path: return
+    def on_page_ready(self, path, page, zoom, image):
+        if path != self.current_path or zoom != self.zoom: return
+        self.model.set_image(page, image)
+        self.view.setToolTip(self.service.describe_stats())
 
-        try:
-            doc = fitz.open(file_path)
-            # 합치기(세로)일 때는 좀 더 많이 보여줘도 됨 (예: 100페이지)
-            max_pages = 100 if self.is_vertical else 50
-
-            for i in range(min(len(doc), max_pages)):
-                page = doc.load_page(i)
-                # 해상도 설정 (세로는 조금 더 크게 보여줘도 좋음)
-                zoom = 0.35 if self.is_vertical else 0.25
-                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)) 
-                
-                img_data = pix.samples
-                qimg = QImage(img_data, pix.width, pix.height, pix.stride, QImage.Format.Format_RGB888)
-                pixmap = QPixmap.fromImage(qimg)
-
-                # 카드 위젯
-                card = QWidget()
-                # 세로 모드일 땐 꽉 차지 않게 적당히
-                card.setFixedSize(pix.width + 20, pix.height + 30)
-                card_layout = QVBoxLayout(card)
-                card_layout.setContentsMargins(0,0,0,0)
-                card_layout.setSpacing(2)
-
-                img_lbl = QLabel()
-                img_lbl.setPixmap(pixmap)
-                img_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                img_lbl.setStyleSheet("border: 1px solid #555;")
-                
-                num_lbl = QLabel(f"- {i+1} -")
-                num_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                num_lbl.setStyleSheet("color: #aaa; font-size: 12px; font-weight: bold;")
-
-                card_layout.addWidget(img_lbl)
-                card_layout.addWidget(num_lbl)
-                
-                self.thumb_layout.addWidget(card)
-            
-            # 페이지가 더 남았으면 표시
-            if len(doc) > max_pages:
-                more_lbl = QLabel(f"... 총 {len(doc)} 페이지 ...")
-                more_lbl.setStyleSheet("color: #777; font-size: 14px; font-weight: bold; margin: 10px;")
-                more_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.thumb_layout.addWidget(more_lbl)
-            
-            doc.close()
-
-        except Exception as e:
-            print(f"Preview Error: {e}")
\ No newline at end of file
+    def on_doc_failed(self, path, error):
+        if path == self.current_path:
+            print(f"Preview Error: {error}")
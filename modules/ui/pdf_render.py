@@ -0,0 +1,339 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict, deque
+
+import fitz  # PyMuPDF
+from PyQt6.QtCore import QObject, QThread, QCoreApplication, pyqtSignal
+from PyQt6.QtGui import QImage
+from modules.app_paths import get_config_path
+
+MEMORY_LIMIT = 64 * 1024 * 1024    # 메모리 썸네일 캐시 상한 (바이트)
+DISK_LIMIT = 256 * 1024 * 1024     # 디스크 썸네일 캐시 상한 (바이트)
+DISK_DIRNAME = "pdf_thumbs"
+DISK_QUALITY = 85
+OPEN_DOCS = 4                      # 렌더 스레드가 열어둘 최대 문서 수
+
+
+def file_stamp(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def qimage_from_pixmap(pix):
+    """
+    fitz.Pixmap -> 화면 표시용 QImage (렌더 스레드에서 한 번만 변환)
+    - pix 의 픽셀 버퍼(samples_ptr)를 그대로 감싸서 파이썬 쪽 복사 없이 QImage 로 넘김
+    - convertToFormat 한 번으로 Qt 가 바로 그릴 수 있는 형식의 독립된 이미지가 됨
+      (변환이 끝나기 전까지 pix 가 살아 있어야 함, 이후에는 해제되어도 안전)
+    반환: (QImage, 복사한 바이트 수)
+    """
+    if pix.n == 4 and pix.alpha:
+        fmt, target = QImage.Format.Format_RGBA8888_Premultiplied, QImage.Format.Format_ARGB32_Premultiplied
+    elif pix.n == 3:
+        fmt, target = QImage.Format.Format_RGB888, QImage.Format.Format_RGB32
+    elif pix.n == 1:
+        fmt, target = QImage.Format.Format_Grayscale8, QImage.Format.Format_RGB32
+    else:
+        # CMYK, 회색+알파 등은 RGB 로 바꿔서
+        return qimage_from_pixmap(fitz.Pixmap(fitz.csRGB, pix))
+
+    # 오래된 PyMuPDF 는 samples_ptr 이 없음 -> bytes 복사 한 번 더
+    samples = getattr(pix, "samples_ptr", None)
+    copied = 0
+    if samples is None:
+        samples = pix.samples
+        copied += len(samples)
+    wrapped = QImage(samples, pix.width, pix.height, pix.stride, fmt)
+    image = wrapped.convertToFormat(target)
+    copied += image.sizeInBytes()
+    return image, copied
+
+
+def thumb_key(path, stamp, page, zoom):
+    # (경로, 수정 시간, 페이지, 배율) -> 파일이 바뀌면 자동으로 다른 키
+    return (os.path.normcase(os.path.abspath(path)), stamp, page, round(zoom, 3))
+
+
+# ==========================================
+# [1] 썸네일 캐시 (메모리 LRU + 디스크)
+# ==========================================
+class ThumbnailCache:
+    """
+    - 메모리: 바이트 기준 LRU (QImage 는 스레드 사이에서 안전하게 공유 가능)
+    - 디스크: 설정 폴더의 JPEG (프로그램을 다시 켜도 재사용), 상한을 넘으면 오래된 것부터 삭제
+    """
+    def __init__(self, memory_limit=MEMORY_LIMIT, disk_dir=None, disk_limit=DISK_LIMIT):
+        self.memory_limit = memory_limit
+        self.disk_dir = disk_dir
+        self.disk_limit = disk_limit
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        # 메모리에서만 (GUI 스레드에서 바로 쓰는 용도)
+        with self._lock:
+            image = self._items.get(key)
+            if image is not None:
+                self._items.move_to_end(key)
+                self.stats['hits'] += 1
+            return image
+
+    def load(self, key):
+        # 메모리 -> 디스크 순서 (렌더 스레드용)
+        image = self.get(key)
+        if image is not None or not self.disk_dir:
+            return image
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            image = QImage(path)
+            if not image.isNull():
+                self.stats['disk_hits'] += 1
+                self.put(key, image, save=False)
+                return image
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key, image, save=True):
+        cost = image.sizeInBytes()
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old.sizeInBytes()
+            self._items[key] = image
+            self._bytes += cost
+            while self._bytes > self.memory_limit and len(self._items) > 1:
+                _k, dropped = self._items.popitem(last=False)
+                self._bytes -= dropped.sizeInBytes()
+        if save and self.disk_dir:
+            image.save(self._disk_path(key), "JPG", DISK_QUALITY)
+
+    def memory_bytes(self):
+        return self._bytes
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".jpg")
+
+    def prune_disk(self):
+        # 상한을 넘으면 오래된 파일부터 삭제
+        if not self.disk_dir: return 0
+        entries = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.disk_limit: break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+# ==========================================
+# [2] 렌더 스레드 (PyMuPDF 는 스레드 안전하지 않아 문서는 이 스레드에서만 다룸)
+# ==========================================
+class PdfRenderThread(QThread):
+    doc_ready = pyqtSignal(str, object, list)       # (경로, 수정 시간, [(가로, 세로) 포인트])
+    doc_failed = pyqtSignal(str, str)
+    page_ready = pyqtSignal(str, int, float, QImage) # (경로, 페이지, 배율, 이미지)
+    page_failed = pyqtSignal(str, int, float, str)   # (경로, 페이지, 배율, 오류)
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+        self._tasks = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._docs = OrderedDict()  # 경로 -> (수정 시간, fitz 문서)
+        # 렌더링 기록 (페이지 수, 복사한 바이트, 걸린 시간)
+        self.stats = {'pages': 0, 'copied_bytes': 0, 'render_seconds': 0.0, 'last_copied': 0}
+
+    # --- GUI 스레드에서 호출 ---
+    def add_task(self, task, urgent=False):
+        with self._cond:
+            if urgent: self._tasks.appendleft(task)
+            else: self._tasks.append(task)
+            self._cond.notify()
+
+    def drop_tasks(self, path=None):
+        # 아직 시작하지 않은 렌더 요청 취소 (path 가 None 이면 전부)
+        with self._cond:
+            self._tasks = deque(t for t in self._tasks
+                                if t[0] != "render" or (path is not None and t[1] != path))
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._tasks.clear()
+            self._cond.notify()
+
+    # --- 렌더 스레드 ---
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._tasks and not self._stopped:
+                    self._cond.wait()
+                if self._stopped: break
+                task = self._tasks.popleft()
+            try:
+                if task[0] == "open":
+                    self._open(task[1])
+                else:
+                    self._render(*task[1:])
+            except Exception as e:
+                print(f"Preview Error: {e}")
+                if task[0] == "open":
+                    self.doc_failed.emit(task[1], str(e))
+                else:
+                    self.page_failed.emit(task[1], task[2], task[3], str(e))
+        for _stamp, doc in self._docs.values():
+            doc.close()
+        self._docs.clear()
+
+    def _document(self, path):
+        stamp = file_stamp(path)
+        entry = self._docs.get(path)
+        if entry is not None and entry[0] == stamp:
+            self._docs.move_to_end(path)
+            return entry
+        if entry is not None:
+            entry[1].close()
+        entry = (stamp, fitz.open(path))
+        self._docs[path] = entry
+        while len(self._docs) > OPEN_DOCS:
+            _p, (_s, old) = self._docs.popitem(last=False)
+            old.close()
+        return entry
+
+    def _open(self, path):
+        stamp, doc = self._document(path)
+        sizes = []
+        for i in range(len(doc)):
+            rect = doc.load_page(i).rect
+            sizes.append((rect.width, rect.height))
+        self.doc_ready.emit(path, stamp, sizes)
+
+    def _render(self, path, page, zoom):
+        stamp, doc = self._document(path)
+        key = thumb_key(path, stamp, page, zoom)
+        image = self.cache.load(key)
+        if image is None:
+            started = time.perf_counter()
+            pix = doc.load_page(page).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            # [수정] samples(bytes 복사) -> QImage -> copy() 대신 버퍼를 그대로 감싸 한 번만 변환
+            image, copied = qimage_from_pixmap(pix)
+            del pix
+            self.stats['pages'] += 1
+            self.stats['copied_bytes'] += copied
+            self.stats['last_copied'] = copied
+            self.stats['render_seconds'] += time.perf_counter() - started
+            self.cache.put(key, image)
+        self.page_ready.emit(path, page, zoom, image)
+
+
+# ==========================================
+# [3] 공용 렌더 서비스 (미리보기 위젯들이 캐시와 스레드를 같이 씀)
+# ==========================================
+class PdfRenderService(QObject):
+    doc_ready = pyqtSignal(str, object, list)
+    doc_failed = pyqtSignal(str, str)
+    page_ready = pyqtSignal(str, int, float, QImage)
+    page_failed = pyqtSignal(str, int, float, str)
+
+    def __init__(self, disk_cache=True):
+        super().__init__()
+        disk_dir = get_config_path(DISK_DIRNAME) if disk_cache else None
+        self.cache = ThumbnailCache(disk_dir=disk_dir)
+        self.stamps = {}
+        self._pending = set()  # 요청했지만 아직 안 온 (경로, 페이지, 배율)
+        self.thread = PdfRenderThread(self.cache)
+        self.thread.doc_ready.connect(self._on_doc_ready)
+        self.thread.doc_failed.connect(self.doc_failed)
+        self.thread.page_ready.connect(self._on_page_ready)
+        self.thread.page_failed.connect(self._on_page_failed)
+        self.thread.start()
+        # 디스크 캐시 정리는 시작할 때 한 번 (렌더 스레드가 아닌 곳에서 잠깐)
+        if disk_dir:
+            threading.Thread(target=self.cache.prune_disk, daemon=True).start()
+
+    def open(self, path):
+        # 페이지 크기 목록을 doc_ready 로 받음
+        self.thread.add_task(("open", path), urgent=True)
+
+    def cached(self, path, page, zoom):
+        stamp = self.stamps.get(path)
+        if stamp is None: return None
+        return self.cache.get(thumb_key(path, stamp, page, zoom))
+
+    def request(self, path, pages, zoom):
+        for page in pages:
+            token = (path, page, round(zoom, 3))
+            if token in self._pending: continue
+            self._pending.add(token)
+            self.thread.add_task(("render", path, page, zoom))
+
+    def cancel(self, path):
+        # 이 문서의 대기 중인 요청만 취소 (다른 미리보기가 요청한 문서는 그대로, None 이면 아무것도 안 함)
+        if path is None: return
+        self.thread.drop_tasks(path)
+        self._pending = {t for t in self._pending if t[0] != path}
+
+    def stop(self):
+        self.thread.stop()
+        self.thread.wait(2000)
+
+    def describe_stats(self):
+        # "렌더링 120페이지 · 페이지당 복사 240KB · 평균 18ms · 캐시 적중 80%"
+        stats = self.thread.stats
+        pages = stats['pages']
+        if not pages: return ""
+        cache = self.cache.stats
+        lookups = cache['hits'] + cache['disk_hits'] + cache['misses']
+        text = (f"렌더링 {pages}페이지 · 페이지당 복사 {stats['copied_bytes'] / pages / 1024:,.0f}KB"
+                f" · 평균 {stats['render_seconds'] * 1000 / pages:.0f}ms")
+        if lookups:
+            text += f" · 캐시 적중 {(cache['hits'] + cache['disk_hits']) * 100 / lookups:.0f}%"
+        return text
+
+    def _on_doc_ready(self, path, stamp, sizes):
+        self.stamps[path] = stamp
+        self.doc_ready.emit(path, stamp, sizes)
+
+    def _on_page_ready(self, path, page, zoom, image):
+        self._pending.discard((path, page, round(zoom, 3)))
+        self.page_ready.emit(path, page, zoom, image)
+
+    def _on_page_failed(self, path, page, zoom, error):
+        # 실패한 페이지도 대기 목록에서 빼야 다음에 다시 요청할 수 있음
+        self._pending.discard((path, page, round(zoom, 3)))
+        self.page_failed.emit(path, page, zoom, error)
+
+
+_service = None
+
+
+def get_render_service():
+    global _service
+    if _service is None:
+        _service = PdfRenderService()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_service.stop)
+    return _service
@@ -0,0 +1,15 @@
+_retired = set()  # 결과는 버렸지만 아직 돌고 있는 QThread
+
+
+def retire_thread(thread):
+    """
+    더 이상 쓰지 않는 일꾼(QThread)을 끝날 때까지 붙잡아 둠
+    - 실행 중인 QThread 의 마지막 참조가 사라지면 "QThread: Destroyed while thread is still running" 으로 앱이 죽음
+    - 취소 신호만 보내고 self.worker 를 새 일꾼으로 바꾸기 전에 호출
+    """
+    if thread is None: return
+    _retired.add(thread)
+    thread.finished.connect(lambda: _retired.discard(thread))
+    # 이미 끝났거나 시작하지 않은 일꾼은 바로 놓아줌
+    if not thread.isRunning():
+        _retired.discard(thread)
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# 저장소 최상위 (modules 패키지가 있는 곳)를 어디서 실행하든 찾을 수 있게
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())